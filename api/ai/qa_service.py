@@ -6,6 +6,7 @@ from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 import re
 
 from ..database import langchain_graph
+from .skill_context import skill_context
 import os  # For TESTING_MODE
 from unittest.mock import MagicMock  # For mock llm
 
@@ -38,8 +39,10 @@ prompt = ChatPromptTemplate.from_template(template)
 # --- UPDATED retrieval logic ---
 async def retrieve_context(input_dict: dict) -> list:
     """
-    Extracts keywords and queries Neo4j using a flexible 'CONTAINS' search.
-    Falls back to random skills if no specific keywords are found.
+    Extracts keywords and looks them up in the in-memory context index (BM25
+    over skill names and descriptions). Falls back to random skills if no
+    specific keywords are found, and to a 'CONTAINS' search in Neo4j while
+    the index is not loaded.
     """
     question = input_dict.get("question", "").lower()
 
@@ -66,6 +69,10 @@ async def retrieve_context(input_dict: dict) -> list:
         word for word in re.findall(r"\b\w+\b", question) if word not in stop_words
     ]
 
+    context = skill_context.retrieve(keywords)
+    if context is not None:
+        return context
+
     if not keywords:
         retrieval_query = """
         MATCH (s:Skill)
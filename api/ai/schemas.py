@@ -43,6 +43,18 @@ class SkillMatch(BaseModel):
     )
 
 
+class CandidateSkillMatch(SkillMatch):
+    candidate_skill: str = Field(
+        description="The candidate skill, exactly as given in the list of candidate skills."
+    )
+
+
+class SkillMatches(BaseModel):
+    matches: List[CandidateSkillMatch] = Field(
+        description="One match result for every candidate skill, in the order given."
+    )
+
+
 class UserPasswordChange(BaseModel):
     current_password: str
     new_password: str
@@ -0,0 +1,226 @@
+# api/ai/skill_context.py
+#
+# Retrieval for the Q&A RAG context. Instead of a CONTAINS scan over every
+# :Skill node per keyword, skills are looked up in an in-process inverted
+# index over their names and descriptions, ranked with BM25, and returned with
+# a precomputed list of related skills (up to two DEPENDS_ON hops away).
+#
+# Every posting list is stored with its BM25 contribution precomputed and
+# sorted best first, and a query reads at most MAX_POSTINGS entries of each,
+# so retrieval time does not grow with the graph.
+
+import asyncio
+import heapq
+import math
+import os
+import random
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+from fastapi.concurrency import run_in_threadpool
+from neo4j import Driver
+
+from .. import graph_crud
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Name terms count this many times, so a keyword in the name outranks the
+# same keyword in a description.
+NAME_WEIGHT = 3
+# Highest-scoring entries read from each posting list per query.
+MAX_POSTINGS = 1000
+# Vocabulary terms a keyword that is not a term itself expands to by prefix.
+MAX_EXPANSIONS = 5
+# Related skills kept per skill, nearest first.
+MAX_RELATED = 20
+
+# How often the index is rebuilt to pick up changes to the graph.
+SKILL_CONTEXT_REFRESH_SECONDS = float(os.getenv("SKILL_CONTEXT_REFRESH_SECONDS", "300"))
+
+
+def tokenize(text: str):
+    return re.findall(r"\w+", text.lower()) if text else []
+
+
+class ContextIndex:
+    """
+    BM25 index over skill names and descriptions, built once from (name,
+    description) pairs and (parent, child) DEPENDS_ON pairs.
+    """
+
+    def __init__(self, skills, dependencies=()):
+        self.names = []
+        self.descriptions = []
+        index = {}
+        for name, description in skills:
+            if name not in index:
+                index[name] = len(self.names)
+                self.names.append(name)
+                self.descriptions.append(description)
+        self._build_postings()
+        self._build_related(index, dependencies)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _build_postings(self):
+        frequencies = defaultdict(dict)  # term -> {doc: weighted frequency}
+        lengths = []
+        for doc, (name, description) in enumerate(zip(self.names, self.descriptions)):
+            terms = tokenize(name) * NAME_WEIGHT + tokenize(description)
+            lengths.append(len(terms))
+            for term in terms:
+                counts = frequencies[term]
+                counts[doc] = counts.get(doc, 0) + 1
+
+        count = len(lengths)
+        average_length = sum(lengths) / count if count else 0
+        self._postings = {}  # term -> (docs, scores), best first
+        for term, counts in frequencies.items():
+            idf = math.log(1 + (count - len(counts) + 0.5) / (len(counts) + 0.5))
+            scored = sorted(
+                (
+                    (
+                        idf * tf * (K1 + 1)
+                        / (tf + K1 * (1 - B + B * lengths[doc] / average_length)),
+                        doc,
+                    )
+                    for doc, tf in counts.items()
+                ),
+                reverse=True,
+            )
+            self._postings[term] = (
+                array("i", (doc for _, doc in scored)),
+                array("d", (score for score, _ in scored)),
+            )
+        self._vocabulary = sorted(self._postings)
+
+    def _build_related(self, index, dependencies):
+        neighbors = [[] for _ in self.names]
+        for parent, child in dependencies:
+            p, c = index.get(parent), index.get(child)
+            if p is not None and c is not None and p != c:
+                neighbors[p].append(c)
+                neighbors[c].append(p)
+
+        # Breadth first, so when a skill has more than MAX_RELATED within two
+        # hops, the direct ones are kept.
+        self._related = []
+        for doc, direct in enumerate(neighbors):
+            related = dict.fromkeys(direct)
+            for n in direct:
+                if len(related) >= MAX_RELATED:
+                    break
+                related.update(dict.fromkeys(neighbors[n]))
+            related.pop(doc, None)
+            self._related.append(
+                tuple(self.names[n] for n in list(related)[:MAX_RELATED])
+            )
+
+    def _terms(self, keyword):
+        if keyword in self._postings:
+            return [keyword]
+        # Not a whole term: treat it as the start of one, like the CONTAINS
+        # search did ("pyth" finds "python").
+        start = bisect_left(self._vocabulary, keyword)
+        terms = []
+        for term in self._vocabulary[start : start + MAX_EXPANSIONS]:
+            if not term.startswith(keyword):
+                break
+            terms.append(term)
+        return terms
+
+    def _record(self, doc):
+        return {
+            "skill": self.names[doc],
+            "description": self.descriptions[doc],
+            "related_skills": list(self._related[doc]),
+        }
+
+    def search(self, keywords, limit=10):
+        """The ``limit`` best-matching skills for ``keywords``, as context
+        records with their related skills."""
+        scores = defaultdict(float)
+        for keyword in dict.fromkeys(keywords):
+            for term in self._terms(keyword):
+                docs, term_scores = self._postings[term]
+                for doc, score in zip(docs[:MAX_POSTINGS], term_scores[:MAX_POSTINGS]):
+                    scores[doc] += score
+        best = heapq.nsmallest(
+            limit, scores, key=lambda doc: (-scores[doc], self.names[doc])
+        )
+        return [self._record(doc) for doc in best]
+
+    def sample(self, count=3):
+        """``count`` random skills, in time independent of the graph's size."""
+        docs = random.sample(range(len(self.names)), min(count, len(self.names)))
+        return [self._record(doc) for doc in docs]
+
+
+class SkillContext:
+    """
+    Holds the ContextIndex for the Q&A service. ``retrieve`` returns None
+    until the index is loaded, and callers fall back to Cypher.
+    """
+
+    def __init__(self):
+        self.index: ContextIndex = None
+        self.loaded_at: float = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    def load(self, driver: Driver):
+        started = time.perf_counter()
+        with driver.session() as session:
+            skills = session.execute_read(graph_crud.get_skill_graph_nodes)
+            dependencies = session.execute_read(graph_crud.get_skill_graph_dependencies)
+        index = ContextIndex(
+            ((name, description) for name, description, _ in skills), dependencies
+        )
+        with self._lock:
+            self.index = index
+            self.loaded_at = time.time()
+        print(
+            f"Loaded Q&A context index: {len(index)} skills "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def try_load(self, driver: Driver) -> bool:
+        """Loads the index, logging instead of raising on failure."""
+        try:
+            self.load(driver)
+            return True
+        except Exception as e:
+            # Retrieval keeps working without the index; it uses Cypher.
+            print(f"WARNING: Could not load Q&A context index. Error: {e}")
+            return False
+
+    async def refresh_periodically(
+        self, driver: Driver, interval: float = SKILL_CONTEXT_REFRESH_SECONDS
+    ):
+        """Rebuilds the index every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await run_in_threadpool(self.try_load, driver)
+
+    def retrieve(self, keywords, limit=10):
+        """Context records for ``keywords``, or a few random skills when there
+        are none. Returns None if the index is not loaded."""
+        index = self.index  # Replaced whole on reload, never mutated
+        if index is None:
+            return None
+        if not keywords:
+            return index.sample()
+        return index.search(keywords, limit)
+
+
+# A single index shared by the whole application
+skill_context = SkillContext()
@@ -1,7 +1,8 @@
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import PydanticOutputParser
-from .schemas import SkillMatch
+from .schemas import SkillMatch, SkillMatches
 from typing import List
 
 # 1. Set up a parser for our SkillMatch model
@@ -59,3 +60,110 @@ async def find_skill_match(
             ),  # Pass the list as a simple comma-separated string
         }
     )
+
+
+# --- Batch matching ---
+# Resolving every skill extracted from an accomplishment in one call sends
+# the existing skills list once instead of once per candidate, and costs a
+# single round trip.
+
+batch_parser = PydanticOutputParser(pydantic_object=SkillMatches)
+
+batch_prompt_template = """
+You are an expert skills ontologist. Your task is to determine, for each "candidate skill" in a list, if it is a semantic duplicate or a direct subset of any skill from a list of "existing skills".
+
+Your analysis must be strict. A candidate skill should only be considered a duplicate if it represents the same core competency as an existing skill.
+
+Candidates can also duplicate each other. If a candidate is not a duplicate of any existing skill but is a duplicate of a candidate listed before it, set is_duplicate to true and existing_skill_name to that earlier candidate, copied exactly.
+
+Examples:
+- "Docker Containerization" IS a duplicate of "Docker".
+- "React State Management" IS a duplicate of "React.js".
+- "Advanced Python" IS a duplicate of "Python".
+- "Frontend Web Development" IS NOT a duplicate of "React.js", as it is a broader category.
+- "SQL" IS NOT a duplicate of "PostgreSQL", as it is a broader category.
+
+Return your analysis as a JSON object that strictly follows the provided schema, with one entry per candidate skill, in the order given, and candidate_skill copied exactly. If no match is found for a candidate, is_duplicate must be false and existing_skill_name must be null.
+
+{format_instructions}
+
+Candidate Skills (one per line):
+{candidate_skills}
+
+Existing Skills List:
+{existing_skills}
+"""
+
+batch_prompt = ChatPromptTemplate.from_template(
+    template=batch_prompt_template,
+    partial_variables={"format_instructions": batch_parser.get_format_instructions()},
+)
+
+skill_batch_matcher_chain = batch_prompt | model | batch_parser
+
+
+async def find_skill_matches(
+    candidate_skills: List[str], existing_skills: List[str]
+) -> List[SkillMatch]:
+    """
+    Finds a semantic duplicate for every candidate skill with one call to the
+    batch matcher chain. Returns one SkillMatch per candidate, in order. As
+    when the candidates are matched one at a time against a list that grows
+    with each new skill, a candidate may match an earlier, new candidate, and
+    is then reported as a duplicate of it.
+
+    A candidate that is an existing skill but for case is matched without the
+    model. Candidates the batch answer leaves out, or matches to a skill that
+    is neither existing nor an earlier new candidate, are matched one at a
+    time with find_skill_match, and so are all of them if the answer cannot
+    be parsed.
+    """
+    existing_by_key = {name.lower(): name for name in existing_skills}
+    matches = {}
+    to_match = []
+    for candidate in dict.fromkeys(candidate_skills):
+        existing = existing_by_key.get(candidate.lower())
+        if existing is not None:
+            matches[candidate] = SkillMatch(is_duplicate=True, existing_skill_name=existing)
+        else:
+            to_match.append(candidate)
+
+    if to_match:
+        answers = {}
+        try:
+            result = await skill_batch_matcher_chain.ainvoke(
+                {
+                    "candidate_skills": "\n".join(to_match),
+                    "existing_skills": ", ".join(existing_skills),
+                }
+            )
+            answers = {match.candidate_skill: match for match in reversed(result.matches)}
+        except OutputParserException as e:
+            print(f"WARNING: Could not parse the batch skill match; matching one at a time. Error: {e}")
+
+        existing_names = set(existing_skills)
+        new_names = []  # Candidates found to be new skills so far, in order
+        for candidate in to_match:
+            answer = answers.get(candidate)
+            if answer is None:
+                # Left out, or no usable answer: match it alone, against the
+                # existing skills and the new ones found before it
+                match = await find_skill_match(candidate, existing_skills + new_names)
+            elif not answer.is_duplicate:
+                match = SkillMatch(is_duplicate=False, existing_skill_name=None)
+            elif answer.existing_skill_name in existing_names:
+                match = SkillMatch(is_duplicate=True, existing_skill_name=answer.existing_skill_name)
+            elif answer.existing_skill_name in matches:
+                # An earlier candidate: the same skill it resolved to
+                earlier = matches[answer.existing_skill_name]
+                match = SkillMatch(
+                    is_duplicate=True,
+                    existing_skill_name=earlier.existing_skill_name or answer.existing_skill_name,
+                )
+            else:
+                match = await find_skill_match(candidate, existing_skills + new_names)
+            matches[candidate] = match
+            if not match.is_duplicate:
+                new_names.append(candidate)
+
+    return [matches[candidate] for candidate in candidate_skills]
@@ -0,0 +1,298 @@
+# api/async_graph_crud.py
+#
+# Async variants of the graph_crud functions the request handlers use, for
+# the AsyncGraphDatabase driver. They take an AsyncManagedTransaction and run
+# the same queries as their graph_crud namesakes, so an async endpoint waits
+# on Bolt I/O without holding a threadpool thread.
+
+import json
+import uuid
+from typing import List
+
+from . import graph_crud, schemas
+from .graph_crud import MAX_DEPTH_ROUNDS
+
+
+async def _single(tx, query, **params):
+    result = await tx.run(query, **params)
+    return await result.single()
+
+
+async def _records(tx, query, **params):
+    result = await tx.run(query, **params)
+    return [record async for record in result]
+
+
+# --- Skills ---
+
+
+async def create_skill(tx, skill_name, duration_minutes=None):
+    return await _single(
+        tx, graph_crud.CREATE_SKILL_QUERY,
+        skill_name=skill_name, duration_minutes=duration_minutes,
+    )
+
+
+async def create_skills_if_missing(tx, skill_names):
+    records = await _records(
+        tx, graph_crud.CREATE_SKILLS_IF_MISSING_QUERY,
+        skill_names=list(dict.fromkeys(skill_names)),
+    )
+    return [record["name"] for record in records if record["created"]]
+
+
+async def set_skill_duration(tx, skill_name, duration_minutes):
+    record = await _single(
+        tx, graph_crud.SET_SKILL_DURATION_QUERY,
+        skill_name=skill_name, duration_minutes=duration_minutes,
+    )
+    return record["name"] if record else None
+
+
+async def get_all_skills(tx):
+    records = await _records(tx, graph_crud.GET_ALL_SKILLS_QUERY)
+    return [record["name"] for record in records]
+
+
+async def get_skills_page(tx, after: str = "", limit: int = 1000):
+    records = await _records(tx, graph_crud.GET_SKILLS_PAGE_QUERY, after=after, limit=limit)
+    return [record.data() for record in records]
+
+
+async def search_skill_names(tx, prefix, limit):
+    records = await _records(
+        tx, graph_crud.SEARCH_SKILL_NAMES_QUERY, prefix=prefix, limit=limit
+    )
+    return [record["name"] for record in records]
+
+
+async def get_skill_by_name(tx, skill_name):
+    return await _single(tx, graph_crud.GET_SKILL_BY_NAME_QUERY, skill_name=skill_name)
+
+
+async def update_skill(tx, old_name, new_name):
+    return await _single(
+        tx, graph_crud.UPDATE_SKILL_QUERY, old_name=old_name, new_name=new_name
+    )
+
+
+async def delete_skill(tx, skill_name):
+    record = await _single(tx, graph_crud.DELETE_SKILL_QUERY, skill_name=skill_name)
+    if record and record["dependents"]:
+        await recompute_skill_depths(tx, record["dependents"])
+
+
+async def add_skill_dependency(tx, parent_skill_name, child_skill_name):
+    record = await _single(
+        tx, graph_crud.ADD_SKILL_DEPENDENCY_QUERY,
+        parent_skill_name=parent_skill_name, child_skill_name=child_skill_name,
+    )
+    if record is not None and not record["added"]:
+        return await find_dependency_cycle(tx, parent_skill_name, child_skill_name)
+    await recompute_skill_depths(tx, [parent_skill_name])
+    return []
+
+
+async def find_dependency_cycle(tx, parent_skill_name, child_skill_name):
+    if parent_skill_name == child_skill_name:
+        return [parent_skill_name, parent_skill_name]
+    record = await _single(
+        tx, graph_crud.FIND_DEPENDENCY_CYCLE_QUERY,
+        parent_skill_name=parent_skill_name, child_skill_name=child_skill_name,
+    )
+    if record is None:
+        return []
+    return [parent_skill_name] + record["cycle"]
+
+
+async def recompute_skill_depths(tx, skill_names):
+    names = list(skill_names)
+    rounds = 0
+    while names and rounds < MAX_DEPTH_ROUNDS:
+        records = await _records(tx, graph_crud.RECOMPUTE_SKILL_DEPTHS_QUERY, names=names)
+        names = [record["name"] for record in records]
+        rounds += 1
+
+
+async def get_skill_dependencies(tx, skill_name):
+    records = await _records(
+        tx, graph_crud.GET_SKILL_DEPENDENCIES_QUERY, skill_name=skill_name
+    )
+    return [record["dependency_name"] for record in records]
+
+
+async def get_consolidated_learning_path(tx, skill_name):
+    record = await _single(
+        tx, graph_crud.GET_CONSOLIDATED_LEARNING_PATH_QUERY, skill_name=skill_name
+    )
+    return record["path"] if record else []
+
+
+async def get_covered_skills(tx, held_skills, candidates):
+    covered = set(held_skills)
+    if held_skills:
+        record = await _single(
+            tx, graph_crud.GET_COVERED_SKILLS_QUERY,
+            held_skills=list(held_skills), candidates=list(candidates),
+        )
+        if record:
+            covered.update(record["covered"])
+    return covered
+
+
+async def get_consolidated_learning_plan(tx, skill_names):
+    records = await _records(
+        tx, graph_crud.GET_CONSOLIDATED_LEARNING_PLAN_QUERY, skill_names=list(skill_names)
+    )
+    plan = []
+    membership = {}
+    for record in records:
+        plan.append(record["name"])
+        for target in record["targets"]:
+            membership.setdefault(target, []).append(record["name"])
+    return plan, membership
+
+
+# --- Users ---
+
+
+async def create_user_node(tx, email):
+    record = await _single(tx, graph_crud.CREATE_USER_NODE_QUERY, email=email)
+    return record["u.email"]
+
+
+async def user_exists(tx, email: str) -> bool:
+    record = await _single(tx, graph_crud.USER_EXISTS_QUERY, email=email)
+    return record["user_exists"] if record else False
+
+
+async def remove_user_skill(tx, email, skill_name):
+    await tx.run(graph_crud.REMOVE_USER_SKILL_QUERY, email=email, skill_name=skill_name)
+
+
+async def skill_profiles_ready(tx) -> bool:
+    if not graph_crud._skill_profiles_ready:
+        record = await _single(tx, graph_crud.SCHEMA_VERSION_QUERY)
+        graph_crud._skill_profiles_ready = graph_crud.skill_profiles_backfilled(record)
+    return graph_crud._skill_profiles_ready
+
+
+async def get_user_skills_by_accomplishments(tx, email: str) -> List[str]:
+    if await skill_profiles_ready(tx):
+        query = graph_crud.GET_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY
+    else:
+        query = graph_crud.WALK_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY
+    record = await _single(tx, query, email=email)
+    return record["skills"] if record and record["skills"] is not None else []
+
+
+async def get_user_skill_profile(tx, email: str) -> List[dict]:
+    records = await _records(tx, graph_crud.GET_USER_SKILL_PROFILE_QUERY, email=email)
+    return [record.data() for record in records]
+
+
+# --- Quests and Goals ---
+
+
+async def create_quest(tx, quest_data):
+    record = await _single(
+        tx, graph_crud.CREATE_QUEST_QUERY, id=str(uuid.uuid4()), **quest_data
+    )
+    return record["q"]
+
+
+async def create_quest_and_link_to_user(tx, quest_data, user_email, plan_index=None):
+    new_quest_id = str(uuid.uuid4())
+    record = await _single(
+        tx, graph_crud.CREATE_USER_QUEST_QUERY,
+        id=new_quest_id, name=quest_data["name"],
+        description=quest_data["description"], plan_index=plan_index,
+    )
+    await tx.run(
+        graph_crud.LINK_USER_TO_QUEST_QUERY, user_email=user_email, quest_id=new_quest_id
+    )
+    return record["q"]
+
+
+async def create_goal_and_link_to_user(tx, goal_data: schemas.GoalCreate, user_email: str):
+    record = await _single(
+        tx, graph_crud.CREATE_GOAL_AND_LINK_TO_USER_QUERY,
+        id=str(uuid.uuid4()),
+        user_email=user_email,
+        goal_text=goal_data.goal_text,
+        full_plan_json=goal_data.full_plan_json,
+        steps=json.loads(goal_data.full_plan_json),
+    )
+    return record["g"]
+
+
+async def link_legacy_quest_to_step(tx, record, completed_quest_id: str) -> bool:
+    linkable, steps = graph_crud.legacy_plan_steps(record)
+    if not linkable:
+        return False
+    linked = await _single(
+        tx, graph_crud.LINK_LEGACY_QUEST_TO_STEP_QUERY,
+        goal_id=record["goal_id"], quest_id=completed_quest_id, steps=steps,
+    )
+    if linked is None:
+        graph_crud.warn_unlinked_legacy_quest(record["goal_id"], completed_quest_id)
+        return False
+    return True
+
+
+async def advance_goal(tx, completed_quest_id: str, user_email: str):
+    params = dict(user_email=user_email, quest_id=completed_quest_id, new_id=str(uuid.uuid4()))
+    record = await _single(tx, graph_crud.ADVANCE_GOAL_QUERY, **params)
+    if record is not None and record["legacy"] and await link_legacy_quest_to_step(
+        tx, record, completed_quest_id
+    ):
+        record = await _single(tx, graph_crud.ADVANCE_GOAL_QUERY, **params)
+    return record["q"] if record else None
+
+
+async def get_goal_progress(tx, goal_id: str, user_email: str):
+    record = await _single(
+        tx, graph_crud.GET_GOAL_PROGRESS_QUERY, goal_id=goal_id, user_email=user_email
+    )
+    return graph_crud.goal_progress_from_record(goal_id, record)
+
+
+# --- Accomplishments ---
+
+
+async def create_accomplishment_with_fulfilment(tx, user_email: str, accomplishment_data, quest_id: str = None):
+    record = await _single(
+        tx, graph_crud.CREATE_ACCOMPLISHMENT_WITH_FULFILMENT_QUERY,
+        user_email=user_email,
+        props=graph_crud.accomplishment_properties(accomplishment_data),
+        quest_id=str(quest_id) if quest_id else None,
+    )
+    return record["a"]
+
+
+async def link_accomplishment_to_skills(tx, accomplishment_id: str, skills):
+    await tx.run(
+        graph_crud.LINK_ACCOMPLISHMENT_TO_SKILLS_QUERY,
+        accomplishment_id=accomplishment_id,
+        skills=graph_crud.skill_evidence(skills),
+        levels=graph_crud.MASTERY_LEVELS,
+    )
+
+
+async def get_accomplishment_details(tx, accomplishment_id):
+    record = await _single(
+        tx, graph_crud.GET_ACCOMPLISHMENT_DETAILS_QUERY,
+        accomplishment_id=str(accomplishment_id),
+    )
+    if record:
+        return {"user": record["u"], "accomplishment": record["a"]}
+    return None
+
+
+async def store_vc_receipt(tx, accomplishment_id, vc_receipt):
+    await tx.run(
+        graph_crud.STORE_VC_RECEIPT_QUERY,
+        accomplishment_id=str(accomplishment_id),
+        vc_id=vc_receipt["id"],
+        vc_issuanceDate=vc_receipt["issuanceDate"],
+    )
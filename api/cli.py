@@ -0,0 +1,235 @@
+# api/cli.py
+#
+# Maintenance commands for the SkillForge graph.
+# Usage: python -m api.cli <command> [options]
+
+import argparse
+import csv
+import time
+
+from skill_system.binary import write_skill_graph
+from . import graph_crud
+from .database import get_graph_db_driver
+from .cohort_gaps import compute_cohort_gaps
+from . import graph_schema
+from . import skill_import
+from .skill_snapshot import SKILL_GRAPH_FILE, read_skill_graph, skill_snapshot
+
+
+def migrate(args):
+    """Applies pending graph schema migrations and reports missing indexes.
+    With --check, only reports."""
+    driver = get_graph_db_driver()
+    with driver.session() as session:
+        version = session.execute_read(graph_schema.get_schema_version)
+    print(
+        f"Graph schema version {version} "
+        f"(latest {graph_schema.LATEST_VERSION})."
+    )
+    if not args.check:
+        started = time.perf_counter()
+        try:
+            applied = graph_schema.migrate(driver)
+        except graph_schema.SchemaMigrationError as e:
+            raise SystemExit(str(e))
+        print(
+            f"Applied migrations {applied or 'none'} "
+            f"({time.perf_counter() - started:.2f}s)."
+        )
+    missing = graph_schema.missing_indexes(driver)
+    for label, prop in missing:
+        print(f"  Missing index: {label}.{prop}")
+    if not missing:
+        print("Every lookup key is indexed.")
+    elif args.check:
+        raise SystemExit(1)
+
+
+def backfill_depth(args):
+    """Computes the stored `depth` of every skill and indexes it."""
+    driver = get_graph_db_driver()
+    started = time.perf_counter()
+    with driver.session() as session:
+        session.execute_write(graph_crud.create_skill_depth_index)
+        rounds = session.execute_write(graph_crud.backfill_skill_depths)
+    print(
+        f"Backfilled skill depths in {rounds} rounds "
+        f"({time.perf_counter() - started:.2f}s)."
+    )
+
+
+def write_snapshot(args):
+    """Writes the skill graph to a binary snapshot file for the API workers.
+
+    The file is replaced atomically; workers notice the new version and remap
+    it. With --interval the snapshot is rewritten until interrupted.
+    """
+    if not args.path:
+        raise SystemExit("No snapshot path given; pass --path or set SKILL_GRAPH_FILE.")
+    driver = get_graph_db_driver()
+    while True:
+        started = time.perf_counter()
+        graph = read_skill_graph(driver)
+        skills, dependencies, size = write_skill_graph(graph, args.path)
+        print(
+            f"Wrote {skills} skills and {dependencies} dependencies to "
+            f"'{args.path}' ({size / 1e6:.1f} MB, "
+            f"{time.perf_counter() - started:.2f}s)."
+        )
+        if not args.interval:
+            return
+        time.sleep(args.interval)
+
+
+def cohort_gaps(args):
+    """Reports the cohort's missing prerequisites for the target skills."""
+    emails = None
+    if args.emails:
+        with open(args.emails) as f:
+            emails = [line.strip() for line in f if line.strip()]
+    driver = get_graph_db_driver()
+    skill_snapshot.try_load(driver)
+    started = time.perf_counter()
+    gaps = compute_cohort_gaps(driver, skill_snapshot, args.target, emails)
+    if gaps is None:
+        raise SystemExit("None of the target skills were found in the graph.")
+    report = gaps.report(top=args.top, include_users=bool(args.output))
+
+    print(
+        f"{report['users']} users, {len(report['required_skills'])} required skills, "
+        f"average coverage {report['average_coverage_percent']}%, "
+        f"{report['users_fully_covered']} fully covered "
+        f"({time.perf_counter() - started:.2f}s)."
+    )
+    for missing in report["most_common_missing"]:
+        print(
+            f"  {missing['skill']}: missing for {missing['users_missing']} users "
+            f"({missing['percent_of_users']}%)"
+        )
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["email", "coverage_percent", "missing"])
+            for user in report["user_gaps"]:
+                writer.writerow(
+                    [user["email"], user["coverage_percent"], "; ".join(user["missing"])]
+                )
+        print(f"Wrote per-user gaps to '{args.output}'.")
+
+
+def import_skills(args):
+    """Streams a skill taxonomy file into the graph in parallel batches."""
+    driver = get_graph_db_driver()
+    started = time.perf_counter()
+    try:
+        report = skill_import.import_taxonomy(
+            driver,
+            args.path,
+            args.format,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            resume=not args.restart,
+        )
+    except skill_import.SkillImportError as e:
+        raise SystemExit(str(e))
+    records = sum(phase["records"] for phase in report.values())
+    print(
+        f"Imported {records} records from '{args.path}' "
+        f"({time.perf_counter() - started:.2f}s)."
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m api.cli",
+        description="Maintenance commands for the SkillForge graph.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    schema = commands.add_parser(
+        "migrate",
+        help="Create the graph's constraints and indexes (schema migrations).",
+    )
+    schema.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report the schema version and missing indexes.",
+    )
+    schema.set_defaults(func=migrate)
+
+    backfill = commands.add_parser(
+        "backfill-depth", help="Compute the stored depth of every :Skill node."
+    )
+    backfill.set_defaults(func=backfill_depth)
+
+    snapshot = commands.add_parser(
+        "write-snapshot",
+        help="Write the skill graph to a memory-mappable snapshot file.",
+    )
+    snapshot.add_argument(
+        "--path",
+        default=SKILL_GRAPH_FILE,
+        help="Snapshot file to write (default: $SKILL_GRAPH_FILE).",
+    )
+    snapshot.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="Rewrite the snapshot every INTERVAL seconds instead of once.",
+    )
+    snapshot.set_defaults(func=write_snapshot)
+
+    gaps = commands.add_parser(
+        "cohort-gaps",
+        help="Report which prerequisites of a role a cohort of users is missing.",
+    )
+    gaps.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="A target skill; repeat for several.",
+    )
+    gaps.add_argument(
+        "--emails", help="File with one user email per line (default: every user)."
+    )
+    gaps.add_argument(
+        "--top", type=int, default=10, help="How many common gaps to list."
+    )
+    gaps.add_argument("--output", help="Write per-user gaps to this CSV file.")
+    gaps.set_defaults(func=cohort_gaps)
+
+    importer = commands.add_parser(
+        "import-skills",
+        help="Bulk import a skill taxonomy (CSV, JSONL or adjacency JSON).",
+    )
+    importer.add_argument("path", help="The taxonomy file.")
+    importer.add_argument(
+        "--format",
+        choices=skill_import.FORMATS,
+        help="The file's format (default: from its extension).",
+    )
+    importer.add_argument(
+        "--batch-size",
+        type=int,
+        default=skill_import.SKILL_IMPORT_BATCH_SIZE,
+        help="Records written per statement.",
+    )
+    importer.add_argument(
+        "--workers",
+        type=int,
+        default=skill_import.SKILL_IMPORT_WORKERS,
+        help="Writer sessions working in parallel.",
+    )
+    importer.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint of an earlier, failed import of the file.",
+    )
+    importer.set_defaults(func=import_skills)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# api/cohort_gaps.py
+#
+# Skill-gap reporting for a whole cohort of users at once. The cohort's skills
+# are read with one bulk query into a user x skill boolean matrix, and gaps,
+# coverage and the most common missing skills are computed with NumPy instead
+# of one personalized path (two Neo4j reads) per user.
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from neo4j import Driver
+
+from . import graph_crud
+from .skill_snapshot import SkillGraphSnapshot
+
+
+class CohortGaps:
+    """
+    Which required skills each user in a cohort is missing.
+
+    ``held`` is the user x skill matrix over ``skills``: the required skills
+    (the targets' prerequisite closure, marked by the ``required`` vector)
+    followed by any other held skill that builds on one of them. ``covers``
+    maps each of those skills to the required skills it accounts for, so a
+    user holding an advanced skill is not reported as missing its
+    foundations. Skills that are unrelated to the targets get no column.
+    """
+
+    def __init__(
+        self,
+        plan: List[str],
+        user_skills: Dict[str, Iterable[str]],
+        implies: Optional[Dict[str, Iterable[str]]] = None,
+        targets: Optional[List[str]] = None,
+    ):
+        self.plan = list(plan)  # The required skills, most fundamental first
+        self.targets = list(targets) if targets is not None else []
+        self.users = list(user_skills)
+        required_count = len(self.plan)
+
+        skills = list(self.plan)
+        column = {name: j for j, name in enumerate(skills)}
+        implied = []  # (skill column, required column) pairs
+        for name, prerequisites in (implies or {}).items():
+            covered = [
+                column[p]
+                for p in prerequisites
+                if column.get(p, required_count) < required_count
+            ]
+            if not covered:
+                continue
+            if name not in column:
+                column[name] = len(skills)
+                skills.append(name)
+            implied.extend((column[name], j) for j in covered)
+        self.skills = skills
+
+        rows, cols = [], []
+        for i, names in enumerate(user_skills.values()):
+            for name in names:
+                j = column.get(name)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+        held = np.zeros((len(self.users), len(skills)), dtype=bool)
+        held[rows, cols] = True
+        self.held = held
+
+        required = np.zeros(len(skills), dtype=bool)
+        required[:required_count] = True
+        self.required = required
+
+        covers = np.zeros((len(skills), required_count), dtype=np.float32)
+        covers[np.flatnonzero(required), np.arange(required_count)] = 1
+        if implied:
+            sources, destinations = zip(*implied)
+            covers[list(sources), list(destinations)] = 1
+        self.covers = covers
+
+    def covered(self) -> np.ndarray:
+        """User x required-skill matrix of the skills each user has covered."""
+        return (self.held.astype(np.float32) @ self.covers) > 0
+
+    def report(self, top: int = 10, include_users: bool = True) -> dict:
+        plan = np.array(self.plan, dtype=object)
+        covered = self.covered()
+        missing = ~covered
+        required_count = len(self.plan)
+
+        coverage = (
+            covered.mean(axis=1) if required_count else np.ones(len(self.users))
+        )
+        missing_per_skill = missing.sum(axis=0)
+        # Most commonly missing first; ties keep plan order.
+        most_common = np.argsort(-missing_per_skill, kind="stable")[:top]
+        most_common = most_common[missing_per_skill[most_common] > 0]
+
+        report = {
+            "targets": self.targets,
+            "users": len(self.users),
+            "required_skills": self.plan,
+            "average_coverage_percent": round(float(coverage.mean() * 100), 2)
+            if self.users
+            else 0.0,
+            "users_fully_covered": int((coverage == 1).sum()),
+            "most_common_missing": [
+                {
+                    "skill": self.plan[j],
+                    "users_missing": int(missing_per_skill[j]),
+                    "percent_of_users": round(
+                        float(missing_per_skill[j] * 100 / len(self.users)), 2
+                    ),
+                }
+                for j in most_common
+            ],
+        }
+        if include_users:
+            report["user_gaps"] = [
+                {
+                    "email": email,
+                    "coverage_percent": round(float(coverage[i] * 100), 2),
+                    "missing": plan[missing[i]].tolist(),
+                }
+                for i, email in enumerate(self.users)
+            ]
+        return report
+
+
+def compute_cohort_gaps(
+    driver: Driver,
+    snapshot: SkillGraphSnapshot,
+    targets: List[str],
+    emails: Optional[List[str]] = None,
+):
+    """
+    Builds the CohortGaps for ``targets`` over the users in ``emails`` (or
+    every user). Returns None if none of the targets exist. Without the
+    snapshot, the plan and the required skills each held skill accounts for
+    are read with Cypher, so the report is the same either way.
+    """
+    with driver.session() as session:
+        plan = snapshot.learning_plan(targets)
+        if plan is None:
+            plan = session.execute_read(
+                graph_crud.get_consolidated_learning_plan, targets
+            )
+        required, membership = plan
+        if not membership:
+            return None
+        user_skills = dict(
+            session.execute_read(graph_crud.get_cohort_skills, emails)
+        )
+        held = set().union(*user_skills.values()) if user_skills else set()
+        implies = snapshot.prerequisites_among(held, required)
+        if implies is None:
+            implies = session.execute_read(
+                graph_crud.get_prerequisites_among, held, required
+            )
+    return CohortGaps(required, user_skills, implies, targets=list(membership))
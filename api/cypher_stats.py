@@ -0,0 +1,352 @@
+# api/cypher_stats.py
+#
+# Per-query Cypher statistics. database.py hands out the drivers wrapped so
+# that their sessions' execute_read / execute_write pass every transaction
+# function a transaction whose ``run`` is timed. Only the driver's public API
+# is used (session, execute_read/execute_write, ManagedTransaction.run,
+# Result and ResultSummary); tests/test_cypher_stats.py checks it against the
+# installed driver. For each
+# named query, the stats keep the number of calls, rows returned, wall time
+# (from ``run`` until the last record is read) as a histogram, and the
+# server's result_available_after / result_consumed_after from the result
+# summary.
+#
+# A query is named after its graph_crud constant (CREATE_SKILL_QUERY, ...),
+# or else after the transaction function that ran it. Queries slower than
+# CYPHER_SLOW_QUERY_MS are logged. A CYPHER_PROFILE_SAMPLE_RATE share of the
+# runs of the graph_crud constants is sent with PROFILE, and the last plan's
+# db hits and operators are kept per query. Served by GET /admin/queries.
+
+import os
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from neo4j import AsyncDriver
+
+CYPHER_SLOW_QUERY_MS = float(os.getenv("CYPHER_SLOW_QUERY_MS", "500"))
+CYPHER_PROFILE_SAMPLE_RATE = float(os.getenv("CYPHER_PROFILE_SAMPLE_RATE", "0"))
+
+# Upper bounds (ms) of the wall time histogram buckets; the last is open.
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def _query_names() -> Dict[str, str]:
+    from . import graph_crud
+
+    return {
+        value: name
+        for name, value in vars(graph_crud).items()
+        if name.endswith("_QUERY") and isinstance(value, str)
+    }
+
+
+def _caller_name() -> str:
+    """The transaction function calling ``run``, skipping private helpers."""
+    frame = sys._getframe(3)  # Past _start and run
+    while frame is not None and frame.f_code.co_name.startswith("_"):
+        frame = frame.f_back
+    return frame.f_code.co_name if frame is not None else "unknown"
+
+
+def _plan_totals(plan) -> tuple:
+    """Total db hits and the operators of a PROFILE plan, top down."""
+    db_hits = plan.get("dbHits", 0)
+    operators = [plan.get("operatorType")]
+    for child in plan.get("children", []):
+        child_hits, child_operators = _plan_totals(child)
+        db_hits += child_hits
+        operators += child_operators
+    return db_hits, operators
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.rows = 0
+        self.wall_ms_total = 0.0
+        self.wall_ms_max = 0.0
+        self.available_after_ms_total = 0
+        self.consumed_after_ms_total = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.profile = None
+
+    def report(self) -> dict:
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "rows": self.rows,
+            "wall_ms_total": round(self.wall_ms_total, 3),
+            "wall_ms_mean": round(self.wall_ms_total / count, 3),
+            "wall_ms_max": round(self.wall_ms_max, 3),
+            "available_after_ms_mean": round(self.available_after_ms_total / count, 3),
+            "consumed_after_ms_mean": round(self.consumed_after_ms_total / count, 3),
+            "histogram_ms": {
+                (f"<={bound}" if bound is not None else f">{HISTOGRAM_BOUNDS_MS[-1]}"): n
+                for bound, n in zip(HISTOGRAM_BOUNDS_MS + [None], self.histogram)
+            },
+            "profile": self.profile,
+        }
+
+
+class CypherStats:
+    def __init__(
+        self,
+        slow_query_ms: float = CYPHER_SLOW_QUERY_MS,
+        profile_sample_rate: float = CYPHER_PROFILE_SAMPLE_RATE,
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.profile_sample_rate = profile_sample_rate
+        self._queries: Dict[str, QueryStats] = {}
+        self._names: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def instrument(self, driver):
+        """The driver to use instead of ``driver``: the same driver, with
+        sessions whose transaction functions are timed."""
+        if isinstance(driver, AsyncDriver):
+            return AsyncInstrumentedDriver(driver, self)
+        return InstrumentedDriver(driver, self)
+
+    # --- Recording ---
+
+    def _start(self, query: str) -> "QueryRun":
+        if self._names is None:
+            self._names = _query_names()
+        known = self._names.get(query)
+        profile = (
+            known is not None
+            and self.profile_sample_rate > 0
+            and random.random() < self.profile_sample_rate
+        )
+        return QueryRun(known or _caller_name(), "PROFILE " + query if profile else query, profile)
+
+    def _record(self, run: "QueryRun", summary):
+        wall_ms = 1000 * ((run.end or time.perf_counter()) - run.start)
+        with self._lock:
+            stats = self._queries.setdefault(run.name, QueryStats())
+            stats.count += 1
+            stats.rows += run.rows
+            stats.wall_ms_total += wall_ms
+            stats.wall_ms_max = max(stats.wall_ms_max, wall_ms)
+            stats.histogram[bisect_left(HISTOGRAM_BOUNDS_MS, wall_ms)] += 1
+            if summary is not None:
+                stats.available_after_ms_total += summary.result_available_after or 0
+                stats.consumed_after_ms_total += summary.result_consumed_after or 0
+                if run.profiled and summary.profile:
+                    db_hits, operators = _plan_totals(summary.profile)
+                    stats.profile = {
+                        "db_hits": db_hits,
+                        "operators": operators,
+                        "rows": run.rows,
+                        "sampled_at": time.time(),
+                    }
+        if wall_ms > self.slow_query_ms:
+            print(f"WARNING: Slow Cypher query {run.name}: {wall_ms:.0f} ms, {run.rows} rows")
+
+    def _finish(self, runs: List["QueryRun"]):
+        for run in runs:
+            try:
+                summary = run.result.consume()
+            except Exception:
+                summary = None  # The transaction failed; keep the timing
+            self._record(run, summary)
+
+    async def _async_finish(self, runs: List["QueryRun"]):
+        for run in runs:
+            try:
+                summary = await run.result.consume()
+            except Exception:
+                summary = None
+            self._record(run, summary)
+
+    def wrap(self, func):
+        def instrumented(tx, *args, **kwargs):
+            runs = []
+            try:
+                return func(InstrumentedTransaction(tx, self, runs), *args, **kwargs)
+            finally:
+                self._finish(runs)
+
+        return instrumented
+
+    def async_wrap(self, func):
+        async def instrumented(tx, *args, **kwargs):
+            runs = []
+            try:
+                return await func(AsyncInstrumentedTransaction(tx, self, runs), *args, **kwargs)
+            finally:
+                await self._async_finish(runs)
+
+        return instrumented
+
+    # --- Reporting ---
+
+    def report(self) -> Dict[str, dict]:
+        """The stats of every query, the most total wall time first."""
+        with self._lock:
+            reports = {name: stats.report() for name, stats in self._queries.items()}
+        return dict(sorted(reports.items(), key=lambda item: -item[1]["wall_ms_total"]))
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+
+
+class QueryRun:
+    def __init__(self, name: str, query: str, profiled: bool):
+        self.name = name
+        self.query = query
+        self.profiled = profiled
+        self.start = time.perf_counter()
+        self.end = None  # When the last record was read
+        self.rows = 0
+        self.result = None
+
+
+# --- Wrappers ---
+
+
+class _Proxy:
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+class CountingResult(_Proxy):
+    def __init__(self, result, run: QueryRun):
+        super().__init__(result)
+        self._run = run
+
+    def __iter__(self):
+        for record in self._target:
+            self._run.rows += 1
+            yield record
+        self._run.end = time.perf_counter()
+
+    def single(self, *args, **kwargs):
+        record = self._target.single(*args, **kwargs)
+        self._run.rows += record is not None
+        self._run.end = time.perf_counter()
+        return record
+
+    def data(self, *args, **kwargs):
+        records = self._target.data(*args, **kwargs)
+        self._run.rows += len(records)
+        self._run.end = time.perf_counter()
+        return records
+
+
+class AsyncCountingResult(_Proxy):
+    def __init__(self, result, run: QueryRun):
+        super().__init__(result)
+        self._run = run
+
+    async def __aiter__(self):
+        async for record in self._target:
+            self._run.rows += 1
+            yield record
+        self._run.end = time.perf_counter()
+
+    async def single(self, *args, **kwargs):
+        record = await self._target.single(*args, **kwargs)
+        self._run.rows += record is not None
+        self._run.end = time.perf_counter()
+        return record
+
+    async def data(self, *args, **kwargs):
+        records = await self._target.data(*args, **kwargs)
+        self._run.rows += len(records)
+        self._run.end = time.perf_counter()
+        return records
+
+
+class InstrumentedTransaction(_Proxy):
+    def __init__(self, tx, stats: CypherStats, runs: List[QueryRun]):
+        super().__init__(tx)
+        self._stats = stats
+        self._runs = runs
+
+    def run(self, query, parameters=None, **kwparameters):
+        run = self._stats._start(query)
+        run.result = self._target.run(run.query, parameters, **kwparameters)
+        self._runs.append(run)
+        return CountingResult(run.result, run)
+
+
+class AsyncInstrumentedTransaction(_Proxy):
+    def __init__(self, tx, stats: CypherStats, runs: List[QueryRun]):
+        super().__init__(tx)
+        self._stats = stats
+        self._runs = runs
+
+    async def run(self, query, parameters=None, **kwparameters):
+        run = self._stats._start(query)
+        run.result = await self._target.run(run.query, parameters, **kwparameters)
+        self._runs.append(run)
+        return AsyncCountingResult(run.result, run)
+
+
+class InstrumentedDriver(_Proxy):
+    def __init__(self, driver, stats: CypherStats):
+        super().__init__(driver)
+        self._stats = stats
+
+    def session(self, *args, **kwargs):
+        return InstrumentedSession(self._target.session(*args, **kwargs), self._stats)
+
+
+class AsyncInstrumentedDriver(_Proxy):
+    def __init__(self, driver, stats: CypherStats):
+        super().__init__(driver)
+        self._stats = stats
+
+    def session(self, *args, **kwargs):
+        return AsyncInstrumentedSession(self._target.session(*args, **kwargs), self._stats)
+
+
+class InstrumentedSession(_Proxy):
+    def __init__(self, session, stats: CypherStats):
+        super().__init__(session)
+        self._stats = stats
+
+    def __enter__(self):
+        self._target.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._target.__exit__(*exc)
+
+    def execute_read(self, func, *args, **kwargs):
+        return self._target.execute_read(self._stats.wrap(func), *args, **kwargs)
+
+    def execute_write(self, func, *args, **kwargs):
+        return self._target.execute_write(self._stats.wrap(func), *args, **kwargs)
+
+
+class AsyncInstrumentedSession(_Proxy):
+    def __init__(self, session, stats: CypherStats):
+        super().__init__(session)
+        self._stats = stats
+
+    async def __aenter__(self):
+        await self._target.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._target.__aexit__(*exc)
+
+    async def execute_read(self, func, *args, **kwargs):
+        return await self._target.execute_read(self._stats.async_wrap(func), *args, **kwargs)
+
+    async def execute_write(self, func, *args, **kwargs):
+        return await self._target.execute_write(self._stats.async_wrap(func), *args, **kwargs)
+
+
+# Statistics shared by both drivers
+cypher_stats = CypherStats()
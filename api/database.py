@@ -24,7 +24,10 @@ from sqlalchemy import (
 )
 from sqlalchemy.engine import Connection
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from neo4j import GraphDatabase, Driver
+from neo4j import AsyncDriver, AsyncGraphDatabase, AsyncSession, GraphDatabase, Driver
+
+from .cypher_stats import cypher_stats
+from .graph_pool import PoolMetrics, pool_config
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -71,12 +74,15 @@ if not NEO4J_PASSWORD:
 class GraphDatabaseManager:
     def __init__(self):
         self.driver: Driver = None
+        self.metrics = PoolMetrics()
 
     def connect(self):
         """Establishes the connection to the Neo4j database."""
-        self.driver = GraphDatabase.driver(
-            NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD)
+        driver = GraphDatabase.driver(
+            NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD), **pool_config()
         )
+        self.metrics.attach(driver)
+        self.driver = cypher_stats.instrument(driver)
 
     def close(self):
         """Closes the connection."""
@@ -107,6 +113,48 @@ def get_graph_db_session() -> GraphDBSession:
         yield session
 
 
+# The request handlers use the async driver, so a request waiting on Neo4j
+# does not hold one of the threadpool's threads. The sync driver above is
+# kept for startup loaders, background jobs and the CLI.
+class AsyncGraphDatabaseManager:
+    def __init__(self):
+        self.driver: AsyncDriver = None
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        """Creates the async driver; it connects on first use."""
+        driver = AsyncGraphDatabase.driver(
+            NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD), **pool_config()
+        )
+        self.metrics.attach(driver)
+        self.driver = cypher_stats.instrument(driver)
+
+    async def close(self):
+        """Closes the connection."""
+        if self.driver is not None:
+            await self.driver.close()
+            self.driver = None
+
+
+async_graph_db_manager = AsyncGraphDatabaseManager()
+
+
+# FastAPI dependency to get the async database driver
+def get_async_graph_db_driver() -> AsyncDriver:
+    if async_graph_db_manager.driver is None:
+        async_graph_db_manager.connect()
+    return async_graph_db_manager.driver
+
+
+AsyncGraphDBSession = AsyncSession
+
+# FastAPI dependency to get an async Neo4j session
+async def get_async_graph_db_session() -> AsyncGraphDBSession:
+    driver = get_async_graph_db_driver()
+    async with driver.session() as session:
+        yield session
+
+
 # This object will be used by our RAG chain.
 if os.getenv("TESTING_MODE") == "True":
     from unittest.mock import MagicMock
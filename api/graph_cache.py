@@ -0,0 +1,125 @@
+# api/graph_cache.py
+#
+# In-process cache for the skill taxonomy reads that the skill endpoints
+# repeat on every call: the skill list and its pages, a skill's direct
+# prerequisites and its consolidated learning path.
+#
+# Every entry is tagged with the graph version it was read at. Each skill
+# write in this process (creating, renaming or deleting a skill, adding a
+# dependency, skills created by accomplishments and imports) bumps the
+# version, so the next read misses and goes to Neo4j. A read that overlaps a
+# write is not stored. Other API processes cannot bump this counter, so
+# entries also expire after GRAPH_CACHE_TTL_SECONDS, the same way the skill
+# graph snapshot is refreshed. Least recently used entries are evicted past
+# GRAPH_CACHE_MAX_ENTRIES; 0 turns the cache off.
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from neo4j import AsyncDriver
+
+GRAPH_CACHE_MAX_ENTRIES = int(os.getenv("GRAPH_CACHE_MAX_ENTRIES", "2048"))
+GRAPH_CACHE_TTL_SECONDS = float(os.getenv("GRAPH_CACHE_TTL_SECONDS", "300"))
+
+
+def deep_sizeof(value) -> int:
+    """Approximate bytes held by ``value`` and the containers inside it."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item) for item in value)
+    return size
+
+
+class GraphReadCache:
+    """
+    LRU cache of graph reads, keyed on the transaction function and its
+    arguments, and invalidated by the graph version. Cached values are shared
+    between requests, so callers must not modify them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = GRAPH_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = GRAPH_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._entries = OrderedDict()  # key -> (version, expires_at, value, size)
+        self._lock = threading.Lock()  # Imports bump the version from a thread
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self):
+        """Records a write to the skill graph, invalidating every entry."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def get(self, key, version: int):
+        """The entry for ``key`` read at ``version``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == version and entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, version: int, value):
+        """Stores ``value``, unless the graph changed since it was read."""
+        if self.max_entries <= 0:
+            return
+        size = deep_sizeof(value)
+        with self._lock:
+            if version != self.version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        self._bytes -= self._entries.pop(key)[3]
+
+    async def read(self, driver: AsyncDriver, func: Callable, *args):
+        """``func(tx, *args)`` in a read transaction, or its cached result."""
+        key = (func.__name__,) + args
+        version = self.version
+        entry = self.get(key, version)
+        if entry is not None:
+            return entry[2]
+        async with driver.session() as session:
+            value = await session.execute_read(func, *args)
+        self.put(key, version, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+            }
+
+
+# A single cache shared by the whole application
+graph_cache = GraphReadCache()
@@ -1,273 +1,802 @@
 import uuid
 from neo4j import GraphDatabase
-from typing import List
+from typing import List, Optional
 from . import schemas # Import schemas
 
+# Queries that api/async_graph_crud.py runs as well are module constants,
+# defined just above the function that uses them.
+
 # Create Operations
 
 
-def create_skill(tx, skill_name):
+CREATE_SKILL_QUERY = (
+    "MERGE (s:Skill {name: $skill_name}) "
+    "ON CREATE SET s.depth = 0, s.duration_minutes = $duration_minutes "
+    "RETURN s.name AS name"
+)
+
+
+def create_skill(tx, skill_name, duration_minutes=None):
     """
-    Creates a new skill node in the database.
+    Creates a new skill node in the database, optionally with an estimate of
+    the minutes it takes to learn.
     This function is designed to be called within a transaction
     """
-    query = "MERGE (s:Skill {name: $skill_name}) " "RETURN s.name AS name"
-    result = tx.run(query, skill_name=skill_name)
+    # A new skill has no prerequisites yet, so it starts at depth 0.
+    result = tx.run(CREATE_SKILL_QUERY, skill_name=skill_name, duration_minutes=duration_minutes)
     return result.single()
 
 
+CREATE_SKILLS_IF_MISSING_QUERY = """
+UNWIND $skill_names AS skill_name
+OPTIONAL MATCH (existing:Skill {name: skill_name})
+WITH skill_name, existing IS NULL AS created
+MERGE (s:Skill {name: skill_name})
+ON CREATE SET s.depth = 0
+RETURN s.name AS name, created
+"""
+
+
+def create_skills_if_missing(tx, skill_names):
+    """
+    Creates every skill in ``skill_names`` that does not exist yet, in one
+    statement, and returns the names of the skills it created.
+    """
+    result = tx.run(CREATE_SKILLS_IF_MISSING_QUERY, skill_names=list(dict.fromkeys(skill_names)))
+    return [record["name"] for record in result if record["created"]]
+
+
+SET_SKILL_DURATION_QUERY = (
+    "MATCH (s:Skill {name: $skill_name}) "
+    "SET s.duration_minutes = $duration_minutes "
+    "RETURN s.name AS name"
+)
+
+
+def set_skill_duration(tx, skill_name, duration_minutes):
+    """
+    Sets the estimated minutes it takes to learn a skill. Returns the skill's
+    name, or None if it does not exist.
+    """
+    record = tx.run(
+        SET_SKILL_DURATION_QUERY, skill_name=skill_name, duration_minutes=duration_minutes
+    ).single()
+    return record["name"] if record else None
+
+
 # Read Operations
 
 
+GET_ALL_SKILLS_QUERY = "MATCH (s:Skill) RETURN s.name AS name ORDER BY s.name"
+
+
 def get_all_skills(tx):
     """
     Retrieves all skill nodes from the database.
     This function is designed to be called within a transaction
     """
-    query = "MATCH (s:Skill) RETURN s.name AS name ORDER BY s.name"
-    result = tx.run(query)
+    result = tx.run(GET_ALL_SKILLS_QUERY)
     return [record["name"] for record in result]
 
 
+# --- Keyset Pages ---
+
+# Each page starts strictly after a cursor, the last key of the previous page
+# ("" for the first page), and seeks into the key's index instead of
+# skipping over earlier rows, so every page costs the same.
+
+
+GET_SKILLS_PAGE_QUERY = """
+MATCH (s:Skill)
+WHERE s.name > $after
+RETURN s.name AS name, s.description AS description,
+       s.duration_minutes AS duration_minutes, s.depth AS depth
+ORDER BY s.name
+LIMIT $limit
+"""
+
+
+def get_skills_page(tx, after: str = "", limit: int = 1000):
+    """The next ``limit`` skills by name after the name ``after``."""
+    return [record.data() for record in tx.run(GET_SKILLS_PAGE_QUERY, after=after, limit=limit)]
+
+
+def get_dependencies_page(tx, after: str = "", limit: int = 1000):
+    """
+    The DEPENDS_ON edges of the next ``limit`` skills that have any, by name
+    after the name ``after``, as (skill, sorted prerequisites) pairs.
+    """
+    query = """
+    MATCH (parent:Skill)
+    WHERE parent.name > $after AND EXISTS { (parent)-[:DEPENDS_ON]->(:Skill) }
+    WITH parent ORDER BY parent.name LIMIT $limit
+    RETURN parent.name AS parent,
+           [(parent)-[:DEPENDS_ON]->(child:Skill) | child.name] AS children
+    """
+    return [
+        (record["parent"], sorted(record["children"]))
+        for record in tx.run(query, after=after, limit=limit)
+    ]
+
+
+def get_accomplishments_page(tx, after: str = "", limit: int = 1000):
+    """
+    The next ``limit`` accomplishments by id after the id ``after``, each with
+    its user's email and the skills it demonstrates.
+    """
+    query = """
+    MATCH (a:Accomplishment)
+    WHERE a.id > $after
+    WITH a ORDER BY a.id LIMIT $limit
+    OPTIONAL MATCH (u:User)-[:COMPLETED]->(a)
+    RETURN a.id AS id, u.email AS user_email, a.name AS name,
+           a.description AS description, a.proof_url AS proof_url,
+           toString(a.timestamp) AS timestamp,
+           [(a)-[:DEMONSTRATES]->(s:Skill) | s.name] AS skills
+    ORDER BY a.id
+    """
+    return [record.data() for record in tx.run(query, after=after, limit=limit)]
+
+
+SEARCH_SKILL_NAMES_QUERY = (
+    "MATCH (s:Skill) WHERE toLower(s.name) STARTS WITH toLower($prefix) "
+    "RETURN s.name AS name ORDER BY s.name LIMIT $limit"
+)
+
+
+def search_skill_names(tx, prefix, limit):
+    """
+    Finds up to ``limit`` skill names starting with ``prefix`` (ignoring
+    case), alphabetically. Used for autocomplete until the in-memory index
+    is loaded.
+    """
+    result = tx.run(SEARCH_SKILL_NAMES_QUERY, prefix=prefix, limit=limit)
+    return [record["name"] for record in result]
+
+
+def get_skill_popularity(tx):
+    """
+    Retrieves every skill's name with the number of users who have
+    demonstrated it through an accomplishment, for autocomplete ranking.
+    """
+    query = """
+    MATCH (s:Skill)
+    OPTIONAL MATCH (u:User)-[:COMPLETED]->(:Accomplishment)-[:DEMONSTRATES]->(s)
+    RETURN s.name AS name, count(DISTINCT u) AS popularity
+    """
+    result = tx.run(query)
+    return [(record["name"], record["popularity"]) for record in result]
+
+
+GET_SKILL_BY_NAME_QUERY = "MATCH (s:Skill {name: $skill_name}) RETURN s.name AS name"
+
+
 def get_skill_by_name(tx, skill_name):
     """
     Finds a specific skill by its name.
     """
-    query = "MATCH (s:Skill {name: $skill_name}) RETURN s.name AS name"
-    result = tx.run(query, skill_name=skill_name)
+    result = tx.run(GET_SKILL_BY_NAME_QUERY, skill_name=skill_name)
     return result.single()
 
 
+UPDATE_SKILL_QUERY = (
+    "MATCH (s:Skill {name: $old_name}) "
+    "SET s.name = $new_name "
+    "RETURN s.name AS name"
+)
+
+
 def update_skill(tx, old_name, new_name):
     """
     Updates the name of an existing skill node.
     """
-    query = (
-        "MATCH (s:Skill {name: $old_name}) "
-        "SET s.name = $new_name "
-        "RETURN s.name AS name"
-    )
-    result = tx.run(query, old_name=old_name, new_name=new_name)
+    result = tx.run(UPDATE_SKILL_QUERY, old_name=old_name, new_name=new_name)
     return result.single()
 
 
 # --- Delete Operations ---
 
 
+DELETE_SKILL_QUERY = """
+MATCH (s:Skill {name: $skill_name})
+OPTIONAL MATCH (dependent:Skill)-[:DEPENDS_ON]->(s)
+WITH s, collect(dependent.name) AS dependents
+DETACH DELETE s
+RETURN dependents
+"""
+
+
 def delete_skill(tx, skill_name):
     """
     Deletes a skill node and its relationships.
     """
     # Using DETACH DELETE ensures that the node and any relationships
     # attached to it are deleted, preventing orphaned relationships.
-    query = "MATCH (s:Skill {name: $skill_name}) DETACH DELETE s"
-    tx.run(query, skill_name=skill_name)
+    # The skills that depended on it may now have a shorter longest path,
+    # so their names are collected first and their depth recomputed after.
+    record = tx.run(DELETE_SKILL_QUERY, skill_name=skill_name).single()
+    if record and record["dependents"]:
+        recompute_skill_depths(tx, record["dependents"])
+
+
+# The cycle check runs in the write transaction itself. Every dependency
+# write first locks one shared node, so two concurrent writes that would
+# close a cycle together (A -> B and B -> A) run one after the other and the
+# second one sees the first one's edge.
+ADD_SKILL_DEPENDENCY_QUERY = """
+MERGE (lock:SkillGraphLock {name: 'DEPENDS_ON'})
+SET lock.locked_at = datetime()
+WITH lock
+MATCH (parent:Skill {name: $parent_skill_name})
+MATCH (child:Skill {name: $child_skill_name})
+WITH parent, child, EXISTS { (child)-[:DEPENDS_ON*0..]->(parent) } AS closes_cycle
+FOREACH (_ IN CASE WHEN closes_cycle THEN [] ELSE [1] END |
+    MERGE (parent)-[:DEPENDS_ON]->(child)
+)
+RETURN NOT closes_cycle AS added
+"""
 
 
 def add_skill_dependency(tx, parent_skill_name, child_skill_name):
     """
-    Creates a DEPENDS_ON relationship from a parent skill to a child skill.
+    Creates a DEPENDS_ON relationship from a parent skill to a child skill,
+    unless it would close a cycle. Returns that cycle, as
+    find_dependency_cycle does, if so, and an empty list otherwise.
     """
-    query = (
-        "MATCH (parent:Skill {name: $parent_skill_name}) "
-        "MATCH (child:Skill {name: $child_skill_name}) "
-        "MERGE (parent)-[:DEPENDS_ON]->(child)"
-    )
-    tx.run(
-        query, parent_skill_name=parent_skill_name, child_skill_name=child_skill_name
-    )
+    record = tx.run(
+        ADD_SKILL_DEPENDENCY_QUERY, parent_skill_name=parent_skill_name, child_skill_name=child_skill_name
+    ).single()
+    if record is not None and not record["added"]:
+        return find_dependency_cycle(tx, parent_skill_name, child_skill_name)
+    recompute_skill_depths(tx, [parent_skill_name])
+    return []
+
+
+FIND_DEPENDENCY_CYCLE_QUERY = (
+    "MATCH (parent:Skill {name: $parent_skill_name}) "
+    "MATCH (child:Skill {name: $child_skill_name}) "
+    "MATCH path = shortestPath((child)-[:DEPENDS_ON*]->(parent)) "
+    "RETURN [skill IN nodes(path) | skill.name] AS cycle"
+)
+
+
+def find_dependency_cycle(tx, parent_skill_name, child_skill_name):
+    """
+    Returns the cycle a new (parent)-[:DEPENDS_ON]->(child) edge would close,
+    as skill names from the parent back to the parent, each depending on the
+    next, or an empty list if the edge is safe.
+    """
+    if parent_skill_name == child_skill_name:
+        return [parent_skill_name, parent_skill_name]
+    record = tx.run(
+        FIND_DEPENDENCY_CYCLE_QUERY, parent_skill_name=parent_skill_name, child_skill_name=child_skill_name
+    ).single()
+    if record is None:
+        return []
+    return [parent_skill_name] + record["cycle"]
+
+
+# --- Skill Depth Maintenance ---
+
+# Every :Skill stores `depth`, the length of its longest DEPENDS_ON chain down
+# to a skill with no prerequisites (depth 0). Learning paths sort on it
+# instead of enumerating paths on every request.
+
+# Upper bound on propagation rounds, so a cycle in legacy data cannot loop forever.
+MAX_DEPTH_ROUNDS = 1000
+
+
+RECOMPUTE_SKILL_DEPTHS_QUERY = """
+UNWIND $names AS name
+MATCH (s:Skill {name: name})
+OPTIONAL MATCH (s)-[:DEPENDS_ON]->(prereq:Skill)
+WITH s, coalesce(MAX(prereq.depth) + 1, 0) AS depth
+WHERE s.depth IS NULL OR s.depth <> depth
+SET s.depth = depth
+WITH s
+MATCH (dependent:Skill)-[:DEPENDS_ON]->(s)
+RETURN DISTINCT dependent.name AS name
+"""
+
+
+def recompute_skill_depths(tx, skill_names):
+    """
+    Recomputes `depth` for the given skills from their direct prerequisites,
+    then repeats for the dependents of every skill whose depth changed.
+    Only the skills downstream of a change are ever touched.
+    """
+    names = list(skill_names)
+    rounds = 0
+    while names and rounds < MAX_DEPTH_ROUNDS:
+        names = [record["name"] for record in tx.run(RECOMPUTE_SKILL_DEPTHS_QUERY, names=names)]
+        rounds += 1
+
+
+def create_skill_depth_index(tx):
+    """
+    Creates the index that lets learning paths sort skills by depth.
+    """
+    tx.run("CREATE INDEX skill_depth IF NOT EXISTS FOR (s:Skill) ON (s.depth)")
+
+
+def backfill_skill_depths(tx):
+    """
+    Computes `depth` for every skill in the graph from scratch, one layer of
+    the dependency graph per query. Returns the number of rounds it took.
+    """
+    tx.run("MATCH (s:Skill) SET s.depth = 0")
+    raise_query = """
+    MATCH (s:Skill)-[:DEPENDS_ON]->(prereq:Skill)
+    WITH s, MAX(prereq.depth) + 1 AS depth
+    WHERE s.depth < depth
+    SET s.depth = depth
+    RETURN count(s) AS updated
+    """
+    rounds = 0
+    while rounds < MAX_DEPTH_ROUNDS:
+        rounds += 1
+        if not tx.run(raise_query).single()["updated"]:
+            break
+    return rounds
+
+
+# --- Bulk Import ---
+
+
+def import_skill_batch(tx, skills):
+    """
+    Creates or updates a batch of skills, given as {"name", "duration_minutes"}
+    maps, in one statement. A missing duration keeps the stored one.
+    """
+    query = """
+    UNWIND $skills AS skill
+    MERGE (s:Skill {name: skill.name})
+    ON CREATE SET s.depth = 0
+    SET s.duration_minutes = coalesce(skill.duration_minutes, s.duration_minutes)
+    """
+    tx.run(query, skills=skills)
+
+
+def import_dependency_batch(tx, dependencies):
+    """
+    Creates a batch of (parent)-[:DEPENDS_ON]->(child) edges, given as
+    {"parent", "child"} maps, in one statement. Both skills must exist.
+    Depths are not recomputed; run backfill_skill_depths after the import.
+    """
+    query = """
+    UNWIND $dependencies AS dependency
+    MATCH (parent:Skill {name: dependency.parent})
+    MATCH (child:Skill {name: dependency.child})
+    MERGE (parent)-[:DEPENDS_ON]->(child)
+    """
+    tx.run(query, dependencies=dependencies)
 
 
 # In api/graph_crud.py
 
 
+GET_SKILL_DEPENDENCIES_QUERY = (
+    "MATCH (s:Skill {name: $skill_name})-[:DEPENDS_ON]->(dependency:Skill) "
+    "RETURN dependency.name AS dependency_name"
+)
+
+
 def get_skill_dependencies(tx, skill_name):
     """
     Finds all skills that the given skill has a DEPENDS_ON relationship to.
     """
-    query = (
-        "MATCH (s:Skill {name: $skill_name})-[:DEPENDS_ON]->(dependency:Skill) "
-        "RETURN dependency.name AS dependency_name"
-    )
-    result = tx.run(query, skill_name=skill_name)
+    result = tx.run(GET_SKILL_DEPENDENCIES_QUERY, skill_name=skill_name)
     return [record["dependency_name"] for record in result]
 
 
 # In api/graph_crud.py
 
 
+GET_CONSOLIDATED_LEARNING_PATH_QUERY = """
+MATCH (target:Skill {name: $skill_name})-[:DEPENDS_ON*0..]->(prereq:Skill)
+WITH DISTINCT prereq
+ORDER BY prereq.depth ASC, prereq.name
+RETURN COLLECT(prereq.name) AS path
+"""
+
+
 def get_consolidated_learning_path(tx, skill_name):
     """
     Finds all prerequisite skills for a target skill and returns them
     as a single, unique, ordered learning path.
     """
-    # This query finds all prerequisite nodes, calculates their "depth"
-    # (longest path to a root), and returns a unique, sorted list of skill names.
-    query = """
-    MATCH (target:Skill {name: $skill_name})
-    // Find all skills that the target depends on (at any depth)
-    MATCH (prereq) WHERE (target)-[:DEPENDS_ON*0..]->(prereq)
-    // For each of those skills, find its longest path back to a true root
-    MATCH p = (prereq)-[:DEPENDS_ON*0..]->(root)
-    WHERE NOT (root)-[:DEPENDS_ON]->()
-    // Return the unique skills, ordered by their depth (most fundamental first)
-    WITH prereq, MAX(length(p)) AS depth
-    ORDER BY depth DESC
-    WITH COLLECT(prereq.name) AS path_with_duplicates
-    // Unwind the collection and get distinct elements to preserve order
-    UNWIND path_with_duplicates as skill_name
-    RETURN COLLECT(DISTINCT skill_name) as path
-    """
-    result = tx.run(query, skill_name=skill_name)
+    # This query finds every distinct prerequisite node (DISTINCT lets Neo4j
+    # prune the expansion instead of enumerating every path) and sorts them by
+    # their stored depth, the longest path to a root, most fundamental first.
+    result = tx.run(GET_CONSOLIDATED_LEARNING_PATH_QUERY, skill_name=skill_name)
     # The query now returns a single record containing one path
     record = result.single()
     return record["path"] if record else []
 
 
+GET_CONSOLIDATED_LEARNING_PLAN_QUERY = """
+UNWIND $skill_names AS skill_name
+MATCH (target:Skill {name: skill_name})-[:DEPENDS_ON*0..]->(prereq:Skill)
+WITH DISTINCT target, prereq
+WITH prereq, COLLECT(target.name) AS targets
+ORDER BY prereq.depth ASC, prereq.name
+RETURN prereq.name AS name, targets
+"""
+
+
+def get_consolidated_learning_plan(tx, skill_names):
+    """
+    Finds the prerequisites of several target skills in one query and returns
+    (plan, membership): the deduplicated skills ordered most fundamental first,
+    and for each target found, the plan entries on its own path.
+    """
+    # DISTINCT target/prereq pairs let Neo4j prune the expansion, so shared
+    # prerequisites are only reached once per target.
+    result = tx.run(GET_CONSOLIDATED_LEARNING_PLAN_QUERY, skill_names=list(skill_names))
+    plan = []
+    membership = {}
+    for record in result:
+        plan.append(record["name"])
+        for target in record["targets"]:
+            membership.setdefault(target, []).append(record["name"])
+    return plan, membership
+
+
+GET_COVERED_SKILLS_QUERY = """
+UNWIND $held_skills AS held_skill
+MATCH (:Skill {name: held_skill})-[:DEPENDS_ON*]->(prereq:Skill)
+WHERE prereq.name IN $candidates
+RETURN COLLECT(DISTINCT prereq.name) AS covered
+"""
+
+
+def get_covered_skills(tx, held_skills, candidates):
+    """
+    The ``candidates`` a user holding ``held_skills`` does not need to learn:
+    the held skills themselves and everything they build on. The same rule
+    the in-memory snapshot applies to personalized paths and plans.
+    """
+    covered = set(held_skills)
+    if held_skills:
+        record = tx.run(
+            GET_COVERED_SKILLS_QUERY,
+            held_skills=list(held_skills), candidates=list(candidates),
+        ).single()
+        if record:
+            covered.update(record["covered"])
+    return covered
+
+
+GET_PREREQUISITES_AMONG_QUERY = """
+UNWIND $skill_names AS name
+MATCH (:Skill {name: name})-[:DEPENDS_ON*]->(prereq:Skill)
+WHERE prereq.name IN $candidates
+RETURN name, COLLECT(DISTINCT prereq.name) AS prerequisites
+"""
+
+
+def get_prerequisites_among(tx, skill_names, candidates):
+    """
+    For each skill in ``skill_names``, the ``candidates`` among its
+    (transitive) prerequisites; skills with none are left out. The Cypher
+    counterpart of the snapshot's prerequisites_among.
+    """
+    if not skill_names or not candidates:
+        return {}
+    result = tx.run(
+        GET_PREREQUISITES_AMONG_QUERY,
+        skill_names=list(skill_names), candidates=list(candidates),
+    )
+    return {record["name"]: record["prerequisites"] for record in result}
+
+
+def get_skill_graph_nodes(tx):
+    """
+    Retrieves every skill's name, description and learning time estimate
+    (`duration_minutes`) for the in-memory SkillGraph snapshot.
+    """
+    query = (
+        "MATCH (s:Skill) "
+        "RETURN s.name AS name, s.description AS description, "
+        "s.duration_minutes AS duration_minutes"
+    )
+    result = tx.run(query)
+    return [
+        (record["name"], record["description"], record["duration_minutes"])
+        for record in result
+    ]
+
+
+def get_skill_graph_dependencies(tx):
+    """
+    Retrieves every DEPENDS_ON edge as (parent, child) name pairs, where the
+    child is the prerequisite.
+    """
+    query = (
+        "MATCH (parent:Skill)-[:DEPENDS_ON]->(child:Skill) "
+        "RETURN parent.name AS parent, child.name AS child"
+    )
+    result = tx.run(query)
+    return [(record["parent"], record["child"]) for record in result]
+
+
+CREATE_USER_NODE_QUERY = "MERGE (u:User {email: $email}) RETURN u.email"
+
+
 def create_user_node(tx, email):
     """
     Creates a :User node in the graph with a unique email.
     """
-    query = "MERGE (u:User {email: $email}) RETURN u.email"
-    result = tx.run(query, email=email)
+    result = tx.run(CREATE_USER_NODE_QUERY, email=email)
     return result.single()["u.email"]
 
 
+def merge_user_nodes(tx, emails: List[str]):
+    """Creates the :User nodes of ``emails`` that do not exist yet, in one statement."""
+    query = """
+    UNWIND $emails AS email
+    MERGE (:User {email: email})
+    """
+    tx.run(query, emails=list(emails))
+
+
+def get_user_emails_page(tx, after: str = "", limit: int = 10000):
+    """The next ``limit`` user emails after the email ``after``, in order."""
+    query = """
+    MATCH (u:User)
+    WHERE u.email > $after
+    RETURN u.email AS email
+    ORDER BY u.email
+    LIMIT $limit
+    """
+    return [record["email"] for record in tx.run(query, after=after, limit=limit)]
+
+
 # ---- Quest CRUD Operations ----
+CREATE_QUEST_QUERY = """
+CREATE (q:Quest {id: $id, name: $name, description: $description})
+RETURN q
+"""
+
+
 def create_quest(tx, quest_data):
     """Creates a new Quest node and returns it."""
     new_id = str(uuid.uuid4())
-    query = """
-    CREATE (q:Quest {id: $id, name: $name, description: $description})
-    RETURN q
-    """
-    result = tx.run(query, id=new_id, **quest_data).single()
+    result = tx.run(CREATE_QUEST_QUERY, id=new_id, **quest_data).single()
     return result['q']
 
 
-def create_quest_and_link_to_user(tx, quest_data, user_email):
+CREATE_USER_QUEST_QUERY = """
+CREATE (q:Quest {id: $id, name: $name, description: $description})
+SET q.plan_index = $plan_index
+RETURN q
+"""
+
+LINK_USER_TO_QUEST_QUERY = """
+MATCH (u:User {email: $user_email})
+MATCH (q:Quest {id: $quest_id})
+MERGE (u)-[:HAS_QUEST]->(q)
+"""
+
+
+def create_quest_and_link_to_user(tx, quest_data, user_email, plan_index=None):
     """
     Creates a new Quest node, links it to the specified User with a HAS_QUEST relationship,
-    and returns the Quest node.
+    and returns the Quest node. A quest created for a step of a goal's plan
+    stores the step's position as `plan_index`.
     """
     new_quest_id = str(uuid.uuid4())
     # Create the Quest node
-    create_quest_query = """
-    CREATE (q:Quest {id: $id, name: $name, description: $description})
-    RETURN q
-    """
-    quest_node = tx.run(create_quest_query, id=new_quest_id, name=quest_data['name'], description=quest_data['description']).single()['q']
+    quest_node = tx.run(CREATE_USER_QUEST_QUERY, id=new_quest_id, name=quest_data['name'], description=quest_data['description'], plan_index=plan_index).single()['q']
 
     # Link the Quest to the User
-    link_user_to_quest_query = """
-    MATCH (u:User {email: $user_email})
-    MATCH (q:Quest {id: $quest_id})
-    MERGE (u)-[:HAS_QUEST]->(q)
-    """
-    tx.run(link_user_to_quest_query, user_email=user_email, quest_id=new_quest_id)
+    tx.run(LINK_USER_TO_QUEST_QUERY, user_email=user_email, quest_id=new_quest_id)
 
     return quest_node
 
 
+CREATE_GOAL_AND_LINK_TO_USER_QUERY = """
+MATCH (u:User {email: $user_email})
+CREATE (g:Goal {
+    id: $id,
+    user_email: $user_email,
+    goal_text: $goal_text,
+    status: 'in-progress',
+    full_plan_json: $full_plan_json,
+    step_count: size($steps)
+})
+CREATE (u)-[:HAS_GOAL]->(g)
+FOREACH (i IN range(0, size($steps) - 1) |
+    CREATE (g)-[:HAS_STEP]->(:PlanStep {
+        goal_id: $id,
+        position: i,
+        title: $steps[i].title,
+        description: $steps[i].description,
+        duration_minutes: $steps[i].duration_minutes
+    })
+)
+RETURN g
+"""
+
+
 def create_goal_and_link_to_user(tx, goal_data: schemas.GoalCreate, user_email: str):
     """
     Creates a new Goal node, links it to the user, and returns the Goal node.
+    Each task of the plan is also stored as a (:PlanStep {goal_id, position})
+    node, so the plan never has to be parsed again to find a step.
     """
+    import json
+
     goal_id = str(uuid.uuid4())
-    query = """
-    MATCH (u:User {email: $user_email})
-    CREATE (g:Goal {
-        id: $id,
-        user_email: $user_email,
-        goal_text: $goal_text,
-        status: 'in-progress',
-        full_plan_json: $full_plan_json
-    })
-    CREATE (u)-[:HAS_GOAL]->(g)
-    RETURN g
-    """
     result = tx.run(
-        query,
+        CREATE_GOAL_AND_LINK_TO_USER_QUERY,
         id=goal_id,
         user_email=user_email,
         goal_text=goal_data.goal_text,
-        full_plan_json=goal_data.full_plan_json
+        full_plan_json=goal_data.full_plan_json,
+        steps=json.loads(goal_data.full_plan_json),
     ).single()
     return result['g']
 
 
-def advance_goal(tx, completed_quest_id: str, user_email: str):
-    """Advance a goal's state machine after a quest is completed."""
-    import json
-
-    # Locate the goal that currently has this quest as its active quest. We only
-    # need the Goal node here; the Quest's title will be fetched separately.
-    find_query = """
-    MATCH (u:User {email: $user_email})-[:HAS_GOAL]->(g:Goal)-[:HAS_ACTIVE_QUEST]->(q:Quest {id: $quest_id})
-    RETURN g
-    """
-    record = tx.run(find_query, user_email=user_email, quest_id=completed_quest_id).single()
-    if not record:
-        return None
-
-    goal_node = record["g"]
-
-    plan = json.loads(goal_node["full_plan_json"])
-
-    # Look up the completed quest's name to determine its position in the plan
-    get_name_query = "MATCH (q:Quest {id: $quest_id}) RETURN q.name AS name"
-    quest_name_record = tx.run(get_name_query, quest_id=completed_quest_id).single()
-    completed_name = quest_name_record["name"] if quest_name_record else None
-    completed_index = next((i for i, t in enumerate(plan) if t["title"] == completed_name), -1)
-    if completed_index == -1:
-        return None
-
-    # Remove the active quest relationship
-    delete_rel_query = """
-    MATCH (g:Goal {id: $goal_id})-[r:HAS_ACTIVE_QUEST]->(q:Quest {id: $quest_id})
+ADVANCE_GOAL_QUERY = """
+MATCH (u:User {email: $user_email})-[:HAS_GOAL]->(g:Goal)-[r:HAS_ACTIVE_QUEST]->(old:Quest {id: $quest_id})
+OPTIONAL MATCH (old)-[:FOR_STEP]->(step:PlanStep)
+OPTIONAL MATCH (next:PlanStep {goal_id: g.id, position: step.position + 1})
+WITH u, g, r, old, step, next, step IS NULL AS legacy
+FOREACH (_ IN CASE WHEN legacy THEN [] ELSE [1] END |
     DELETE r
+    SET step.completed = true
+)
+FOREACH (_ IN CASE WHEN NOT legacy AND next IS NULL THEN [1] ELSE [] END |
+    SET g.status = 'completed'
+    MERGE (u)-[:ACHIEVED_GOAL]->(g)
+)
+FOREACH (_ IN CASE WHEN next IS NULL THEN [] ELSE [1] END |
+    CREATE (q:Quest {id: $new_id, name: next.title, description: next.description, plan_index: next.position})
+    CREATE (u)-[:HAS_QUEST]->(q)
+    CREATE (g)-[:HAS_ACTIVE_QUEST]->(q)
+    CREATE (old)-[:PRECEDES]->(q)
+    CREATE (q)-[:FOR_STEP]->(next)
+)
+WITH g, old, legacy
+OPTIONAL MATCH (old)-[:PRECEDES]->(q:Quest {id: $new_id})
+RETURN q, legacy, g.id AS goal_id,
+       CASE WHEN legacy THEN EXISTS { (g)-[:HAS_STEP]->() } END AS has_steps,
+       CASE WHEN legacy THEN g.full_plan_json END AS plan
+"""
+
+
+# Active quests created before plans were stored as :PlanStep nodes (schema
+# version 3) have no FOR_STEP relationship. ADVANCE_GOAL_QUERY leaves them
+# untouched and says so (`legacy`), along with whether their goal has steps
+# and, if not, its plan. Until the migration has run, such a quest's goal is
+# then given its steps and the quest is linked to its step (by plan_index, or
+# else by title), and the goal is advanced as usual.
+LINK_LEGACY_QUEST_TO_STEP_QUERY = """
+MATCH (g:Goal {id: $goal_id})-[:HAS_ACTIVE_QUEST]->(q:Quest {id: $quest_id})
+FOREACH (i IN CASE WHEN $steps IS NULL THEN [] ELSE range(0, size($steps) - 1) END |
+    MERGE (s:PlanStep {goal_id: g.id, position: i})
+    ON CREATE SET s.title = $steps[i].title,
+        s.description = $steps[i].description,
+        s.duration_minutes = $steps[i].duration_minutes
+    MERGE (g)-[:HAS_STEP]->(s)
+)
+SET g.step_count = coalesce(g.step_count, size($steps))
+WITH g, q
+MATCH (g)-[:HAS_STEP]->(s:PlanStep)
+WHERE s.position = q.plan_index OR (q.plan_index IS NULL AND s.title = q.name)
+WITH g, q, min(s.position) AS position
+MATCH (g)-[:HAS_STEP]->(s:PlanStep {position: position})
+SET q.plan_index = position
+MERGE (q)-[:FOR_STEP]->(s)
+RETURN position
+"""
+
+
+def legacy_plan_steps(record) -> tuple:
     """
-    tx.run(delete_rel_query, goal_id=goal_node["id"], quest_id=completed_quest_id)
+    For a legacy ADVANCE_GOAL_QUERY record, whether its quest can be linked
+    to a step, and the steps to create first (None if the goal has them).
+    """
+    import json
 
-    # If there is a next task, create the quest and set it as active
-    if completed_index + 1 < len(plan):
-        next_task = plan[completed_index + 1]
-        new_quest_data = {"name": next_task["title"], "description": next_task["description"]}
-        new_quest_node = create_quest_and_link_to_user(tx, new_quest_data, user_email)
+    if record["has_steps"]:
+        return True, None
+    try:
+        return True, json.loads(record["plan"])
+    except (TypeError, ValueError):
+        print(
+            f"WARNING: Goal {record['goal_id']} has no plan steps and an unreadable "
+            f"plan; its active quest cannot advance it. Run `python -m api.cli migrate`."
+        )
+        return False, None
+
+
+def warn_unlinked_legacy_quest(goal_id, quest_id):
+    print(
+        f"WARNING: Quest {quest_id} matches no step of goal {goal_id}'s plan; "
+        f"the goal cannot advance. Run `python -m api.cli migrate`."
+    )
 
-        # Link goal to new quest as active
-        link_active_query = """
-        MATCH (g:Goal {id: $goal_id})
-        MATCH (q:Quest {id: $quest_id})
-        CREATE (g)-[:HAS_ACTIVE_QUEST]->(q)
-        """
-        tx.run(link_active_query, goal_id=goal_node["id"], quest_id=new_quest_node["id"])
 
-        # Link old quest to new quest for history
-        precedes_query = """
-        MATCH (old:Quest {id: $old_id})
-        MATCH (new:Quest {id: $new_id})
-        CREATE (old)-[:PRECEDES]->(new)
-        """
-        tx.run(precedes_query, old_id=completed_quest_id, new_id=new_quest_node["id"])
+def link_legacy_quest_to_step(tx, record, completed_quest_id: str) -> bool:
+    """
+    Links the legacy active quest of an ADVANCE_GOAL_QUERY ``record`` to its
+    :PlanStep, creating the goal's steps first if needed. Returns False if it
+    cannot be linked.
+    """
+    linkable, steps = legacy_plan_steps(record)
+    if not linkable:
+        return False
+    linked = tx.run(
+        LINK_LEGACY_QUEST_TO_STEP_QUERY,
+        goal_id=record["goal_id"], quest_id=completed_quest_id, steps=steps,
+    ).single()
+    if linked is None:
+        warn_unlinked_legacy_quest(record["goal_id"], completed_quest_id)
+        return False
+    return True
 
-        return new_quest_node
 
-    # Otherwise mark the goal completed and link achievement
-    complete_query = """
-    MATCH (g:Goal {id: $goal_id})
-    SET g.status = 'completed'
+def advance_goal(tx, completed_quest_id: str, user_email: str):
     """
-    tx.run(complete_query, goal_id=goal_node["id"])
-
-    achieve_query = """
-    MATCH (u:User {email: $user_email})
-    MATCH (g:Goal {id: $goal_id})
-    MERGE (u)-[:ACHIEVED_GOAL]->(g)
+    Advance a goal's state machine after a quest is completed, in one
+    statement: the completed quest's :PlanStep is marked done and the step at
+    the next position, an index seek, becomes the goal's new active quest.
+    Without one the goal is completed. Returns the next Quest node, or None
+    if the goal is complete or the quest is not the active quest of one of
+    the user's goals. Only a legacy quest costs more statements.
+    """
+    params = dict(user_email=user_email, quest_id=completed_quest_id, new_id=str(uuid.uuid4()))
+    result = tx.run(ADVANCE_GOAL_QUERY, **params).single()
+    if result is not None and result["legacy"] and link_legacy_quest_to_step(
+        tx, result, completed_quest_id
+    ):
+        result = tx.run(ADVANCE_GOAL_QUERY, **params).single()
+    return result["q"] if result else None
+
+
+GET_GOAL_PROGRESS_QUERY = """
+MATCH (:User {email: $user_email})-[:HAS_GOAL]->(g:Goal {id: $goal_id})
+OPTIONAL MATCH (g)-[:HAS_ACTIVE_QUEST]->(:Quest)-[:FOR_STEP]->(current:PlanStep)
+OPTIONAL MATCH (remaining:PlanStep {goal_id: g.id})
+WHERE remaining.position >= current.position
+RETURN g.status AS status,
+       g.step_count AS total_steps,
+       current.position AS position,
+       current.title AS current_step,
+       sum(coalesce(remaining.duration_minutes, 0)) AS remaining_minutes
+"""
+
+
+def get_goal_progress(tx, goal_id: str, user_email: str):
+    """
+    Progress through a goal's plan, read from its active quest's :PlanStep
+    and the steps after it. Returns None if the user has no such goal.
     """
-    tx.run(achieve_query, user_email=user_email, goal_id=goal_node["id"])
+    record = tx.run(GET_GOAL_PROGRESS_QUERY, goal_id=goal_id, user_email=user_email).single()
+    return goal_progress_from_record(goal_id, record)
 
-    return None
+
+def goal_progress_from_record(goal_id: str, record):
+    if not record:
+        return None
+
+    total = record["total_steps"] or 0
+    if record["position"] is not None:
+        completed = record["position"]
+    else:
+        completed = total if record["status"] == "completed" else 0
+    return {
+        "goal_id": goal_id,
+        "status": record["status"],
+        "total_steps": total,
+        "completed_steps": completed,
+        "progress_percent": round(100 * completed / total, 1) if total else 0.0,
+        "current_step": record["current_step"],
+        "remaining_minutes": record["remaining_minutes"],
+    }
 
 
 # ---- Accomplishment CRUD Operations ----
@@ -313,6 +842,44 @@ def create_accomplishment(tx, user: schemas.User, accomplishment_data, quest_id:
     return accomplishment_node
 
 
+def accomplishment_properties(accomplishment_data):
+    """The properties of a new Accomplishment node, with a fresh id."""
+    return {
+        "id": str(uuid.uuid4()),
+        "name": accomplishment_data.get("name"),
+        "description": accomplishment_data.get("description"),
+        "proof_url": accomplishment_data.get("proof_url"),
+    }
+
+
+CREATE_ACCOMPLISHMENT_WITH_FULFILMENT_QUERY = """
+MATCH (u:User {email: $user_email})
+CREATE (a:Accomplishment)
+SET a = $props, a.timestamp = datetime()
+CREATE (u)-[:COMPLETED]->(a)
+WITH a
+OPTIONAL MATCH (q:Quest {id: $quest_id})
+FOREACH (quest IN CASE WHEN q IS NULL THEN [] ELSE [q] END |
+    CREATE (a)-[:FULFILLS]->(quest)
+)
+RETURN a
+"""
+
+
+def create_accomplishment_with_fulfilment(tx, user_email: str, accomplishment_data, quest_id: str = None):
+    """
+    Creates an Accomplishment, links it to the user and, if ``quest_id``
+    names an existing Quest, to the Quest it fulfills, in one statement.
+    """
+    result = tx.run(
+        CREATE_ACCOMPLISHMENT_WITH_FULFILMENT_QUERY,
+        user_email=user_email,
+        props=accomplishment_properties(accomplishment_data),
+        quest_id=str(quest_id) if quest_id else None,
+    ).single()
+    return result['a']
+
+
 def link_accomplishment_to_skill(tx, accomplishment_id: str, skill_name: str):
     """
     Links an Accomplishment to a Skill with a DEMONSTRATES relationship.
@@ -325,6 +892,77 @@ def link_accomplishment_to_skill(tx, accomplishment_id: str, skill_name: str):
     tx.run(query, accomplishment_id=accomplishment_id, skill_name=skill_name)
 
 
+# Mastery levels the skill extractor reports, lowest first. A user's
+# HAS_SKILL level is the highest one demonstrated; other values are kept
+# only until a known level is demonstrated.
+MASTERY_LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+
+def mastery_level(level: Optional[str]) -> Optional[str]:
+    """``level`` as one of MASTERY_LEVELS when it names one, in any case."""
+    if level is None:
+        return None
+    for known in MASTERY_LEVELS:
+        if level.strip().lower() == known.lower():
+            return known
+    return level.strip()
+
+
+def skill_evidence(skills) -> List[dict]:
+    """
+    ``skills``, names or (name, level) pairs, as one {name, level} entry per
+    name with the highest level given for it.
+    """
+    evidence = {}
+    for skill in skills:
+        name, level = (skill, None) if isinstance(skill, str) else skill
+        level = mastery_level(level)
+        current = evidence.get(name)
+        if current is None or (
+            level in MASTERY_LEVELS
+            and (current not in MASTERY_LEVELS
+                 or MASTERY_LEVELS.index(level) > MASTERY_LEVELS.index(current))
+        ):
+            evidence[name] = level
+    return [{"name": name, "level": level} for name, level in evidence.items()]
+
+
+# A user's skill profile is materialized as
+# (:User)-[:HAS_SKILL {level, evidence_count, last_seen}]->(:Skill), updated
+# here as evidence is added, so reading it is a single hop from the user.
+# Only new DEMONSTRATES edges count as evidence, so linking the same skill
+# again does not inflate the count.
+LINK_ACCOMPLISHMENT_TO_SKILLS_QUERY = """
+MATCH (u:User)-[:COMPLETED]->(a:Accomplishment {id: $accomplishment_id})
+UNWIND $skills AS skill
+MATCH (s:Skill {name: skill.name})
+WHERE NOT EXISTS { (a)-[:DEMONSTRATES]->(s) }
+CREATE (a)-[:DEMONSTRATES {level: skill.level}]->(s)
+MERGE (u)-[h:HAS_SKILL]->(s)
+ON CREATE SET h.evidence_count = 0
+SET h.evidence_count = h.evidence_count + 1,
+    h.level = coalesce([l IN $levels WHERE l IN [h.level, skill.level]][-1], h.level, skill.level),
+    h.last_seen = CASE
+        WHEN h.last_seen IS NULL OR a.timestamp > h.last_seen THEN a.timestamp
+        ELSE h.last_seen
+    END
+"""
+
+
+def link_accomplishment_to_skills(tx, accomplishment_id: str, skills):
+    """
+    Links an Accomplishment to each of ``skills`` (names, or (name, mastery
+    level) pairs) with a DEMONSTRATES relationship, and updates the user's
+    HAS_SKILL profile, in one statement.
+    """
+    tx.run(
+        LINK_ACCOMPLISHMENT_TO_SKILLS_QUERY,
+        accomplishment_id=accomplishment_id,
+        skills=skill_evidence(skills),
+        levels=MASTERY_LEVELS,
+    )
+
+
 def get_user_skills(tx, email):
     """
     Retrieves a list of all skills a user has.
@@ -337,69 +975,146 @@ def get_user_skills(tx, email):
     return [record["skill_name"] for record in result]
 
 
+GET_USER_SKILL_PROFILE_QUERY = """
+MATCH (u:User {email: $email})-[h:HAS_SKILL]->(s:Skill)
+RETURN s.name AS skill, h.level AS level, h.evidence_count AS evidence_count,
+       h.last_seen AS last_seen
+ORDER BY skill
+"""
+
+
+def get_user_skill_profile(tx, email: str) -> List[dict]:
+    """A user's skills with their mastery level, evidence count and last evidence time."""
+    return [record.data() for record in tx.run(GET_USER_SKILL_PROFILE_QUERY, email=email)]
+
+
+REMOVE_USER_SKILL_QUERY = """
+MATCH (u:User {email: $email})-[r:HAS_SKILL]->(s:Skill {name: $skill_name})
+DELETE r
+"""
+
+
 def remove_user_skill(tx, email, skill_name):
     """
     Deletes the :HAS_SKILL relationship between a User and a Skill.
     """
-    query = """
-    MATCH (u:User {email: $email})-[r:HAS_SKILL]->(s:Skill {name: $skill_name})
-    DELETE r
+    tx.run(REMOVE_USER_SKILL_QUERY, email=email, skill_name=skill_name)
+
+
+# HAS_SKILL profiles are complete once schema migration 4 has backfilled
+# them. Until this process has seen the graph at that version, the profile
+# reads walk the accomplishments instead, and check the version again on
+# the next read.
+SKILL_PROFILE_SCHEMA_VERSION = 4
+SCHEMA_VERSION_QUERY = "MATCH (m:SchemaMigration) RETURN max(m.version) AS version"
+_skill_profiles_ready = False
+
+
+def skill_profiles_ready(tx) -> bool:
+    """Whether the HAS_SKILL profiles have been backfilled."""
+    global _skill_profiles_ready
+    if not _skill_profiles_ready:
+        record = tx.run(SCHEMA_VERSION_QUERY).single()
+        _skill_profiles_ready = skill_profiles_backfilled(record)
+    return _skill_profiles_ready
+
+
+def skill_profiles_backfilled(record) -> bool:
+    """Whether a SCHEMA_VERSION_QUERY record is at SKILL_PROFILE_SCHEMA_VERSION."""
+    return bool(record) and (record["version"] or 0) >= SKILL_PROFILE_SCHEMA_VERSION
+
+
+def get_cohort_skills(tx, emails: Optional[List[str]] = None):
+    """
+    Retrieves the skills demonstrated through accomplishments by every user in
+    ``emails`` (or by every user) in a single query, from their HAS_SKILL
+    profiles. Returns (email, skills) pairs; users without accomplishments
+    have an empty list.
     """
-    tx.run(query, email=email, skill_name=skill_name)
+    if skill_profiles_ready(tx):
+        skills = "OPTIONAL MATCH (u)-[:HAS_SKILL]->(s:Skill)"
+    else:
+        skills = "OPTIONAL MATCH (u)-[:COMPLETED]->(:Accomplishment)-[:DEMONSTRATES]->(s:Skill)"
+    query = f"""
+    MATCH (u:User)
+    WHERE $emails IS NULL OR u.email IN $emails
+    {skills}
+    RETURN u.email AS email, COLLECT(DISTINCT s.name) AS skills
+    ORDER BY email
+    """
+    result = tx.run(query, emails=emails)
+    return [(record["email"], record["skills"]) for record in result]
+
+
+GET_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY = """
+MATCH (u:User {email: $email})-[:HAS_SKILL]->(s:Skill)
+RETURN COLLECT(s.name) AS skills
+"""
+
+WALK_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY = """
+MATCH (u:User {email: $email})-[:COMPLETED]->(:Accomplishment)-[:DEMONSTRATES]->(s:Skill)
+RETURN COLLECT(DISTINCT s.name) AS skills
+"""
 
 
 def get_user_skills_by_accomplishments(tx, email: str) -> List[str]:
     """
-    Retrieves a list of unique skill names a user has demonstrated through accomplishments.
+    Retrieves a list of unique skill names a user has demonstrated through
+    accomplishments, from their materialized HAS_SKILL profile.
     """
-    query = """
-    MATCH (u:User {email: $email})-[:COMPLETED]->(a:Accomplishment)-[:DEMONSTRATES]->(s:Skill)
-    RETURN COLLECT(DISTINCT s.name) AS skills
-    """
-    result = tx.run(query, email=email)
-    record = result.single()
+    if skill_profiles_ready(tx):
+        query = GET_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY
+    else:
+        query = WALK_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY
+    record = tx.run(query, email=email).single()
     return record["skills"] if record and record["skills"] is not None else []
 
 
+GET_ACCOMPLISHMENT_DETAILS_QUERY = """
+MATCH (u:User)-[:COMPLETED]->(a:Accomplishment {id: $accomplishment_id})
+RETURN u, a
+"""
+
+
 def get_accomplishment_details(tx, accomplishment_id):
-    query = """
-    MATCH (u:User)-[:COMPLETED]->(a:Accomplishment {id: $accomplishment_id})
-    RETURN u, a
-    """
-    result = tx.run(query, accomplishment_id=str(accomplishment_id))
+    result = tx.run(GET_ACCOMPLISHMENT_DETAILS_QUERY, accomplishment_id=str(accomplishment_id))
     record = result.single()
     if record:
         return {"user": record["u"], "accomplishment": record["a"]}
     return None
 
 
+STORE_VC_RECEIPT_QUERY = """
+MATCH (u:User)-[r:COMPLETED]->(a:Accomplishment {id: $accomplishment_id})
+SET r.vc_id = $vc_id,
+    r.vc_issuanceDate = $vc_issuanceDate
+RETURN r
+"""
+
+
 def store_vc_receipt(tx, accomplishment_id, vc_receipt):
     """
     Finds the [:COMPLETED] relationship for an accomplishment and adds
     properties to it to store a receipt of the issued Verifiable Credential.
     """
-    query = """
-    MATCH (u:User)-[r:COMPLETED]->(a:Accomplishment {id: $accomplishment_id})
-    SET r.vc_id = $vc_id,
-        r.vc_issuanceDate = $vc_issuanceDate
-    RETURN r
-    """
     tx.run(
-        query,
+        STORE_VC_RECEIPT_QUERY,
         accomplishment_id=str(accomplishment_id),
         vc_id=vc_receipt["id"],
         vc_issuanceDate=vc_receipt["issuanceDate"]
     )
 
 
+USER_EXISTS_QUERY = """
+MATCH (u:User {email: $email})
+RETURN count(u) > 0 AS user_exists
+"""
+
+
 def user_exists(tx, email: str) -> bool:
     """
     Checks if a user with the given email exists in the database.
     Returns True if the user exists, False otherwise.
     """
-    query = """
-    MATCH (u:User {email: $email})
-    RETURN count(u) > 0 AS user_exists
-    """
-    result = tx.run(query, email=email).single()
+    result = tx.run(USER_EXISTS_QUERY, email=email).single()
     return result["user_exists"] if result else False
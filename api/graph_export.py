@@ -0,0 +1,61 @@
+# api/graph_export.py
+#
+# Streaming export of the graph as NDJSON, one JSON object per line. Rows are
+# read a page at a time with keyset cursors (see the keyset page functions in
+# graph_crud), each page in its own short read transaction, and written out
+# before the next page is read, so memory use does not depend on the size of
+# the graph. An interrupted export is continued by passing the last key it
+# wrote as ``after``. The skills and dependencies exports are JSONL files
+# that `python -m api.cli import-skills` reads back.
+
+import json
+import os
+from typing import Callable, Dict, Iterator, Tuple
+
+from neo4j import Driver
+
+from . import graph_crud
+
+# Rows read per Neo4j round trip.
+GRAPH_EXPORT_PAGE_SIZE = int(os.getenv("GRAPH_EXPORT_PAGE_SIZE", "1000"))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _skill_rows(page):
+    for skill in page:
+        yield skill["name"], skill
+
+
+def _dependency_rows(page):
+    # One line per skill, so a cursor never splits a skill's prerequisites.
+    for parent, children in page:
+        yield parent, {"name": parent, "prerequisites": children}
+
+
+def _accomplishment_rows(page):
+    for accomplishment in page:
+        yield accomplishment["id"], accomplishment
+
+
+# Export name -> (page function, the page's (cursor, row) pairs)
+EXPORTS: Dict[str, Tuple[Callable, Callable]] = {
+    "skills": (graph_crud.get_skills_page, _skill_rows),
+    "dependencies": (graph_crud.get_dependencies_page, _dependency_rows),
+    "accomplishments": (graph_crud.get_accomplishments_page, _accomplishment_rows),
+}
+
+
+def export_ndjson(
+    driver: Driver, export: str, after: str = "", page_size: int = GRAPH_EXPORT_PAGE_SIZE
+) -> Iterator[str]:
+    """The rows of ``export`` after the cursor ``after``, as NDJSON lines."""
+    read_page, rows = EXPORTS[export]
+    with driver.session() as session:
+        while True:
+            page = session.execute_read(read_page, after, page_size)
+            for cursor, row in rows(page):
+                yield json.dumps(row, ensure_ascii=False) + "\n"
+                after = cursor
+            if len(page) < page_size:
+                return
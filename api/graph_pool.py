@@ -0,0 +1,153 @@
+# api/graph_pool.py
+#
+# Connection pool settings, start-up and metrics for the Neo4j drivers. The
+# pool size, acquisition timeout and connection lifetime come from the
+# environment. At startup the lifespan checks connectivity and opens
+# NEO4J_POOL_WARM_CONNECTIONS connections of the async driver, the one the
+# request handlers use, up front, so the first requests after a deploy do
+# not pay for the TCP/TLS handshake and Bolt authentication.
+#
+# The driver has no public pool statistics. PoolMetrics reads the pool's
+# connections and times its ``acquire`` calls. Both are driver internals, so
+# if a driver release changes them the metrics go empty; the pool itself
+# keeps working.
+
+import inspect
+import os
+import threading
+import time
+from collections import deque
+from contextlib import AsyncExitStack
+from typing import Dict, Optional
+
+from neo4j import AsyncDriver
+
+NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "100"))
+# Seconds a session waits for a free connection before failing.
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(
+    os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60")
+)
+# Seconds after which a connection is closed instead of reused. Keep it below
+# any idle timeout of the load balancers between the API and Neo4j.
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+NEO4J_POOL_WARM_CONNECTIONS = int(os.getenv("NEO4J_POOL_WARM_CONNECTIONS", "4"))
+
+# Acquisition wait times kept for the percentiles
+RECENT_ACQUISITIONS = 1000
+
+
+def pool_config() -> dict:
+    """Keyword arguments for GraphDatabase.driver and AsyncGraphDatabase.driver."""
+    return {
+        "max_connection_pool_size": NEO4J_MAX_CONNECTION_POOL_SIZE,
+        "connection_acquisition_timeout": NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME,
+    }
+
+
+class PoolMetrics:
+    """Connections in use and idle, and how long sessions wait for one."""
+
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+        self._acquisitions = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent = deque(maxlen=RECENT_ACQUISITIONS)
+
+    def attach(self, driver):
+        """Starts timing the connection acquisitions of ``driver``'s pool."""
+        pool = getattr(driver, "_pool", None)
+        acquire = getattr(pool, "acquire", None)
+        if acquire is None:
+            print("WARNING: The Neo4j driver's pool is not accessible; no pool metrics.")
+            return
+        if inspect.iscoroutinefunction(acquire):
+            async def timed_acquire(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await acquire(*args, **kwargs)
+                finally:
+                    self._record(time.perf_counter() - start)
+        else:
+            def timed_acquire(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return acquire(*args, **kwargs)
+                finally:
+                    self._record(time.perf_counter() - start)
+        pool.acquire = timed_acquire
+        self._pool = pool
+
+    def _record(self, seconds: float):
+        with self._lock:
+            self._acquisitions += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+            self._recent.append(seconds)
+
+    def _connection_counts(self):
+        connections = getattr(self._pool, "connections", None)
+        if connections is None:
+            return None, None
+        in_use = idle = 0
+        for address_connections in list(connections.values()):
+            for connection in list(address_connections):
+                if connection.in_use:
+                    in_use += 1
+                else:
+                    idle += 1
+        return in_use, idle
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        in_use, idle = self._connection_counts()
+        with self._lock:
+            recent = sorted(self._recent)
+            acquisitions = self._acquisitions
+            wait_total = self._wait_total
+            wait_max = self._wait_max
+        p95 = recent[int(0.95 * (len(recent) - 1))] if recent else 0.0
+        return {
+            "max_size": NEO4J_MAX_CONNECTION_POOL_SIZE,
+            "in_use": in_use,
+            "idle": idle,
+            "acquisitions": acquisitions,
+            "acquisition_wait_ms_mean": round(
+                1000 * wait_total / acquisitions if acquisitions else 0.0, 3
+            ),
+            "acquisition_wait_ms_p95": round(1000 * p95, 3),
+            "acquisition_wait_ms_max": round(1000 * wait_max, 3),
+        }
+
+
+# --- Startup ---
+
+
+async def warm_up(
+    driver: AsyncDriver, connections: int = NEO4J_POOL_WARM_CONNECTIONS
+) -> int:
+    """
+    Checks connectivity and opens ``connections`` pooled connections. Each
+    session keeps its connection until it closes, so the sessions are closed
+    only after all of them have run.
+    """
+    await driver.verify_connectivity()
+    connections = min(connections, NEO4J_MAX_CONNECTION_POOL_SIZE)
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            session = await stack.enter_async_context(driver.session())
+            await session.run("RETURN 1")
+    return connections
+
+
+async def try_warm_up(driver: AsyncDriver) -> bool:
+    """Warms up at startup, logging instead of raising on failure."""
+    try:
+        warmed = await warm_up(driver)
+        print(f"Neo4j is reachable; {warmed} pooled connections opened.")
+        return True
+    except Exception as e:
+        # Requests open their connections on demand instead.
+        print(f"WARNING: Could not warm up the Neo4j connection pool. Error: {e}")
+        return False
@@ -0,0 +1,365 @@
+# api/graph_schema.py
+#
+# Versioned schema migrations for the Neo4j graph. Every lookup key used by
+# graph_crud (Skill.name, User.email, Quest.id, Goal.id, Accomplishment.id)
+# gets a uniqueness constraint, which also gives it an index, so MATCH and
+# MERGE on those keys are index seeks instead of label scans. The constraints
+# also make concurrent MERGEs of the same skill safe.
+#
+# Goal plans are stored as ordered (:PlanStep {goal_id, position}) nodes
+# (version 3), indexed on (goal_id, position) so a plan's next step is a seek.
+# The pair is unique from version 6, which replaces the index with a
+# constraint.
+#
+# A user's skills are materialized as HAS_SKILL relationships with their
+# mastery level and evidence (version 4), backfilled from accomplishments.
+#
+# Skill dependency writes lock a single (:SkillGraphLock) node so their
+# cycle checks run one at a time; its name is unique (version 5), so
+# concurrent writes cannot create two of them.
+#
+# The applied version is recorded as (:SchemaMigration {version}) nodes, so
+# each migration runs once. Every API worker applies pending migrations at
+# startup (unless GRAPH_SCHEMA_MIGRATE_ON_STARTUP is "false"), possibly at the
+# same time, so each data migration runs in the transaction that records it,
+# after locking a single (:SchemaLock) node and checking that no other
+# process has applied it meanwhile. The statements themselves are idempotent
+# too. `python -m api.cli migrate` applies them by hand.
+
+import json
+import os
+from typing import Callable, List, Optional, Tuple, Union
+
+from neo4j import Driver
+
+from .graph_crud import MASTERY_LEVELS, SCHEMA_VERSION_QUERY
+
+GRAPH_SCHEMA_MIGRATE_ON_STARTUP = (
+    os.getenv("GRAPH_SCHEMA_MIGRATE_ON_STARTUP", "true").lower() != "false"
+)
+
+
+class SchemaMigrationError(RuntimeError):
+    pass
+
+
+# An indexed key: a label and one property, or a tuple of properties for a
+# composite index.
+Key = Tuple[str, Union[str, Tuple[str, ...]]]
+
+
+def _props(props: Union[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    return (props,) if isinstance(props, str) else props
+
+
+def index_name(key: Key) -> str:
+    label, props = key
+    return "_".join([label.lower()] + [prop.lower() for prop in _props(props)])
+
+
+class Migration:
+    """
+    One schema version: uniqueness constraints and indexes, given as
+    (label, property) pairs, the names of indexes to drop first (an index
+    cannot coexist with a constraint on the same key), plus an optional data
+    migration ``data(tx)`` that runs after them.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        description: str,
+        constraints: List[Key] = (),
+        indexes: List[Key] = (),
+        data: Optional[Callable] = None,
+        drop_indexes: List[str] = (),
+    ):
+        self.version = version
+        self.description = description
+        self.constraints = list(constraints)
+        self.indexes = list(indexes)
+        self.data = data
+        self.drop_indexes = list(drop_indexes)
+
+    def statements(self) -> List[str]:
+        statements = [f"DROP INDEX {name} IF EXISTS" for name in self.drop_indexes]
+        for label, props in self.constraints:
+            props = _props(props)
+            key = ", ".join("n." + prop for prop in props)
+            statements.append(
+                f"CREATE CONSTRAINT {index_name((label, props))}_unique IF NOT EXISTS "
+                f"FOR (n:{label}) REQUIRE "
+                + (key if len(props) == 1 else f"({key})")
+                + " IS UNIQUE"
+            )
+        for label, props in self.indexes:
+            props = _props(props)
+            statements.append(
+                f"CREATE INDEX {index_name((label, props))} IF NOT EXISTS FOR (n:{label}) "
+                f"ON ({', '.join('n.' + prop for prop in props)})"
+            )
+        return statements
+
+
+MIGRATIONS = [
+    Migration(
+        1,
+        "Uniqueness constraints on node lookup keys",
+        constraints=[
+            ("Skill", "name"),
+            ("User", "email"),
+            ("Quest", "id"),
+            ("Goal", "id"),
+            ("Accomplishment", "id"),
+        ],
+    ),
+    # Also created by `python -m api.cli backfill-depth`, under the same name.
+    Migration(2, "Index Skill.depth for learning path ordering", indexes=[("Skill", "depth")]),
+    Migration(
+        3,
+        "Goal plans as :PlanStep nodes",
+        indexes=[("PlanStep", ("goal_id", "position"))],
+        data=lambda tx: plan_steps_from_json(tx),  # Defined below
+    ),
+    Migration(
+        4,
+        "Materialize HAS_SKILL profiles from accomplishments",
+        data=lambda tx: has_skill_from_accomplishments(tx),
+    ),
+    Migration(
+        5,
+        "Unique lock node for skill dependency writes",
+        constraints=[("SkillGraphLock", "name")],
+    ),
+    Migration(
+        6,
+        "Unique plan step positions",
+        constraints=[("PlanStep", ("goal_id", "position"))],
+        drop_indexes=[index_name(("PlanStep", ("goal_id", "position")))],
+    ),
+]
+
+# Created before any migration runs, so that concurrent workers cannot
+# create two lock nodes.
+SCHEMA_LOCK_STATEMENT = (
+    "CREATE CONSTRAINT schemalock_name_unique IF NOT EXISTS "
+    "FOR (n:SchemaLock) REQUIRE n.name IS UNIQUE"
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def expected_indexes() -> List[Key]:
+    """Every (label, property) pair the migrations index."""
+    keys = []
+    for migration in MIGRATIONS:
+        for key in migration.constraints + migration.indexes:
+            if key not in keys:
+                keys.append(key)
+    return keys
+
+
+# --- Transaction functions ---
+
+
+def get_schema_version(tx) -> int:
+    """The highest migration version applied to the graph, 0 if none."""
+    record = tx.run(SCHEMA_VERSION_QUERY).single()
+    return record["version"] or 0
+
+
+def record_migration(tx, version: int, description: str):
+    query = """
+    MERGE (m:SchemaMigration {version: $version})
+    ON CREATE SET m.description = $description, m.applied_at = datetime()
+    """
+    tx.run(query, version=version, description=description)
+
+
+def apply_migration_data(tx, migration: Migration) -> bool:
+    """
+    Locks the (:SchemaLock) node, then runs ``migration``'s data migration
+    and records it, unless another process has recorded it meanwhile.
+    Returns whether it was applied here.
+    """
+    tx.run("MERGE (lock:SchemaLock {name: 'migrations'}) SET lock.locked_at = datetime()")
+    record = tx.run(
+        "MATCH (m:SchemaMigration {version: $version}) RETURN count(m) AS applied",
+        version=migration.version,
+    ).single()
+    if record["applied"]:
+        return False
+    if migration.data is not None:
+        migration.data(tx)
+    record_migration(tx, migration.version, migration.description)
+    return True
+
+
+def run_schema_statement(tx, statement: str):
+    # Schema changes cannot share a transaction with data writes.
+    tx.run(statement)
+
+
+def find_duplicate_values(
+    tx, label: str, props: Union[str, Tuple[str, ...]], limit: int = 5
+) -> list:
+    """Values of ``props`` held by more than one ``label`` node, which would
+    make a uniqueness constraint on them fail. A composite key's values are
+    lists."""
+    props = _props(props)
+    value = (
+        f"n.{props[0]}" if len(props) == 1
+        else "[" + ", ".join(f"n.{prop}" for prop in props) + "]"
+    )
+    query = f"""
+    MATCH (n:{label}) WHERE {' AND '.join(f'n.{prop} IS NOT NULL' for prop in props)}
+    WITH {value} AS value, count(*) AS nodes
+    WHERE nodes > 1
+    RETURN value LIMIT $limit
+    """
+    return [record["value"] for record in tx.run(query, limit=limit)]
+
+
+def get_online_indexes(tx) -> set:
+    """Keys, as in ``Migration.indexes``, covered by an online index."""
+    query = """
+    SHOW INDEXES YIELD labelsOrTypes, properties, state
+    WHERE state = 'ONLINE' AND labelsOrTypes IS NOT NULL
+    RETURN labelsOrTypes, properties
+    """
+    keys = set()
+    for record in tx.run(query):
+        props = record["properties"]
+        for label in record["labelsOrTypes"]:
+            keys.add((label, props[0] if len(props) == 1 else tuple(props)))
+    return keys
+
+
+def plan_steps_from_json(tx):
+    """
+    Turns the `full_plan_json` of goals created before plans were stored as
+    :PlanStep nodes into steps, and points each active quest at its step (by
+    its `plan_index`, or else by title). Steps and links are MERGEd, so the
+    legacy quest link in graph_crud cannot duplicate them.
+    """
+    goals = []
+    for record in tx.run(
+        "MATCH (g:Goal) WHERE g.full_plan_json IS NOT NULL AND NOT (g)-[:HAS_STEP]->() "
+        "RETURN g.id AS id, g.full_plan_json AS plan"
+    ):
+        try:
+            steps = json.loads(record["plan"])
+        except ValueError:
+            print(f"WARNING: Goal {record['id']} has an unreadable plan; skipped.")
+            continue
+        goals.append({"goal_id": record["id"], "steps": steps})
+
+    create_query = """
+    UNWIND $goals AS goal
+    MATCH (g:Goal {id: goal.goal_id})
+    SET g.step_count = size(goal.steps)
+    FOREACH (i IN range(0, size(goal.steps) - 1) |
+        MERGE (s:PlanStep {goal_id: g.id, position: i})
+        ON CREATE SET s.title = goal.steps[i].title,
+            s.description = goal.steps[i].description,
+            s.duration_minutes = goal.steps[i].duration_minutes
+        MERGE (g)-[:HAS_STEP]->(s)
+    )
+    """
+    tx.run(create_query, goals=goals)
+
+    link_query = """
+    MATCH (g:Goal)-[:HAS_ACTIVE_QUEST]->(q:Quest)
+    WHERE NOT (q)-[:FOR_STEP]->()
+    MATCH (g)-[:HAS_STEP]->(s:PlanStep)
+    WHERE s.position = q.plan_index OR (q.plan_index IS NULL AND s.title = q.name)
+    WITH g, q, min(s.position) AS position
+    MATCH (g)-[:HAS_STEP]->(s:PlanStep {position: position})
+    SET q.plan_index = position
+    MERGE (q)-[:FOR_STEP]->(s)
+    """
+    tx.run(link_query)
+
+
+def has_skill_from_accomplishments(tx):
+    """
+    Builds each user's HAS_SKILL relationships from the skills their
+    accomplishments demonstrate: the number of accomplishments, the latest
+    one's timestamp and the highest mastery level recorded.
+    """
+    query = """
+    MATCH (u:User)-[:COMPLETED]->(a:Accomplishment)-[d:DEMONSTRATES]->(s:Skill)
+    WITH u, s, count(DISTINCT a) AS evidence_count, max(a.timestamp) AS last_seen,
+         collect(d.level) AS levels
+    MERGE (u)-[h:HAS_SKILL]->(s)
+    SET h.evidence_count = evidence_count,
+        h.last_seen = last_seen,
+        h.level = coalesce([l IN $levels WHERE l IN levels + [h.level]][-1], h.level)
+    """
+    tx.run(query, levels=MASTERY_LEVELS)
+
+
+# --- Entry points ---
+
+
+def migrate(driver: Driver, target: int = LATEST_VERSION) -> List[int]:
+    """
+    Applies every migration above the graph's current version, up to
+    ``target``, in order. Returns the versions applied. Raises
+    SchemaMigrationError if existing duplicates prevent a constraint.
+    """
+    applied = []
+    with driver.session() as session:
+        current = session.execute_read(get_schema_version)
+        if current >= target:
+            return applied
+        session.execute_write(run_schema_statement, SCHEMA_LOCK_STATEMENT)
+        for migration in MIGRATIONS:
+            if not current < migration.version <= target:
+                continue
+            for label, props in migration.constraints:
+                duplicates = session.execute_read(find_duplicate_values, label, props)
+                if duplicates:
+                    key = props if isinstance(props, str) else f"({', '.join(props)})"
+                    raise SchemaMigrationError(
+                        f"Cannot apply schema version {migration.version}: "
+                        f"duplicate {label}.{key} values, e.g. {duplicates}. "
+                        f"Merge or remove the duplicates and run it again."
+                    )
+            for statement in migration.statements():
+                session.execute_write(run_schema_statement, statement)
+            # The version is checked again under the lock, in case another
+            # worker applied it since it was read above.
+            if session.execute_write(apply_migration_data, migration):
+                applied.append(migration.version)
+    return applied
+
+
+def missing_indexes(driver: Driver) -> List[Key]:
+    """The expected (label, property) indexes that are not online yet."""
+    with driver.session() as session:
+        online = session.execute_read(get_online_indexes)
+    return [key for key in expected_indexes() if key not in online]
+
+
+def try_migrate(driver: Driver) -> bool:
+    """Migrates at startup, logging instead of raising on failure."""
+    try:
+        applied = migrate(driver)
+        if applied:
+            print(f"Applied graph schema migrations: {applied}")
+        missing = missing_indexes(driver)
+        if missing:
+            print(
+                "WARNING: Graph lookups without an online index: "
+                + ", ".join(
+                    f"{label}.{prop}" if isinstance(prop, str)
+                    else f"{label}({', '.join(prop)})"
+                    for label, prop in missing
+                )
+            )
+        return True
+    except Exception as e:
+        # The API still works without the schema, only slower.
+        print(f"WARNING: Could not migrate the graph schema. Error: {e}")
+        return False
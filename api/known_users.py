@@ -0,0 +1,161 @@
+# api/known_users.py
+#
+# The emails of the users that have a :User node in Neo4j, kept in memory so
+# logins do not have to MERGE the node on every call. Registration creates
+# the node, so a MERGE at login is almost always a no-op write, and under a
+# login storm those writes contend for the same locks.
+#
+# Emails are stored as 64-bit BLAKE2b hashes: the loaded ones in a sorted
+# NumPy array (8 bytes per user), the ones added since in a set. Unlike a
+# bloom filter, a lookup has no false positives in practice (two of a
+# million users share a hash with probability ~3e-8), so a user reported as
+# known does have a node.
+#
+# Logins of users not known yet are queued, and a background task writes the
+# queue every USER_RECONCILE_INTERVAL_SECONDS with one UNWIND ... MERGE per
+# batch of USER_RECONCILE_BATCH_SIZE. Until that task runs (the CLI, the
+# unit tests), the node is written at login as before.
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from neo4j import Driver
+
+from . import graph_crud
+
+# How often the known emails are re-read, to notice nodes deleted elsewhere.
+KNOWN_USERS_REFRESH_SECONDS = float(os.getenv("KNOWN_USERS_REFRESH_SECONDS", "3600"))
+USER_RECONCILE_INTERVAL_SECONDS = float(os.getenv("USER_RECONCILE_INTERVAL_SECONDS", "1"))
+USER_RECONCILE_BATCH_SIZE = int(os.getenv("USER_RECONCILE_BATCH_SIZE", "1000"))
+
+# Emails read from Neo4j per round trip while loading
+_PAGE_SIZE = 10000
+
+
+def email_hash(email: str) -> int:
+    return int.from_bytes(hashlib.blake2b(email.encode(), digest_size=8).digest(), "little")
+
+
+class KnownGraphUsers:
+    def __init__(self):
+        self._loaded = np.empty(0, dtype=np.uint64)  # Sorted
+        self._added = set()
+        self._pending = set()  # Emails waiting for reconciliation
+        self._lock = threading.Lock()
+        self.reconciling = False  # True while reconcile_periodically runs
+        self.loaded_at = None
+
+    def __contains__(self, email: str) -> bool:
+        key = email_hash(email)
+        with self._lock:
+            if key in self._added:
+                return True
+            loaded = self._loaded
+        i = np.searchsorted(loaded, np.uint64(key))
+        return bool(i < len(loaded) and loaded[i] == key)
+
+    def add(self, email: str):
+        """Records that ``email`` has a :User node."""
+        with self._lock:
+            self._added.add(email_hash(email))
+
+    def load(self, driver: Driver):
+        started = time.perf_counter()
+        hashes = []
+        after = ""
+        with driver.session() as session:
+            while True:
+                page = session.execute_read(graph_crud.get_user_emails_page, after, _PAGE_SIZE)
+                hashes.extend(email_hash(email) for email in page)
+                if len(page) < _PAGE_SIZE:
+                    break
+                after = page[-1]
+        loaded = np.array(hashes, dtype=np.uint64)
+        loaded.sort()
+        with self._lock:
+            self._loaded = loaded
+            self._added.clear()
+            self.loaded_at = time.time()
+        print(
+            f"Loaded known graph users: {len(loaded)} emails "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def try_load(self, driver: Driver) -> bool:
+        """Loads the emails, logging instead of raising on failure."""
+        try:
+            self.load(driver)
+            return True
+        except Exception as e:
+            # Logins still work; unknown users are reconciled in batches.
+            print(f"WARNING: Could not load known graph users. Error: {e}")
+            return False
+
+    async def refresh_periodically(
+        self, driver: Driver, interval: float = KNOWN_USERS_REFRESH_SECONDS
+    ):
+        """Reloads the emails every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await run_in_threadpool(self.try_load, driver)
+
+    # --- Reconciliation ---
+
+    def ensure(self, driver: Driver, email: str):
+        """
+        Makes sure ``email`` has a :User node: nothing if it is known, else
+        queued for the reconciliation task, or written now if that task is
+        not running.
+        """
+        if email in self:
+            return
+        if self.reconciling:
+            with self._lock:
+                self._pending.add(email)
+            return
+        with driver.session() as session:
+            session.execute_write(graph_crud.create_user_node, email)
+        self.add(email)
+
+    def reconcile(self, driver: Driver, batch_size: int = USER_RECONCILE_BATCH_SIZE) -> int:
+        """Writes the queued emails' nodes. Returns the number written."""
+        with self._lock:
+            emails = list(self._pending)
+            self._pending.clear()
+        written = 0
+        try:
+            with driver.session() as session:
+                for start in range(0, len(emails), batch_size):
+                    batch = emails[start : start + batch_size]
+                    session.execute_write(graph_crud.merge_user_nodes, batch)
+                    for email in batch:
+                        self.add(email)
+                    written += len(batch)
+        except Exception as e:
+            with self._lock:
+                self._pending.update(emails[written:])
+            print(f"WARNING: Could not reconcile {len(emails) - written} graph users. Error: {e}")
+        return written
+
+    async def reconcile_periodically(
+        self, driver: Driver, interval: float = USER_RECONCILE_INTERVAL_SECONDS
+    ):
+        """Writes the queue every ``interval`` seconds until cancelled."""
+        self.reconciling = True
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                if self._pending:
+                    await run_in_threadpool(self.reconcile, driver)
+        finally:
+            self.reconciling = False
+            # Whatever is left is written by the next login of those users.
+
+
+# A single set shared by the whole application
+known_graph_users = KnownGraphUsers()
@@ -1,12 +1,78 @@
 # api/main.py
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from sqlalchemy import create_engine
-from .routers import skills, users, auth, goals, qa, accomplishments, quests # Added quests
+from .routers import skills, users, auth, goals, qa, accomplishments, quests, reports, admin # Added quests
 import api.database # To access and re-assign api.database.engine
+from .database import (
+    async_graph_db_manager,
+    get_async_graph_db_driver,
+    get_graph_db_driver,
+    graph_db_manager,
+)
+from .graph_pool import try_warm_up
+from .known_users import known_graph_users, KNOWN_USERS_REFRESH_SECONDS
+from .skill_snapshot import skill_snapshot, SKILL_GRAPH_REFRESH_SECONDS
+from .skill_autocomplete import skill_autocomplete, SKILL_AUTOCOMPLETE_REFRESH_SECONDS
+from .ai.skill_context import skill_context, SKILL_CONTEXT_REFRESH_SECONDS
+from .graph_schema import GRAPH_SCHEMA_MIGRATE_ON_STARTUP, try_migrate
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Opens the Neo4j drivers and warms up the request handlers' connection
+    pool, applies pending graph schema migrations, then loads the in-memory
+    skill graph snapshot, autocomplete index, Q&A context index and known
+    graph users and keeps them fresh. Graph users of new logins are written
+    in the background. The drivers are closed on shutdown. The unit tests
+    run without Neo4j, so all of this is skipped there and every read falls
+    back to Cypher.
+    """
+    refresh_tasks = []
+    if os.getenv("TESTING_MODE") != "True":
+        await try_warm_up(get_async_graph_db_driver())
+        driver = get_graph_db_driver()
+        if GRAPH_SCHEMA_MIGRATE_ON_STARTUP:
+            await run_in_threadpool(try_migrate, driver)
+        await run_in_threadpool(skill_snapshot.try_load, driver)
+        await run_in_threadpool(skill_autocomplete.try_load, driver)
+        await run_in_threadpool(skill_context.try_load, driver)
+        await run_in_threadpool(known_graph_users.try_load, driver)
+        refresh_tasks.append(
+            asyncio.create_task(known_graph_users.reconcile_periodically(driver))
+        )
+        if SKILL_GRAPH_REFRESH_SECONDS > 0:
+            refresh_tasks.append(
+                asyncio.create_task(skill_snapshot.refresh_periodically(driver))
+            )
+        if SKILL_AUTOCOMPLETE_REFRESH_SECONDS > 0:
+            refresh_tasks.append(
+                asyncio.create_task(skill_autocomplete.refresh_periodically(driver))
+            )
+        if SKILL_CONTEXT_REFRESH_SECONDS > 0:
+            refresh_tasks.append(
+                asyncio.create_task(skill_context.refresh_periodically(driver))
+            )
+        if KNOWN_USERS_REFRESH_SECONDS > 0:
+            refresh_tasks.append(
+                asyncio.create_task(known_graph_users.refresh_periodically(driver))
+            )
+    yield
+    for task in refresh_tasks:
+        task.cancel()
+    if os.getenv("TESTING_MODE") != "True":
+        # Logins queued since the last reconciliation
+        await run_in_threadpool(known_graph_users.reconcile, driver)
+    await async_graph_db_manager.close()
+    graph_db_manager.close()
+
 
 def create_app():
     # Initialize the database engine here, ensuring it uses the
@@ -29,6 +95,7 @@ def create_app():
         title="SkillForge API",
         description="The core API for the SkillForge engine.",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
     # Include routers with their default prefixes (used by tests)
@@ -39,6 +106,8 @@ def create_app():
     app.include_router(qa.router)
     app.include_router(accomplishments.router)
     app.include_router(quests.router)  # Added quests router
+    app.include_router(reports.router)
+    app.include_router(admin.router)
 
     # Also expose the same routes under /api for the frontend
     api_prefix = "/api"
@@ -49,6 +118,8 @@ def create_app():
     app.include_router(qa.router, prefix=api_prefix)
     app.include_router(accomplishments.router, prefix=api_prefix)
     app.include_router(quests.router, prefix=api_prefix)
+    app.include_router(reports.router, prefix=api_prefix)
+    app.include_router(admin.router, prefix=api_prefix)
 
     # Mount the frontend directory to serve static files
     app.mount("/static", StaticFiles(directory="frontend"), name="static")
@@ -1,15 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends, Body
 from pydantic import BaseModel
 from typing import List
-from neo4j import Driver
+from neo4j import AsyncDriver
 
 from ..ai.schemas import SkillLevel
 from ..ai.skill_extractor import skill_extractor_chain
-from ..ai.skill_matcher import find_skill_match
+from ..ai.skill_matcher import find_skill_matches
 
 # Database Imports
-from ..database import get_graph_db_driver
-from .. import graph_crud
+from ..database import get_async_graph_db_driver
+from .. import async_graph_crud
+from ..graph_cache import graph_cache
+from ..skill_snapshot import skill_snapshot
+from ..skill_autocomplete import skill_autocomplete
 from ..schemas import AccomplishmentCreate, Accomplishment as AccomplishmentSchema, User
 
 # Security Imports
@@ -38,113 +41,118 @@ class AccomplishmentResponse(BaseModel):
 )
 async def process_accomplishment(
     accomplishment_data: AccomplishmentCreate = Body(...),
-    driver: Driver = Depends(get_graph_db_driver),
+    driver: AsyncDriver = Depends(get_async_graph_db_driver),
     current_user: User = Depends(get_current_user),
 ):
     """
     Analyzes a user's accomplishment, extracts skills, and updates the knowledge graph.
-    - Creates an Accomplishment node and links it to the user.
     - Extracts skills and mastery levels using an LLM from the accomplishment's description.
     - Compares extracted skills against existing skills in the graph to avoid duplicates.
-    - Creates new skill nodes for non-duplicate skills (including default mastery levels).
-    - Links the newly created accomplishment to each relevant skill.
+    - Creates an Accomplishment node linked to the user (and the quest it fulfills),
+      creates the non-duplicate skills, links the accomplishment to each relevant
+      skill and advances the quest's goal, all in one write transaction.
     """
     try:
         # Step 0: Validate user exists
-        with driver.session() as session:
-            if not session.read_transaction(graph_crud.user_exists, current_user.email):
+        async with driver.session() as session:
+            if not await session.execute_read(async_graph_crud.user_exists, current_user.email):
                 raise HTTPException(status_code=404, detail=f"User with email {current_user.email} not found.")
 
-        # Step 1: Create the Accomplishment node and link it to the user
-        with driver.session() as session:
-            accomplishment_payload = accomplishment_data.model_dump(exclude_unset=True)
-            quest_id = accomplishment_payload.pop("quest_id", None) # Extract quest_id
+        accomplishment_payload = accomplishment_data.model_dump(exclude_unset=True)
+        quest_id = accomplishment_payload.pop("quest_id", None) # Extract quest_id
 
-            accomplishment_node = session.write_transaction(
-                graph_crud.create_accomplishment,
-                current_user, # Pass the entire User object
-                accomplishment_payload,  # Send the dict without quest_id
-                quest_id=quest_id # Pass quest_id separately
-            )
-            # Convert Neo4j Node to Pydantic model.
-            # The accomplishment_node from graph_crud doesn't have user_email directly.
-            # We need to construct a dictionary for validation, including the user_email from the current session.
-            accomplishment_data_for_validation = dict(accomplishment_node) # Convert node to dict
-            accomplishment_data_for_validation['user_email'] = current_user.email
-            # quest_id might also be needed if it's part of AccomplishmentSchema and not on the node
-            if quest_id: # If a quest_id was processed
-                accomplishment_data_for_validation['quest_id'] = quest_id
-
-            created_accomplishment = AccomplishmentSchema.model_validate(
-                accomplishment_data_for_validation
-            )
-
-        # Step 2: Extract skills from the accomplishment description
+        # Step 1: Extract skills from the accomplishment description
         extracted_data = await skill_extractor_chain.ainvoke(
             {"accomplishment": accomplishment_data.description}
         )
         extracted_skills = extracted_data.skills
 
-        if not extracted_skills:
-            return AccomplishmentResponse(
-                message="No skills were extracted from the accomplishment. Accomplishment created.",
-                accomplishment=created_accomplishment,
-            )
-
-        # Step 3: Get all existing skill names from the database
-        with driver.session() as session:
-            existing_skill_names = session.read_transaction(graph_crud.get_all_skills)
-
         final_skill_names_to_link = (
             []
         )  # Store names of skills to be linked to the accomplishment
-        processed_skills_for_response = []  # Store SkillLevel objects for the response
+        new_skill_names = []  # Candidate names that are not duplicates
+        skills_to_link = []  # (name, mastery level) pairs for the user's skill profile
 
-        for skill_level in extracted_skills:
-            candidate_skill_name = skill_level.skill
+        if extracted_skills:
+            # Step 2: Get all existing skill names from the database
+            async with driver.session() as session:
+                existing_skill_names = await session.execute_read(async_graph_crud.get_all_skills)
 
-            # Step 4: Check for duplicate skills using AI skill matcher
-            match_result = await find_skill_match(
-                candidate_skill_name, existing_skill_names
+            # Step 3: Check every candidate for duplicates with one AI skill matcher call
+            match_results = await find_skill_matches(
+                [skill_level.skill for skill_level in extracted_skills], existing_skill_names
             )
-
-            final_skill_name = ""
-            if match_result.is_duplicate:
-                # Step 5a: If it's a duplicate, use the existing skill name
-                final_skill_name = match_result.existing_skill_name
-                print(
-                    f"Match found for '{candidate_skill_name}': using existing skill '{final_skill_name}'"
+            # New skills by lowercased name, so a skill extracted twice is created once
+            new_skill_keys = {}
+
+            for skill_level, match_result in zip(extracted_skills, match_results):
+                candidate_skill_name = skill_level.skill
+
+                if match_result.is_duplicate:
+                    # Step 4a: If it's a duplicate, use the existing skill name
+                    final_skill_name = match_result.existing_skill_name
+                    print(
+                        f"Match found for '{candidate_skill_name}': using existing skill '{final_skill_name}'"
+                    )
+                elif candidate_skill_name.lower() in new_skill_keys:
+                    # The same new skill extracted twice
+                    final_skill_name = new_skill_keys[candidate_skill_name.lower()]
+                else:
+                    # Step 4b: If it's new, use the candidate name; it is created below
+                    final_skill_name = candidate_skill_name
+                    print(f"New skill found: '{final_skill_name}'.")
+                    new_skill_names.append(final_skill_name)
+                    new_skill_keys[final_skill_name.lower()] = final_skill_name
+
+                final_skill_names_to_link.append(final_skill_name)
+                skills_to_link.append((final_skill_name, skill_level.level))
+
+        # Step 5: Write everything in one unit of work, a constant number of
+        # statements however many skills were extracted
+        async def record_accomplishment(tx):
+            accomplishment_node = await async_graph_crud.create_accomplishment_with_fulfilment(
+                tx, current_user.email, accomplishment_payload, quest_id=quest_id
+            )
+            created_skills = []
+            if final_skill_names_to_link:
+                created_skills = await async_graph_crud.create_skills_if_missing(
+                    tx, new_skill_names
                 )
-            else:
-                # Step 5b: If it's new, use the candidate name and create it in the DB
-                final_skill_name = candidate_skill_name
-                print(f"New skill found: '{final_skill_name}'. Creating in graph...")
-                with driver.session() as session:
-                    session.write_transaction(graph_crud.create_skill, final_skill_name)
-                # Add the new skill to our list of existing skills for the current processing run
-                existing_skill_names.append(final_skill_name)
-
-            final_skill_names_to_link.append(final_skill_name)
-            # We store the original skill_level (which includes AI's mastery assessment) for the response
-            processed_skills_for_response.append(skill_level)
-
-        # Step 6: Link the newly created accomplishment to each relevant skill
-        with driver.session() as session:
-            for skill_name_to_link in final_skill_names_to_link:
-                session.write_transaction(
-                    graph_crud.link_accomplishment_to_skill,
-                    str(created_accomplishment.id),  # Ensure ID is a string
-                    skill_name_to_link,
+                await async_graph_crud.link_accomplishment_to_skills(
+                    tx, accomplishment_node["id"], skills_to_link
                 )
+            if quest_id:
+                await async_graph_crud.advance_goal(tx, str(quest_id), current_user.email)
+            return accomplishment_node, created_skills
 
-        # Step 7: If the accomplishment is for a quest, advance the goal
-        if created_accomplishment.quest_id:
-            with driver.session() as session:
-                session.write_transaction(
-                    graph_crud.advance_goal,
-                    str(created_accomplishment.quest_id),
-                    current_user.email,
-                )
+        async with driver.session() as session:
+            accomplishment_node, created_skills = await session.execute_write(
+                record_accomplishment
+            )
+        if created_skills:
+            graph_cache.bump()
+        for skill_name in created_skills:
+            skill_snapshot.skill_created(skill_name)
+            skill_autocomplete.skill_created(skill_name)
+
+        # Convert Neo4j Node to Pydantic model.
+        # The accomplishment_node from graph_crud doesn't have user_email directly.
+        # We need to construct a dictionary for validation, including the user_email from the current session.
+        accomplishment_data_for_validation = dict(accomplishment_node) # Convert node to dict
+        accomplishment_data_for_validation['user_email'] = current_user.email
+        # quest_id might also be needed if it's part of AccomplishmentSchema and not on the node
+        if quest_id: # If a quest_id was processed
+            accomplishment_data_for_validation['quest_id'] = quest_id
+
+        created_accomplishment = AccomplishmentSchema.model_validate(
+            accomplishment_data_for_validation
+        )
+
+        if not extracted_skills:
+            return AccomplishmentResponse(
+                message="No skills were extracted from the accomplishment. Accomplishment created.",
+                accomplishment=created_accomplishment,
+            )
 
         return AccomplishmentResponse(
             message=f"Successfully processed accomplishment, created node '{created_accomplishment.name}', and linked {len(final_skill_names_to_link)} skills.",
@@ -168,8 +176,8 @@ async def process_accomplishment(
     "/accomplishments/{accomplishment_id}/issue-credential",
     tags=["Accomplishments", "VC"],
 )
-def issue_accomplishment_credential(
-    accomplishment_id: uuid.UUID, driver: Driver = Depends(get_graph_db_driver)
+async def issue_accomplishment_credential(
+    accomplishment_id: uuid.UUID, driver: AsyncDriver = Depends(get_async_graph_db_driver)
 ):
     """
     Issues a signed Verifiable Credential (in JWT format) for a specific
@@ -187,9 +195,9 @@ def issue_accomplishment_credential(
         raise HTTPException(status_code=500, detail=f"Issuer key not found at path: {key_path}")
 
     # 2. Fetch accomplishment details from the graph
-    with driver.session() as session:
-        accomplishment = session.read_transaction(
-            graph_crud.get_accomplishment_details, accomplishment_id
+    async with driver.session() as session:
+        accomplishment = await session.execute_read(
+            async_graph_crud.get_accomplishment_details, accomplishment_id
         )
     if not accomplishment:
         raise HTTPException(status_code=404, detail="Accomplishment not found.")
@@ -237,9 +245,9 @@ def issue_accomplishment_credential(
 
     # NEW STEP: Store the VC in the graph *before* returning
     # The vc_payload corresponds to the vc_json in the original problem description
-    with driver.session() as session:
-        session.write_transaction(
-            graph_crud.store_vc_receipt, # Assuming store_vc_receipt is the correct function to store the VC payload
+    async with driver.session() as session:
+        await session.execute_write(
+            async_graph_crud.store_vc_receipt, # Assuming store_vc_receipt is the correct function to store the VC payload
             accomplishment_id,
             vc_payload # Storing the full VC payload as vc_json
         )
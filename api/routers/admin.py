@@ -0,0 +1,148 @@
+# api/routers/admin.py
+
+import os
+from typing import Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from neo4j import Driver
+from pydantic import BaseModel, Field
+
+from ..cypher_stats import cypher_stats
+from ..database import async_graph_db_manager, get_graph_db_driver, graph_db_manager
+from ..graph_cache import graph_cache
+from ..graph_export import NDJSON_MEDIA_TYPE, export_ndjson
+from ..skill_import import (
+    SKILL_IMPORT_BATCH_SIZE,
+    SKILL_IMPORT_WORKERS,
+    SkillImportError,
+    detect_format,
+    resolve_import_path,
+    skill_import_job,
+)
+from .auth import get_current_admin
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(get_current_admin)],
+)
+
+
+class PoolStats(BaseModel):
+    max_size: int
+    in_use: Optional[int] = None  # None if the driver's pool is not readable
+    idle: Optional[int] = None
+    acquisitions: int
+    acquisition_wait_ms_mean: float
+    acquisition_wait_ms_p95: float
+    acquisition_wait_ms_max: float
+
+
+class GraphCacheStats(BaseModel):
+    version: int
+    entries: int
+    max_entries: int
+    bytes: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class SkillImportRequest(BaseModel):
+    path: str  # Relative to SKILL_IMPORT_DIR
+    format: Optional[Literal["csv", "jsonl", "adjacency"]] = None  # From the extension if omitted
+    batch_size: int = Field(SKILL_IMPORT_BATCH_SIZE, ge=1, le=100_000)
+    workers: int = Field(SKILL_IMPORT_WORKERS, ge=1, le=32)
+    resume: bool = True
+
+
+class SkillImportStatus(BaseModel):
+    running: bool
+    source: Optional[str] = None
+    phase: Optional[str] = None
+    progress: Dict[str, Dict[str, float]] = {}
+    error: Optional[str] = None
+
+
+@router.post("/skills/import", response_model=SkillImportStatus, status_code=202)
+def start_skill_import(
+    request: SkillImportRequest, driver: Driver = Depends(get_graph_db_driver)
+):
+    """
+    Starts a bulk import of a skill taxonomy file from the server's import
+    directory. The import runs in the background; poll the status endpoint.
+    """
+    try:
+        path = resolve_import_path(request.path)
+        fmt = request.format or detect_format(path)
+    except SkillImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Import file not found")
+    started = skill_import_job.start(
+        driver,
+        path,
+        fmt,
+        batch_size=request.batch_size,
+        workers=request.workers,
+        resume=request.resume,
+    )
+    if not started:
+        raise HTTPException(status_code=409, detail="An import is already running")
+    return skill_import_job.status()
+
+
+@router.get("/skills/import", response_model=SkillImportStatus)
+def get_skill_import_status():
+    """The progress and throughput of the latest bulk import."""
+    return skill_import_job.status()
+
+
+@router.get("/export/{export}", response_class=StreamingResponse)
+def export_graph(
+    export: Literal["skills", "dependencies", "accomplishments"],
+    after: str = Query("", description="Continue after this key (skill name or accomplishment id)."),
+    driver: Driver = Depends(get_graph_db_driver),
+):
+    """
+    Streams every skill, every skill's prerequisites, or every accomplishment
+    with its user and demonstrated skills, as NDJSON in key order.
+    """
+    return StreamingResponse(
+        export_ndjson(driver, export, after), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@router.get("/pool", response_model=Dict[str, PoolStats])
+def get_pool_stats():
+    """
+    Neo4j connection pool statistics of the async driver (request handlers)
+    and the sync driver (loaders, background jobs), for dashboards.
+    """
+    return {
+        "async": async_graph_db_manager.metrics.snapshot(),
+        "sync": graph_db_manager.metrics.snapshot(),
+    }
+
+
+@router.get("/cache", response_model=GraphCacheStats)
+def get_graph_cache_stats():
+    """Hit rate and size of this process's skill read cache."""
+    return graph_cache.stats()
+
+
+@router.get("/queries")
+def get_cypher_query_stats():
+    """
+    Calls, rows, wall time histogram and server timings of every Cypher
+    query this process has run, the most total time first, with the last
+    sampled PROFILE of each.
+    """
+    return cypher_stats.report()
+
+
+@router.delete("/queries", status_code=204)
+def reset_cypher_query_stats():
+    """Starts the query statistics over."""
+    cypher_stats.reset()
@@ -1,13 +1,16 @@
 # api/routers/auth.py
 
+import os
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from sqlalchemy.engine import Connection
 from neo4j import GraphDatabase
 
-from .. import crud, schemas, security, graph_crud
+from .. import crud, schemas, security
 from ..database import get_db, get_graph_db_driver
+from ..known_users import known_graph_users
 
 # This scheme will look for a token in the "Authorization" header.
 # The `tokenUrl` points to our login endpoint.
@@ -17,6 +20,13 @@ router = APIRouter(
     tags=["authentication"],
 )
 
+# Emails of the users allowed to call the admin endpoints, comma-separated.
+ADMIN_EMAILS = {
+    email.strip().lower()
+    for email in os.getenv("ADMIN_EMAILS", "").split(",")
+    if email.strip()
+}
+
 
 async def get_current_user(
     conn: Connection = Depends(get_db), token: str = Depends(oauth2_scheme)
@@ -46,6 +56,19 @@ async def get_current_user(
     return user
 
 
+async def get_current_admin(current_user: schemas.User = Depends(get_current_user)):
+    """
+    Dependency for admin endpoints: the current user, if listed in
+    ADMIN_EMAILS.
+    """
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
+
+
 @router.post("/token", response_model=schemas.Token)
 def login_for_access_token(
     conn: Connection = Depends(get_db),
@@ -54,7 +77,8 @@ def login_for_access_token(
 ):
     """
     Logs in a user and returns an access token.
-    If the user does not exist in Neo4j, it creates them.
+    If the user does not exist in Neo4j, it creates them (in the background
+    when the API runs its reconciliation task).
     """
     user = crud.get_user_by_email(conn, email=form_data.username)
 
@@ -67,12 +91,9 @@ def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Check and create user in Neo4j if they don't exist
-    with neo4j_driver.session() as session:
-        # Attempt to find the user in Neo4j.
-        # For simplicity, we'll assume a function `get_user_by_email_neo4j` exists or adapt.
-        # For now, we'll directly use create_user_node which handles MERGE logic.
-        session.execute_write(graph_crud.create_user_node, user.email)
+    # Create the user in Neo4j if they don't exist. Known users, the usual
+    # case since registration creates the node, cost no graph write.
+    known_graph_users.ensure(neo4j_driver, user.email)
 
     access_token = security.create_access_token(data={"sub": user.email})
 
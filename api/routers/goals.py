@@ -1,14 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List
-from neo4j import Session as Neo4jSession # Changed Driver to Session
+from neo4j import AsyncSession
 from ..ai.parser import goal_parser_chain
 # ParsedGoal is no longer the direct response_model, but its structure is used
 from ..ai.schemas import ParsedGoal, SubTask
 
 # Database Imports
-from ..database import get_graph_db_session # Changed to get_graph_db_session
-from .. import graph_crud # Added graph_crud import
+from ..database import get_async_graph_db_session
+from .. import async_graph_crud
 from .. import schemas # Added schemas import for response_model
 
 # Security Imports
@@ -25,7 +25,7 @@ class GoalRequest(BaseModel):
 @router.post("/goals/parse", response_model=schemas.GoalAndQuest, tags=["AI"])
 async def parse_goal_into_subtasks(
     request: GoalRequest,
-    db: Neo4jSession = Depends(get_graph_db_session),
+    db: AsyncSession = Depends(get_async_graph_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -47,9 +47,11 @@ async def parse_goal_into_subtasks(
         )
 
         # This transaction creates the goal and the first quest
-        def create_goal_and_first_quest(tx, goal_data, user_email):
+        async def create_goal_and_first_quest(tx, goal_data, user_email):
             # Create the Goal node
-            goal_node = graph_crud.create_goal_and_link_to_user(tx, goal_data, user_email)
+            goal_node = await async_graph_crud.create_goal_and_link_to_user(
+                tx, goal_data, user_email
+            )
 
             # Create the first Quest from the plan
             first_sub_task = parsed_result.sub_tasks[0]
@@ -57,20 +59,25 @@ async def parse_goal_into_subtasks(
                 "name": first_sub_task.title,
                 "description": first_sub_task.description
             }
-            first_quest_node = graph_crud.create_quest_and_link_to_user(tx, quest_data, user_email)
+            first_quest_node = await async_graph_crud.create_quest_and_link_to_user(
+                tx, quest_data, user_email, plan_index=0
+            )
 
-            # Link Goal to the first Quest as the active quest
+            # Link Goal to the first Quest as the active quest, and the
+            # Quest to the plan step it is for
             link_query = """
             MATCH (g:Goal {id: $goal_id})
             MATCH (q:Quest {id: $quest_id})
+            MATCH (s:PlanStep {goal_id: $goal_id, position: 0})
             CREATE (g)-[:HAS_ACTIVE_QUEST]->(q)
+            CREATE (q)-[:FOR_STEP]->(s)
             """
-            tx.run(link_query, goal_id=goal_node['id'], quest_id=first_quest_node['id'])
+            await tx.run(link_query, goal_id=goal_node['id'], quest_id=first_quest_node['id'])
 
             return goal_node, first_quest_node
 
         # Execute the transaction
-        goal_node, first_quest = db.write_transaction(
+        goal_node, first_quest = await db.execute_write(
             create_goal_and_first_quest,
             goal_data,
             current_user.email
@@ -82,3 +89,21 @@ async def parse_goal_into_subtasks(
         return {"goal": goal_model, "quest": quest_model}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process goal: {str(e)}")
+
+
+@router.get("/goals/{goal_id}/progress", response_model=schemas.GoalProgress, tags=["Goals"])
+async def get_goal_progress(
+    goal_id: str,
+    db: AsyncSession = Depends(get_async_graph_db_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Returns how far the current user is through a goal's plan: steps done,
+    percentage, the current step and the minutes of work left.
+    """
+    progress = await db.execute_read(
+        async_graph_crud.get_goal_progress, goal_id, current_user.email
+    )
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    return progress
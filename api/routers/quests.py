@@ -3,7 +3,7 @@ from typing import List, Optional
 import uuid
 
 from .. import schemas
-from ..database import get_graph_db_session, GraphDBSession
+from ..database import get_async_graph_db_session, AsyncGraphDBSession
 from .auth import get_current_user
 
 
@@ -15,34 +15,34 @@ router = APIRouter(
 
 
 @router.post("/", response_model=schemas.Quest)
-def create_quest(
-    quest: schemas.QuestCreate, db: GraphDBSession = Depends(get_graph_db_session)
+async def create_quest(
+    quest: schemas.QuestCreate, db: AsyncGraphDBSession = Depends(get_async_graph_db_session)
 ):
     """
     Create a new quest.
     """
     quest_data = quest.model_dump()
-    from ..graph_crud import create_quest as db_create_quest
+    from ..async_graph_crud import create_quest as db_create_quest
 
-    db_quest = db.write_transaction(db_create_quest, quest_data)
+    db_quest = await db.execute_write(db_create_quest, quest_data)
     if db_quest is None:
         raise HTTPException(status_code=400, detail="Quest could not be created")
     return schemas.Quest(**db_quest)
 
 
 @router.post("/{quest_id}/complete", response_model=Optional[schemas.Quest])
-def complete_quest(
+async def complete_quest(
     quest_id: uuid.UUID,
-    db: GraphDBSession = Depends(get_graph_db_session),
+    db: AsyncGraphDBSession = Depends(get_async_graph_db_session),
     current_user: schemas.User = Depends(get_current_user),
 ):
     """
     Marks a quest as complete and advances the goal to the next quest.
     Returns the next quest, or null if the goal is complete.
     """
-    from ..graph_crud import advance_goal
+    from ..async_graph_crud import advance_goal
 
-    next_quest_node = db.write_transaction(
+    next_quest_node = await db.execute_write(
         advance_goal, str(quest_id), current_user.email
     )
 
@@ -0,0 +1,70 @@
+# api/routers/reports.py
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from neo4j import Driver
+from pydantic import BaseModel, Field
+
+from .. import schemas
+from ..cohort_gaps import compute_cohort_gaps
+from ..database import get_graph_db_driver
+from ..skill_snapshot import skill_snapshot
+from .auth import get_current_user
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+)
+
+
+class CohortGapRequest(BaseModel):
+    targets: List[str] = Field(..., min_length=1)
+    emails: Optional[List[str]] = None  # Every user if omitted
+    top: int = Field(10, ge=1, le=1000)
+    include_users: bool = True
+
+
+class MissingSkill(BaseModel):
+    skill: str
+    users_missing: int
+    percent_of_users: float
+
+
+class UserGap(BaseModel):
+    email: str
+    coverage_percent: float
+    missing: List[str]
+
+
+class CohortGapReport(BaseModel):
+    targets: List[str]
+    not_found: List[str] = []
+    users: int
+    required_skills: List[str]
+    average_coverage_percent: float
+    users_fully_covered: int
+    most_common_missing: List[MissingSkill]
+    user_gaps: Optional[List[UserGap]] = None
+
+
+@router.post("/cohort-gaps", response_model=CohortGapReport)
+def get_cohort_gaps(
+    request: CohortGapRequest,
+    driver: Driver = Depends(get_graph_db_driver),
+    current_user: schemas.User = Depends(get_current_user),
+):
+    """
+    Reports which prerequisites of the target skills each user in a cohort is
+    missing, how much of them each user already covers, and which skills are
+    missing most often. The cohort's skills are read with a single query.
+    """
+    targets = list(dict.fromkeys(request.targets))  # De-duplicate, keep order
+    gaps = compute_cohort_gaps(driver, skill_snapshot, targets, request.emails)
+    if gaps is None:
+        raise HTTPException(
+            status_code=404, detail="None of the target skills were found in the graph."
+        )
+    report = gaps.report(top=request.top, include_users=request.include_users)
+    report["not_found"] = [target for target in targets if target not in gaps.targets]
+    return report
@@ -1,13 +1,16 @@
 # api/routers/skills.py
 
-from fastapi import APIRouter, HTTPException, Depends
-from neo4j import Driver
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from neo4j import AsyncDriver
+from typing import Dict, List, Optional
 from sqlalchemy.engine import Connection
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from ..database import get_graph_db_driver, get_db
-from .. import crud, schemas, graph_crud
+from ..database import get_async_graph_db_driver, get_db
+from .. import crud, schemas, async_graph_crud
+from ..graph_cache import graph_cache
+from ..skill_snapshot import skill_snapshot
+from ..skill_autocomplete import MAX_RESULTS, skill_autocomplete
 
 
 # --- Pydantic Models ---
@@ -15,12 +18,32 @@ from .. import crud, schemas, graph_crud
 
 class GraphSkillCreate(BaseModel):
     name: str
+    duration_minutes: Optional[int] = Field(None, ge=0)  # Estimated time to learn
+
+
+class SkillDuration(BaseModel):
+    duration_minutes: int = Field(..., ge=0)
 
 
 class SkillUpdate(BaseModel):
     new_name: str
 
 
+class LearningPlanRequest(BaseModel):
+    targets: List[str] = Field(..., min_length=1)
+    user_email: Optional[str] = None
+
+
+class LearningPlan(BaseModel):
+    plan: List[str]
+    targets: Dict[str, List[str]]
+    not_found: List[str] = []
+
+
+# Page sizes of the paginated skill list
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 # --- Router ---
 
 router = APIRouter(tags=["Skills (Neo4j)"])
@@ -29,134 +52,261 @@ router = APIRouter(tags=["Skills (Neo4j)"])
 
 
 @router.post("/", status_code=201, tags=["Skills (Neo4j)"])
-def create_graph_skill(
-    skill: GraphSkillCreate, driver: Driver = Depends(get_graph_db_driver)
+async def create_graph_skill(
+    skill: GraphSkillCreate, driver: AsyncDriver = Depends(get_async_graph_db_driver)
 ):
     """
     Create a new Skill node in the Neo4j graph database.
     """
-    with driver.session() as session:
-        existing_skill = session.execute_read(graph_crud.get_skill_by_name, skill.name)
+    async with driver.session() as session:
+        existing_skill = await session.execute_read(async_graph_crud.get_skill_by_name, skill.name)
         if existing_skill:
             raise HTTPException(
                 status_code=409, detail="Skill already exists in the graph"
             )
 
-        new_skill = session.execute_write(graph_crud.create_skill, skill.name)
+        new_skill = await session.execute_write(
+            async_graph_crud.create_skill, skill.name, skill.duration_minutes
+        )
+        graph_cache.bump()
+        skill_snapshot.skill_created(
+            new_skill["name"], duration_minutes=skill.duration_minutes
+        )
+        skill_autocomplete.skill_created(new_skill["name"])
         return {"message": "Skill created in graph", "skill": new_skill["name"]}
 
 
 @router.get("/", response_model=List[str], tags=["Skills (Neo4j)"])
-def list_graph_skills(driver: Driver = Depends(get_graph_db_driver)):
+async def list_graph_skills(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    driver: AsyncDriver = Depends(get_async_graph_db_driver),
+):
     """
-    Retrieve all skill names from the Neo4j graph database.
+    Retrieve all skill names from the Neo4j graph database, or with `limit`
+    (or `after`), one page of them in name order starting after the name
+    `after`. When there may be more, the `X-Next-After` header holds the
+    `after` of the next page.
     """
-    with driver.session() as session:
-        skills = session.execute_read(graph_crud.get_all_skills)
+    if limit is None and after is None:
+        return await graph_cache.read(driver, async_graph_crud.get_all_skills)
+    limit = limit or DEFAULT_PAGE_SIZE
+    page = await graph_cache.read(
+        driver, async_graph_crud.get_skills_page, after or "", limit
+    )
+    skills = [skill["name"] for skill in page]
+    if len(skills) == limit:
+        response.headers["X-Next-After"] = skills[-1]
     return skills
 
 
+@router.get("/autocomplete", response_model=List[str], tags=["Skills (Neo4j)"])
+async def autocomplete_skills(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=MAX_RESULTS),
+    driver: AsyncDriver = Depends(get_async_graph_db_driver),
+):
+    """
+    Type-ahead over skill names: names starting with `q`, most popular first,
+    then close matches for misspelled queries. Answered from the in-memory
+    index; until it is loaded, only prefix matches are returned, via Cypher.
+    """
+    names = skill_autocomplete.complete(q, limit)
+    if names is None:
+        async with driver.session() as session:
+            names = await session.execute_read(async_graph_crud.search_skill_names, q, limit)
+    return names
+
+
+@router.post("/learning-plan", response_model=LearningPlan, tags=["Skills (Neo4j)"])
+async def get_learning_plan(
+    request: LearningPlanRequest, driver: AsyncDriver = Depends(get_async_graph_db_driver)
+):
+    """
+    Builds one consolidated learning plan for several target skills at once.
+    Shared prerequisites appear once, most fundamental first, and `targets`
+    lists which plan entries each target needs. With `user_email`, skills the
+    user has already demonstrated, and the prerequisites they imply, are left
+    out.
+    """
+    targets = list(dict.fromkeys(request.targets))  # De-duplicate, keep order
+    async with driver.session() as session:
+        user_skills = []
+        if request.user_email:
+            user_skills = await session.execute_read(
+                async_graph_crud.get_user_skills_by_accomplishments, request.user_email
+            )
+
+        result = skill_snapshot.learning_plan(targets, user_skills)
+        if result is None:
+            plan, membership = await session.execute_read(
+                async_graph_crud.get_consolidated_learning_plan, targets
+            )
+            covered = set()
+            if user_skills:
+                covered = await session.execute_read(
+                    async_graph_crud.get_covered_skills, user_skills, plan
+                )
+            plan = [skill for skill in plan if skill not in covered]
+            membership = {
+                target: [skill for skill in skills if skill not in covered]
+                for target, skills in membership.items()
+            }
+        else:
+            plan, membership = result
+
+    not_found = [target for target in targets if target not in membership]
+    if len(not_found) == len(targets):
+        raise HTTPException(
+            status_code=404, detail="None of the target skills were found in the graph."
+        )
+    return LearningPlan(plan=plan, targets=membership, not_found=not_found)
+
+
 @router.get("/{skill_name}", response_model=str, tags=["Skills (Neo4j)"])
-def get_graph_skill(skill_name: str, driver: Driver = Depends(get_graph_db_driver)):
+async def get_graph_skill(skill_name: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)):
     """
     Retrieve a single skill by name from the graph.
     """
-    with driver.session() as session:
-        skill = session.execute_read(graph_crud.get_skill_by_name, skill_name)
+    async with driver.session() as session:
+        skill = await session.execute_read(async_graph_crud.get_skill_by_name, skill_name)
         if not skill:
             raise HTTPException(status_code=404, detail="Skill not found in graph")
     return skill["name"]
 
 
 @router.put("/{skill_name}", response_model=str, tags=["Skills (Neo4j)"])
-def update_graph_skill(
+async def update_graph_skill(
     skill_name: str,
     skill_update: SkillUpdate,
-    driver: Driver = Depends(get_graph_db_driver),
+    driver: AsyncDriver = Depends(get_async_graph_db_driver),
 ):
     """
     Update a skill's name in the graph.
     """
-    with driver.session() as session:
-        existing_skill = session.execute_read(graph_crud.get_skill_by_name, skill_name)
+    async with driver.session() as session:
+        existing_skill = await session.execute_read(async_graph_crud.get_skill_by_name, skill_name)
         if not existing_skill:
             raise HTTPException(
                 status_code=404, detail=f"Skill '{skill_name}' not found"
             )
 
-        updated_skill = session.execute_write(
-            graph_crud.update_skill, skill_name, skill_update.new_name
+        updated_skill = await session.execute_write(
+            async_graph_crud.update_skill, skill_name, skill_update.new_name
         )
+        graph_cache.bump()
+        skill_snapshot.skill_renamed(skill_name, updated_skill["name"])
+        skill_autocomplete.skill_renamed(skill_name, updated_skill["name"])
         return updated_skill["name"]
 
 
 @router.delete("/{skill_name}", status_code=200, tags=["Skills (Neo4j)"])
-def delete_graph_skill(skill_name: str, driver: Driver = Depends(get_graph_db_driver)):
+async def delete_graph_skill(skill_name: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)):
     """
     Delete a skill from the graph.
     """
-    with driver.session() as session:
-        existing_skill = session.execute_read(graph_crud.get_skill_by_name, skill_name)
+    async with driver.session() as session:
+        existing_skill = await session.execute_read(async_graph_crud.get_skill_by_name, skill_name)
         if not existing_skill:
             raise HTTPException(status_code=404, detail="Skill not found in graph")
 
-        session.execute_write(graph_crud.delete_skill, skill_name)
+        await session.execute_write(async_graph_crud.delete_skill, skill_name)
+        graph_cache.bump()
+        skill_snapshot.skill_deleted(skill_name)
+        skill_autocomplete.skill_deleted(skill_name)
         return {"message": f"Skill '{skill_name}' deleted successfully"}
 
 
 @router.get("/test", response_model=List[str], tags=["Skills (Neo4j)"])
-def get_skill_titles_from_graph(driver: Driver = Depends(get_graph_db_driver)):
+async def get_skill_titles_from_graph(driver: AsyncDriver = Depends(get_async_graph_db_driver)):
     """
     A test endpoint to verify the connection to Neo4j and fetch skill names.
     """
-    records, _, _ = driver.execute_query("MATCH (s:Skill) RETURN s.name AS name")
+    records, _, _ = await driver.execute_query("MATCH (s:Skill) RETURN s.name AS name")
     return [record["name"] for record in records]
 
 
+@router.put("/{skill_name}/duration", tags=["Skills (Neo4j)"])
+async def set_skill_duration(
+    skill_name: str,
+    duration: SkillDuration,
+    driver: AsyncDriver = Depends(get_async_graph_db_driver),
+):
+    """
+    Sets the estimated number of minutes it takes to learn a skill, which the
+    time-weighted learning schedule uses.
+    """
+    async with driver.session() as session:
+        updated = await session.execute_write(
+            async_graph_crud.set_skill_duration, skill_name, duration.duration_minutes
+        )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Skill not found")
+    graph_cache.bump()
+    skill_snapshot.skill_duration_set(skill_name, duration.duration_minutes)
+    return {"skill": skill_name, "duration_minutes": duration.duration_minutes}
+
+
 @router.post(
     "/{parent_skill}/dependency/{child_skill}", status_code=201, tags=["Skills (Neo4j)"]
 )
-def create_skill_dependency(
-    parent_skill: str, child_skill: str, driver: Driver = Depends(get_graph_db_driver)
+async def create_skill_dependency(
+    parent_skill: str, child_skill: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)
 ):
-    with driver.session() as session:
-        session.execute_write(
-            graph_crud.add_skill_dependency, parent_skill, child_skill
+    # The new edge makes child a prerequisite of parent; if parent is already
+    # a prerequisite of child, that closes a cycle. The snapshot rejects the
+    # known cycles without a write; the write transaction checks again
+    # against the graph itself, which may have changed since the snapshot.
+    cycle = skill_snapshot.find_cycle(parent_skill, child_skill)
+    if not cycle:
+        async with driver.session() as session:
+            cycle = await session.execute_write(
+                async_graph_crud.add_skill_dependency, parent_skill, child_skill
+            )
+    if cycle:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": f"Dependency from {parent_skill} to {child_skill} would create a cycle.",
+                "cycle": cycle,
+            },
         )
+    graph_cache.bump()
+    skill_snapshot.dependency_added(parent_skill, child_skill)
     return {"message": f"Dependency from {parent_skill} to {child_skill} created."}
 
 
 @router.get(
     "/{skill_name}/dependencies", response_model=List[str], tags=["Skills (Neo4j)"]
 )
-def read_skill_dependencies(
-    skill_name: str, driver: Driver = Depends(get_graph_db_driver)
+async def read_skill_dependencies(
+    skill_name: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)
 ):
     """
     Retrieve all skills that the specified skill depends on.
     """
-    with driver.session() as session:
-        dependencies = session.execute_read(
-            graph_crud.get_skill_dependencies, skill_name
-        )
-    return dependencies
+    return await graph_cache.read(
+        driver, async_graph_crud.get_skill_dependencies, skill_name
+    )
 
 
 @router.get("/{skill_name}/path", response_model=List[str], tags=["Skills (Neo4j)"])
-def get_consolidated_skill_path(
-    skill_name: str, driver: Driver = Depends(get_graph_db_driver)
+async def get_consolidated_skill_path(
+    skill_name: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)
 ):
     """
     Finds a single, consolidated learning path for the target skill.
+    Answered from the in-memory skill graph when possible, Cypher otherwise.
     """
-    with driver.session() as session:
-        # Call the new, more powerful graph_crud function
-        path = session.execute_read(
-            graph_crud.get_consolidated_learning_path, skill_name
+    path = skill_snapshot.consolidated_path(skill_name)
+    if path is None:
+        path = await graph_cache.read(
+            driver, async_graph_crud.get_consolidated_learning_path, skill_name
+        )
+    if not path:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No learning path found for skill '{skill_name}'. It may be a foundational skill or does not exist.",
         )
-        if not path:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No learning path found for skill '{skill_name}'. It may be a foundational skill or does not exist.",
-            )
     return path
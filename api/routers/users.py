@@ -2,10 +2,15 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.engine import Connection
-from neo4j import Driver
-from .. import crud, schemas, graph_crud, security
-from ..database import get_db, get_graph_db_driver
-from typing import List
+from neo4j import AsyncDriver, Driver
+from .. import crud, schemas, graph_crud, async_graph_crud, security
+from ..database import get_db, get_graph_db_driver, get_async_graph_db_driver
+from ..known_users import known_graph_users
+from ..skill_snapshot import skill_snapshot
+from datetime import datetime
+from typing import Any, List, Optional
+from neo4j.time import DateTime as Neo4jDateTime
+from pydantic import BaseModel, field_validator
 from ..routers.auth import get_current_user
 
 router = APIRouter(
@@ -14,6 +19,36 @@ router = APIRouter(
 )
 
 
+class ScheduledSkill(BaseModel):
+    skill: str
+    duration_minutes: int
+    earliest_start_minutes: int
+    slack_minutes: int
+    critical: bool
+
+
+class LearningSchedule(BaseModel):
+    skill: str
+    total_minutes: int
+    critical_path_minutes: int
+    critical_path: List[str]
+    steps: List[ScheduledSkill]
+
+
+class UserSkill(BaseModel):
+    skill: str
+    level: Optional[str] = None
+    evidence_count: int
+    last_seen: Optional[datetime] = None
+
+    @field_validator("last_seen", mode="before")
+    @classmethod
+    def convert_neo4j_datetime(cls, value: Any) -> Any:
+        if isinstance(value, Neo4jDateTime):
+            return value.to_native()
+        return value
+
+
 @router.post("/", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
 def register_user(
     user: schemas.UserCreate,
@@ -37,6 +72,7 @@ def register_user(
     try:
         with driver.session() as session:
             session.write_transaction(graph_crud.create_user_node, created_user.email)
+        known_graph_users.add(created_user.email)
         print(f"Successfully created user node in graph for: {created_user.email}")
     except Exception as e:
         # This is an important design choice. If the graph creation fails,
@@ -59,12 +95,13 @@ def read_users_me(current_user: schemas.User = Depends(get_current_user)):
 
 
 @router.post("/graph/users/{email}", status_code=201, tags=["Users (Neo4j)"])
-def create_graph_user(email: str, driver: Driver = Depends(get_graph_db_driver)):
+async def create_graph_user(email: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)):
     """
     Create a new User node in the graph.
     """
-    with driver.session() as session:
-        user_email = session.execute_write(graph_crud.create_user_node, email)
+    async with driver.session() as session:
+        user_email = await session.execute_write(async_graph_crud.create_user_node, email)
+    known_graph_users.add(user_email)
     return {"message": "User created in graph", "email": user_email}
 
 
@@ -73,28 +110,38 @@ def create_graph_user(email: str, driver: Driver = Depends(get_graph_db_driver))
     response_model=List[str],
     tags=["Users (Neo4j)"],
 )
-def get_personalized_path(
-    email: str, skill_name: str, driver: Driver = Depends(get_graph_db_driver)
+async def get_personalized_path(
+    email: str, skill_name: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)
 ):
     """
     Generates a personalized learning path for a user,
-    excluding skills they already possess.
+    excluding skills they already possess and the prerequisites those
+    skills imply.
     """
-    with driver.session() as session:
-        # 1. Get the complete, ideal learning path
-        full_path = session.execute_read(
-            graph_crud.get_consolidated_learning_path, skill_name
+    async with driver.session() as session:
+        # 1. Get the skills the user already has
+        user_skills = await session.execute_read(
+            async_graph_crud.get_user_skills_by_accomplishments, email
         )
 
-        # 2. Get the skills the user already has
-        user_skills = session.execute_read(
-            graph_crud.get_user_skills_by_accomplishments, email
+        # 2. Filter the in-memory path: a held skill also covers everything
+        # it builds on, which the reachability index answers directly.
+        personalized_path = skill_snapshot.personalized_path(skill_name, user_skills)
+        if personalized_path is not None:
+            return personalized_path
+
+        # 3. Fallback: get the complete, ideal learning path from Cypher
+        full_path = await session.execute_read(
+            async_graph_crud.get_consolidated_learning_path, skill_name
         )
+        covered = set()
+        if user_skills:
+            covered = await session.execute_read(
+                async_graph_crud.get_covered_skills, user_skills, full_path
+            )
 
-    # 3. In Python, filter the full path to exclude skills the user has
-    # We use a set for user_skills for a more efficient lookup.
-    user_skills_set = set(user_skills)
-    personalized_path = [skill for skill in full_path if skill not in user_skills_set]
+    # 4. In Python, filter the full path with the same rule as the snapshot
+    personalized_path = [skill for skill in full_path if skill not in covered]
 
     if not full_path:
         raise HTTPException(
@@ -104,18 +151,79 @@ def get_personalized_path(
     return personalized_path
 
 
+@router.get(
+    "/graph/users/{email}/learning-schedule/{skill_name}",
+    response_model=LearningSchedule,
+    tags=["Users (Neo4j)"],
+)
+async def get_learning_schedule(
+    email: str, skill_name: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)
+):
+    """
+    Estimates the time a user needs to reach a skill. The skills they are
+    missing are scheduled by their `duration_minutes`: `total_minutes` is the
+    time to learn them one after another, and `critical_path_minutes` the
+    longest chain of prerequisites, i.e. the time to the goal if independent
+    skills are learned in parallel. Answered from the in-memory skill graph.
+    """
+    async with driver.session() as session:
+        user_skills = await session.execute_read(
+            async_graph_crud.get_user_skills_by_accomplishments, email
+        )
+
+    if not skill_snapshot.ready:
+        raise HTTPException(
+            status_code=503, detail="The skill graph snapshot is not loaded yet."
+        )
+    schedule = skill_snapshot.learning_schedule(skill_name, user_skills)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail=f"Skill '{skill_name}' not found.")
+
+    return LearningSchedule(
+        skill=skill_name,
+        total_minutes=schedule.total_minutes,
+        critical_path_minutes=schedule.critical_path_minutes,
+        critical_path=schedule.critical_path,
+        steps=[
+            ScheduledSkill(
+                skill=step.skill_id,
+                duration_minutes=step.duration_minutes,
+                earliest_start_minutes=step.earliest_start,
+                slack_minutes=step.slack,
+                critical=step.critical,
+            )
+            for step in schedule.steps
+        ],
+    )
+
+
+@router.get(
+    "/graph/users/{email}/skills", response_model=List[UserSkill], tags=["Users (Neo4j)"]
+)
+async def get_user_skill_profile(
+    email: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)
+):
+    """
+    Retrieves a user's skill profile: each skill they have demonstrated, the
+    highest mastery level demonstrated, the number of accomplishments that
+    demonstrate it and when the latest was completed.
+    """
+    async with driver.session() as session:
+        return await session.execute_read(async_graph_crud.get_user_skill_profile, email)
+
+
 @router.delete(
     "/graph/users/{email}/skills/{skill_name}", status_code=200, tags=["Users (Neo4j)"]
 )
-def remove_skill_from_user(
-    email: str, skill_name: str, driver: Driver = Depends(get_graph_db_driver)
+async def remove_skill_from_user(
+    email: str, skill_name: str, driver: AsyncDriver = Depends(get_async_graph_db_driver)
 ):
     """
     Removes a skill from a user's profile by deleting the :HAS_SKILL relationship.
     """
-    with driver.session() as session:
+    async with driver.session() as session:
         # You might add logic here to check if the user and skill exist first
-        session.execute_write(graph_crud.remove_user_skill, email, skill_name)
+        await session.execute_write(async_graph_crud.remove_user_skill, email, skill_name)
     return {"message": f"Skill '{skill_name}' removed from user '{email}'"}
 
 
@@ -92,6 +92,16 @@ class Goal(GoalBase):
     model_config = {"from_attributes": True}
 
 
+class GoalProgress(BaseModel):
+    goal_id: str
+    status: str
+    total_steps: int
+    completed_steps: int
+    progress_percent: float
+    current_step: Optional[str] = None
+    remaining_minutes: int
+
+
 class AccomplishmentCreate(BaseModel):
     name: str
     description: str
@@ -0,0 +1,305 @@
+# api/skill_autocomplete.py
+#
+# Type-ahead search over skill names, answered from memory instead of sending
+# the whole sorted skill list (GET /skills/) to every client.
+#
+# Names are matched on their normalized (case-folded, whitespace-collapsed)
+# form in two ways:
+#
+# * By prefix. The normalized names are kept sorted, which is the leaf level of
+#   a prefix trie: the names under any prefix form one contiguous range, found
+#   with two binary searches. Small ranges are ranked directly; prefixes that
+#   cover many names (the top levels of the trie) keep a cached list of their
+#   best entries, updated as names and popularity change.
+# * By trigrams, for typo tolerance. Each name is indexed under its
+#   three-character substrings, and a query matches the names that contain
+#   enough of its trigrams, counted over the posting lists with NumPy.
+
+import asyncio
+import heapq
+import math
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from neo4j import Driver
+
+from . import graph_crud
+
+# Prefix ranges with at most this many names are ranked on every query;
+# larger ones keep a cached top list.
+_SCAN_LIMIT = 256
+# Length of the cached top lists, and so the largest ``limit`` served.
+MAX_RESULTS = 50
+# Share of the query's trigrams a name must contain to match fuzzily.
+FUZZY_THRESHOLD = 0.3
+
+# How often popularity (and names written by other processes) is re-read.
+SKILL_AUTOCOMPLETE_REFRESH_SECONDS = float(
+    os.getenv("SKILL_AUTOCOMPLETE_REFRESH_SECONDS", "300")
+)
+
+
+def normalize(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def _trigrams(key: str, pad_end: bool = True):
+    """Trigrams of a normalized key, padded at the start (and end) so short
+    names and word boundaries count. Queries are still being typed, so their
+    end is not padded."""
+    padded = "  " + key + (" " if pad_end else "")
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class AutocompleteIndex:
+    """
+    Prefix and trigram index over skill names, with a popularity score per
+    name. Results are ranked by popularity, then by name, and every update is
+    applied incrementally.
+    """
+
+    def __init__(self, names=()):
+        """``names`` is an iterable of names or (name, popularity) pairs."""
+        self._names = []  # id -> name (None once removed)
+        self._popularity = array("q")  # id -> popularity
+        self._ids = {}  # name -> id
+        self._postings = {}  # trigram -> ids, ascending
+        self._top = {}  # prefix -> cached best ids, best first
+
+        entries = []
+        for entry in names:
+            name, popularity = (entry, 0) if isinstance(entry, str) else entry
+            if name not in self._ids:
+                key = normalize(name)
+                entries.append((key, self._register(name, popularity, key)))
+        entries.sort()
+        self._keys = [key for key, _ in entries]  # Sorted normalized names...
+        self._key_ids = [i for _, i in entries]  # ...and the id at each position
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def _rank(self, i):
+        return (-self._popularity[i], self._names[i])
+
+    def popularity(self, name: str):
+        i = self._ids.get(name)
+        return None if i is None else self._popularity[i]
+
+    # --- Updates ---
+
+    def _register(self, name, popularity, key):
+        i = len(self._names)
+        self._names.append(name)
+        self._popularity.append(popularity)
+        self._ids[name] = i
+        postings = self._postings
+        for gram in _trigrams(key):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("i")
+            posting.append(i)
+        return i
+
+    def add(self, name: str, popularity: Optional[int] = None):
+        if name in self._ids:
+            if popularity is not None:
+                self.set_popularity(name, popularity)
+            return
+        key = normalize(name)
+        i = self._register(name, popularity or 0, key)
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._key_ids.insert(position, i)
+        self._offer(key, i)
+
+    def remove(self, name: str):
+        i = self._ids.pop(name, None)
+        if i is None:
+            return
+        key = normalize(name)
+        for gram in _trigrams(key):
+            posting = self._postings[gram]
+            del posting[bisect_left(posting, i)]
+            if not posting:
+                del self._postings[gram]
+        position = bisect_left(self._keys, key)
+        while self._key_ids[position] != i:
+            position += 1
+        del self._keys[position], self._key_ids[position]
+        self._forget(key, i)
+        self._names[i] = None
+        self._popularity[i] = 0
+
+    def rename(self, old_name: str, new_name: str):
+        if old_name not in self._ids:
+            return
+        popularity = self._popularity[self._ids[old_name]]
+        self.remove(old_name)
+        self.add(new_name, popularity)
+
+    def set_popularity(self, name: str, popularity: int):
+        i = self._ids.get(name)
+        if i is None or popularity == self._popularity[i]:
+            return
+        key = normalize(name)
+        if popularity < self._popularity[i]:
+            self._forget(key, i)  # It may no longer make the cut.
+            self._popularity[i] = popularity
+        else:
+            self._popularity[i] = popularity
+            self._offer(key, i)
+
+    def _cached_prefixes(self, key):
+        return [key[:n] for n in range(len(key) + 1) if key[:n] in self._top]
+
+    def _offer(self, key, i):
+        """Puts ``i`` into the cached lists of the prefixes it now ranks in."""
+        rank = self._rank(i)
+        for prefix in self._cached_prefixes(key):
+            best = self._top[prefix]
+            if i in best:
+                best.remove(i)
+            if len(best) < MAX_RESULTS or rank < self._rank(best[-1]):
+                # bisect's key= needs Python 3.10; search the ranks instead.
+                best.insert(bisect_left([self._rank(j) for j in best], rank), i)
+                del best[MAX_RESULTS:]
+
+    def _forget(self, key, i):
+        """Drops the cached lists ``i`` was in; they are rebuilt on next use."""
+        for prefix in self._cached_prefixes(key):
+            if i in self._top[prefix]:
+                del self._top[prefix]
+
+    # --- Queries ---
+
+    def complete(self, query: str, limit: int = 10) -> List[str]:
+        """Up to ``limit`` names starting with ``query``, most popular first,
+        followed by fuzzy matches if there are not enough of those."""
+        limit = min(limit, MAX_RESULTS)
+        key = normalize(query)
+        if not key or limit <= 0:
+            return []
+        results = [self._names[i] for i in self._prefix_matches(key, limit)]
+        if len(results) < limit:
+            seen = set(results)
+            for name in self.fuzzy(key, limit + len(results)):
+                if name not in seen:
+                    results.append(name)
+                    if len(results) == limit:
+                        break
+        return results
+
+    def _prefix_matches(self, key, limit):
+        low = bisect_left(self._keys, key)
+        high = bisect_left(self._keys, key + "\U0010ffff")
+        if high - low <= _SCAN_LIMIT:
+            return heapq.nsmallest(limit, self._key_ids[low:high], key=self._rank)
+        best = self._top.get(key)
+        if best is None:
+            best = heapq.nsmallest(MAX_RESULTS, self._key_ids[low:high], key=self._rank)
+            self._top[key] = best
+        return best[:limit]
+
+    def fuzzy(self, query: str, limit: int = 10, threshold: float = FUZZY_THRESHOLD):
+        """Names containing at least ``threshold`` of the query's trigrams,
+        most shared trigrams first, then by popularity."""
+        grams = _trigrams(normalize(query), pad_end=False)
+        if len(grams) < 3 or not self._names:
+            return []
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return []
+        ids = np.concatenate([np.frombuffer(p, dtype=np.int32) for p in postings])
+        shared = np.bincount(ids, minlength=len(self._names))
+        candidates = np.flatnonzero(shared >= max(1, math.ceil(threshold * len(grams))))
+        popularity = np.frombuffer(self._popularity, dtype=np.int64)[candidates]
+        best = candidates[np.lexsort((-popularity, -shared[candidates]))[:limit]]
+        return [self._names[i] for i in best]
+
+
+class SkillAutocomplete:
+    """
+    Holds the AutocompleteIndex over every :Skill name, with popularity being
+    the number of users who demonstrated the skill. ``complete`` returns None
+    until the index is loaded, and callers fall back to Cypher.
+    """
+
+    def __init__(self):
+        self.index: AutocompleteIndex = None
+        self.loaded_at: float = None
+        self._lock = threading.RLock()
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    def load(self, driver: Driver):
+        started = time.perf_counter()
+        with driver.session() as session:
+            names = session.execute_read(graph_crud.get_skill_popularity)
+        index = AutocompleteIndex(names)
+        with self._lock:
+            self.index = index
+            self.loaded_at = time.time()
+        print(
+            f"Loaded skill autocomplete index: {len(index)} names "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def try_load(self, driver: Driver) -> bool:
+        """Loads the index, logging instead of raising on failure."""
+        try:
+            self.load(driver)
+            return True
+        except Exception as e:
+            # Autocomplete keeps working without the index; it uses Cypher.
+            print(f"WARNING: Could not load skill autocomplete index. Error: {e}")
+            return False
+
+    async def refresh_periodically(
+        self, driver: Driver, interval: float = SKILL_AUTOCOMPLETE_REFRESH_SECONDS
+    ):
+        """Reloads the index (and with it, popularity) every ``interval``
+        seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await run_in_threadpool(self.try_load, driver)
+
+    # --- Incremental updates (called after a successful Neo4j write) ---
+
+    def skill_created(self, skill_name: str):
+        with self._lock:
+            if self.index is not None:
+                self.index.add(skill_name)
+
+    def skill_renamed(self, old_name: str, new_name: str):
+        with self._lock:
+            if self.index is not None:
+                self.index.rename(old_name, new_name)
+
+    def skill_deleted(self, skill_name: str):
+        with self._lock:
+            if self.index is not None:
+                self.index.remove(skill_name)
+
+    # --- Reads ---
+
+    def complete(self, query: str, limit: int = 10):
+        with self._lock:
+            if self.index is None:
+                return None
+            return self.index.complete(query, limit)
+
+
+# A single index shared by the whole application
+skill_autocomplete = SkillAutocomplete()
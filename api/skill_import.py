@@ -0,0 +1,490 @@
+# api/skill_import.py
+#
+# Streaming bulk import of external skill taxonomies (ESCO/O*NET-style CSV or
+# JSONL exports, or the skill -> prerequisites adjacency dict of
+# skill_system/skill_graph.py) into the graph.
+#
+# The source is read twice, one record at a time, so memory does not grow
+# with its size: the first pass writes every skill (including the endpoints
+# of dependency edges), the second the DEPENDS_ON edges between them. Each
+# pass groups records into UNWIND batches that several writer sessions
+# commit in parallel. Every write is a MERGE, so a batch can safely be
+# written twice, and after each batch the import saves a checkpoint: the
+# number of records of the current pass written so far. A failed import is
+# resumed from there by running it again. Before anything is written, the
+# edges are checked against the graph's existing dependencies, and an import
+# that would close a dependency cycle is refused. Depths are backfilled once
+# at the end instead of after every edge.
+
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from neo4j import Driver
+
+from skill_system.models import Skill, SkillGraph
+
+from . import graph_crud
+from .ai.skill_context import skill_context
+from .graph_cache import graph_cache
+from .skill_autocomplete import skill_autocomplete
+from .skill_snapshot import skill_snapshot
+
+FORMATS = ("csv", "jsonl", "adjacency")
+
+# Records per UNWIND statement, and writer sessions working in parallel.
+SKILL_IMPORT_BATCH_SIZE = int(os.getenv("SKILL_IMPORT_BATCH_SIZE", "5000"))
+SKILL_IMPORT_WORKERS = int(os.getenv("SKILL_IMPORT_WORKERS", "4"))
+# The admin endpoint only imports files from this directory.
+SKILL_IMPORT_DIR = os.getenv("SKILL_IMPORT_DIR", "imports")
+# Seconds between progress lines.
+PROGRESS_INTERVAL = 5.0
+# Cycles listed when an import is refused.
+MAX_REPORTED_CYCLES = 5
+
+
+class SkillImportError(ValueError):
+    pass
+
+
+# --- Reading ---
+
+
+def detect_format(path: str) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".json":
+        return "adjacency"
+    raise SkillImportError(
+        f"Cannot tell the format of '{path}'; pass one of {', '.join(FORMATS)}."
+    )
+
+
+def read_rows(source: Union[str, Dict[str, List[str]]], fmt: str) -> Iterator[dict]:
+    """
+    The rows of a taxonomy, one at a time. CSV and JSONL rows describe either
+    a skill ("name", "duration_minutes", "prerequisites") or one dependency
+    ("parent", "child"). An adjacency source is a dict, or a JSON file
+    holding one, from each skill to the list of its prerequisites.
+    """
+    if fmt == "adjacency":
+        if isinstance(source, (str, Path)):
+            # A JSON object cannot be streamed, but adjacency dicts are the
+            # small, hand-written format; large taxonomies come as CSV/JSONL.
+            with open(source) as f:
+                source = json.load(f)
+        if not isinstance(source, dict):
+            raise SkillImportError("An adjacency taxonomy must be a JSON object.")
+        for name, prerequisites in source.items():
+            yield {"name": name, "prerequisites": prerequisites}
+    elif fmt == "csv":
+        with open(source, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif fmt == "jsonl":
+        with open(source, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise SkillImportError(f"Line {line_number} is not valid JSON: {e}")
+                if not isinstance(row, dict):
+                    raise SkillImportError(f"Line {line_number} is not a JSON object.")
+                yield row
+    else:
+        raise SkillImportError(f"Unknown format '{fmt}'; use one of {', '.join(FORMATS)}.")
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _duration(value) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise SkillImportError(f"Invalid duration_minutes: {value!r}")
+
+
+def _prerequisites(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    return [name for name in map(_clean, value) if name]
+
+
+def _row_name(row) -> Optional[str]:
+    # "preferredLabel" is what ESCO exports call a skill's name.
+    return _clean(row.get("name") or row.get("skill") or row.get("preferredLabel"))
+
+
+def skill_records(rows: Iterable[dict]) -> Iterator[dict]:
+    """Every skill the rows name, with its duration if they give one."""
+    for row in rows:
+        name = _row_name(row)
+        if name:
+            yield {"name": name, "duration_minutes": _duration(row.get("duration_minutes"))}
+            for prerequisite in _prerequisites(row.get("prerequisites")):
+                yield {"name": prerequisite, "duration_minutes": None}
+        for key in ("parent", "child"):
+            endpoint = _clean(row.get(key))
+            if endpoint:
+                yield {"name": endpoint, "duration_minutes": None}
+
+
+def dependency_records(rows: Iterable[dict]) -> Iterator[dict]:
+    """Every (parent)-[:DEPENDS_ON]->(child) edge the rows describe."""
+    for row in rows:
+        name = _row_name(row)
+        if name:
+            for prerequisite in _prerequisites(row.get("prerequisites")):
+                if prerequisite != name:
+                    yield {"parent": name, "child": prerequisite}
+        parent, child = _clean(row.get("parent")), _clean(row.get("child"))
+        if parent and child and parent != child:
+            yield {"parent": parent, "child": child}
+
+
+def _batches(records: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+# --- Cycle check ---
+
+
+def find_dependency_cycles(
+    driver: Driver, records: Iterable[dict], limit: int = MAX_REPORTED_CYCLES
+) -> List[List[str]]:
+    """
+    The dependency cycles that writing the (parent)-[:DEPENDS_ON]->(child)
+    ``records`` would close, each as skill names starting and ending at the
+    same skill, each depending on the next; at most ``limit`` of them.
+
+    The graph's existing edges and then the records are added to a SkillGraph
+    that holds only names, checking each record first, so its topological
+    order is kept up to date incrementally. Cycles already in the graph are
+    not reported.
+    """
+    with driver.session() as session:
+        existing = session.execute_read(graph_crud.get_skill_graph_dependencies)
+    graph = SkillGraph()
+
+    def add(parent: str, child: str):
+        for name in (parent, child):
+            graph.add_skill(Skill(name, name))
+        graph.add_dependency(child, parent)
+
+    for parent, child in existing:
+        add(parent, child)
+    del existing
+    graph.order  # Built once; every edge below updates it in place.
+
+    cycles = []
+    for record in records:
+        parent, child = record["parent"], record["child"]
+        if parent in graph and child in graph:
+            cycle = graph.find_cycle(child, parent)
+            if cycle is not None:
+                cycles.append(cycle)
+                if len(cycles) == limit:
+                    break
+                continue  # Leave it out, so each cycle is reported once.
+        add(parent, child)
+    return cycles
+
+
+# --- Checkpoints ---
+
+
+class Checkpoint:
+    """
+    The progress of an import from a file, saved next to it as JSON: the
+    pass under way and how many of its records are written. It is ignored if
+    the file has changed since.
+    """
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        stat = os.stat(source)
+        self._source = {"source": os.path.abspath(source), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def load(self) -> Optional[dict]:
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if any(state.get(key) != value for key, value in self._source.items()):
+            return None
+        return state
+
+    def save(self, phase: str, records: int):
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(dict(self._source, phase=phase, records=records), f)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+# --- Writing ---
+
+
+class ImportProgress:
+    """Records written per pass and how long each took, for throughput."""
+
+    def __init__(self):
+        self.phase: Optional[str] = None
+        self.written: Dict[str, int] = {}
+        self.skipped: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self._started: Optional[float] = None
+
+    def start(self, phase: str, skipped: int):
+        self.phase = phase
+        self.written[phase] = 0
+        self.skipped[phase] = skipped
+        self._started = time.perf_counter()
+
+    def add(self, records: int):
+        self.written[self.phase] += records
+        self.seconds[self.phase] = time.perf_counter() - self._started
+
+    def rate(self, phase: str) -> float:
+        seconds = self.seconds.get(phase)
+        return self.written[phase] / seconds if seconds else 0.0
+
+    def report(self) -> dict:
+        return {
+            phase: {
+                "records": self.written[phase],
+                "skipped": self.skipped[phase],
+                "seconds": round(self.seconds.get(phase, 0.0), 2),
+                "records_per_second": round(self.rate(phase), 1),
+            }
+            for phase in self.written
+        }
+
+
+def _write_batch(driver: Driver, write: Callable, batch: List[dict]):
+    # Each writer has its own session; execute_write retries transient
+    # errors such as deadlocks between batches touching the same skills.
+    with driver.session() as session:
+        session.execute_write(write, batch)
+
+
+def _write_phase(
+    driver: Driver,
+    phase: str,
+    records: Iterator[dict],
+    write: Callable,
+    progress: ImportProgress,
+    batch_size: int,
+    workers: int,
+    checkpoint: Optional[Checkpoint],
+    skip: int,
+    log: Callable[[str], None],
+):
+    progress.start(phase, skip)
+    written = skip  # Records before this are all committed
+    finished = {}  # Batch start -> size, committed out of order
+    pending = {}  # Future -> (batch start, size)
+    start = skip
+    last_log = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        batches = _batches(islice(records, skip, None), batch_size)
+        while True:
+            # At most two batches per writer are in memory at once.
+            for batch in islice(batches, 2 * workers - len(pending)):
+                future = executor.submit(_write_batch, driver, write, batch)
+                pending[future] = (start, len(batch))
+                start += len(batch)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch_start, size = pending.pop(future)
+                future.result()  # Raises the batch's error, ending the import
+                finished[batch_start] = size
+                progress.add(size)
+            while written in finished:
+                written += finished.pop(written)
+            if checkpoint is not None:
+                checkpoint.save(phase, written)
+            if time.perf_counter() - last_log >= PROGRESS_INTERVAL:
+                last_log = time.perf_counter()
+                log(
+                    f"  {phase}: {written} records written "
+                    f"({progress.rate(phase):.0f}/s)"
+                )
+
+
+def import_taxonomy(
+    driver: Driver,
+    source: Union[str, Dict[str, List[str]]],
+    fmt: Optional[str] = None,
+    batch_size: int = SKILL_IMPORT_BATCH_SIZE,
+    workers: int = SKILL_IMPORT_WORKERS,
+    resume: bool = True,
+    progress: Optional[ImportProgress] = None,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """
+    Imports a taxonomy file (or an adjacency dict) and returns the records
+    written per pass with their throughput. With ``resume``, an import from a
+    file picks up after the records its last attempt saved as written.
+    """
+    if fmt is None:
+        fmt = "adjacency" if isinstance(source, dict) else detect_format(source)
+    if fmt not in FORMATS:
+        raise SkillImportError(f"Unknown format '{fmt}'; use one of {', '.join(FORMATS)}.")
+    if batch_size < 1 or workers < 1:
+        raise SkillImportError("batch_size and workers must be at least 1.")
+    progress = progress or ImportProgress()
+
+    checkpoint = state = None
+    if not isinstance(source, dict):
+        checkpoint = Checkpoint(str(source) + ".checkpoint", source)
+        state = checkpoint.load() if resume else None
+        if state:
+            log(f"Resuming the {state['phase']} pass after {state['records']} records.")
+
+    # The API refuses a dependency that closes a cycle; so does the import,
+    # before it writes anything.
+    cycles = find_dependency_cycles(driver, dependency_records(read_rows(source, fmt)))
+    if cycles:
+        raise SkillImportError(
+            "The import would create dependency cycles and was refused. "
+            "Each skill depends on the next: "
+            + "; ".join(" -> ".join(cycle) for cycle in cycles)
+        )
+
+    phases = [
+        ("skills", skill_records, graph_crud.import_skill_batch),
+        ("dependencies", dependency_records, graph_crud.import_dependency_batch),
+    ]
+    if state and state["phase"] == "dependencies":
+        phases = phases[1:]
+    for phase, records, write in phases:
+        skip = state["records"] if state and state["phase"] == phase else 0
+        _write_phase(
+            driver,
+            phase,
+            records(read_rows(source, fmt)),
+            write,
+            progress,
+            batch_size,
+            workers,
+            checkpoint,
+            skip,
+            log,
+        )
+        log(
+            f"Imported {progress.written[phase]} {phase} records "
+            f"in {progress.seconds.get(phase, 0.0):.2f}s "
+            f"({progress.rate(phase):.0f}/s)."
+        )
+
+    started = time.perf_counter()
+    with driver.session() as session:
+        rounds = session.execute_write(graph_crud.backfill_skill_depths)
+    log(f"Backfilled skill depths in {rounds} rounds ({time.perf_counter() - started:.2f}s).")
+    if checkpoint is not None:
+        checkpoint.clear()
+    return progress.report()
+
+
+def resolve_import_path(name: str) -> str:
+    """The path of ``name`` inside SKILL_IMPORT_DIR; anything outside it is
+    refused."""
+    base = Path(SKILL_IMPORT_DIR).resolve()
+    path = (base / name).resolve()
+    if base not in path.parents:
+        raise SkillImportError(f"'{name}' is not inside the import directory.")
+    return str(path)
+
+
+class SkillImportJob:
+    """
+    Runs one import at a time in a background thread for the admin endpoint,
+    and reports its progress. The in-memory skill indexes are reloaded when
+    it finishes.
+    """
+
+    def __init__(self):
+        self.source: Optional[str] = None
+        self.progress: Optional[ImportProgress] = None
+        self.report: Optional[dict] = None
+        self.error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, driver: Driver, path: str, fmt: Optional[str] = None, **options) -> bool:
+        """Starts importing ``path``; returns False if an import is running."""
+        with self._lock:
+            if self.running:
+                return False
+            self.source = path
+            self.progress = ImportProgress()
+            self.report = self.error = None
+            self._thread = threading.Thread(
+                target=self._run, args=(driver, path, fmt, options), daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _run(self, driver, path, fmt, options):
+        try:
+            self.report = import_taxonomy(
+                driver, path, fmt, progress=self.progress, **options
+            )
+        except Exception as e:
+            # The checkpoint stays, so starting the import again resumes it.
+            graph_cache.bump()  # Some batches were written
+            self.error = str(e)
+            print(f"WARNING: Skill import from '{path}' failed. Error: {e}")
+            return
+        graph_cache.bump()
+        for index in (skill_snapshot, skill_autocomplete, skill_context):
+            index.try_load(driver)
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "source": self.source,
+            "phase": self.progress.phase if self.progress else None,
+            "progress": self.progress.report() if self.progress else {},
+            "error": self.error,
+        }
+
+
+# A single import job shared by the whole application
+skill_import_job = SkillImportJob()
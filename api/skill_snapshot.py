@@ -0,0 +1,346 @@
+# api/skill_snapshot.py
+
+import asyncio
+import os
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from neo4j import Driver
+
+from skill_system.binary import MappedSkillGraph
+from skill_system.models import Skill, SkillGraph
+from . import graph_crud
+
+# How often the whole snapshot is re-read from Neo4j to pick up writes made by
+# other processes. Writes made through this process are applied immediately.
+SKILL_GRAPH_REFRESH_SECONDS = float(os.getenv("SKILL_GRAPH_REFRESH_SECONDS", "300"))
+
+# Optional path of a binary snapshot written by `python -m api.cli
+# write-snapshot`. When set, workers start by memory-mapping it instead of
+# each reading the graph from Neo4j, and poll it for replacements every few
+# seconds. They still reload from Neo4j every SKILL_GRAPH_REFRESH_SECONDS, so
+# other processes' writes show up even if the file is not rewritten.
+SKILL_GRAPH_FILE = os.getenv("SKILL_GRAPH_FILE")
+SKILL_GRAPH_FILE_POLL_SECONDS = float(
+    os.getenv("SKILL_GRAPH_FILE_POLL_SECONDS", "5")
+)
+
+
+def read_skill_graph(driver: Driver) -> SkillGraph:
+    """Builds a SkillGraph from the :Skill nodes and DEPENDS_ON edges in Neo4j."""
+    with driver.session() as session:
+        skills = session.execute_read(graph_crud.get_skill_graph_nodes)
+        dependencies = session.execute_read(graph_crud.get_skill_graph_dependencies)
+
+    graph = SkillGraph()
+    for name, description, duration_minutes in skills:
+        graph.add_skill(
+            Skill(name, name, description or "", duration_minutes=duration_minutes)
+        )
+    for parent, child in dependencies:
+        graph.add_dependency(child, parent)
+    graph.compact()
+    return graph
+
+
+class SkillGraphSnapshot:
+    """
+    Keeps an in-memory SkillGraph mirroring the :Skill nodes and DEPENDS_ON
+    edges in Neo4j, so prerequisite queries can be answered without Cypher.
+
+    In the snapshot a skill's id is its name, and a (parent)-[:DEPENDS_ON]->(child)
+    edge is stored as "child is a prerequisite of parent". Every read returns
+    None when the snapshot cannot answer, and callers fall back to Cypher.
+
+    With a ``file_path`` the graph is a MappedSkillGraph shared with the other
+    workers. The first write made through this process swaps in a private,
+    mutable copy, which is kept until a newer file appears.
+    """
+
+    def __init__(self, file_path: str = None):
+        self.graph = None  # A SkillGraph or a MappedSkillGraph
+        self.file_path = file_path
+        self.loaded_at: float = None
+        self.load_seconds: float = None
+        self._file_identity = None  # Of the snapshot file last mapped
+        # Guards the graph against readers seeing a half-applied update.
+        self._lock = threading.RLock()
+
+    @property
+    def ready(self) -> bool:
+        return self.graph is not None
+
+    # --- Loading ---
+
+    def load(self, driver: Driver, from_file: bool = True):
+        """Swaps in a fresh graph: the snapshot file if there is one (unless
+        ``from_file`` is False), else a SkillGraph built from Neo4j."""
+        if from_file and self.file_path and os.path.exists(self.file_path):
+            self.load_file()
+            return
+
+        started = time.perf_counter()
+        graph = read_skill_graph(driver)
+        reachability = graph.reachability.stats()
+
+        with self._lock:
+            self.graph = graph
+            self.loaded_at = time.time()
+            self.load_seconds = time.perf_counter() - started
+        print(
+            f"Loaded skill graph snapshot: {len(graph)} skills, "
+            f"{len(graph._requires)} dependencies in {self.load_seconds:.2f}s; "
+            f"reachability index {reachability['memory_bytes'] / 1e6:.1f} MB "
+            f"built in {reachability['build_seconds']:.2f}s"
+        )
+
+    def load_file(self):
+        """Memory-maps the snapshot file and swaps it in."""
+        started = time.perf_counter()
+        graph = MappedSkillGraph(self.file_path)
+        with self._lock:
+            self.graph = graph
+            self._file_identity = graph.file_identity
+            self.loaded_at = time.time()
+            self.load_seconds = time.perf_counter() - started
+        print(
+            f"Mapped skill graph snapshot '{self.file_path}': {len(graph)} skills, "
+            f"{graph.dependency_count} dependencies, {graph.nbytes() / 1e6:.1f} MB "
+            f"in {self.load_seconds * 1e3:.1f}ms"
+        )
+
+    def file_changed(self) -> bool:
+        """True if the snapshot file was replaced since it was last mapped."""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._file_identity
+
+    def try_load(self, driver: Driver, from_file: bool = True) -> bool:
+        """Loads the snapshot, logging instead of raising on failure."""
+        try:
+            self.load(driver, from_file)
+            return True
+        except Exception as e:
+            # The API keeps working without the snapshot; reads use Cypher.
+            print(f"WARNING: Could not load skill graph snapshot. Error: {e}")
+            return False
+
+    async def refresh_periodically(
+        self, driver: Driver, interval: float = SKILL_GRAPH_REFRESH_SECONDS
+    ):
+        """Reloads the snapshot from Neo4j every ``interval`` seconds until
+        cancelled.
+
+        With a snapshot file, the file is also checked every
+        SKILL_GRAPH_FILE_POLL_SECONDS and remapped as soon as it is replaced,
+        which counts as a reload. The file only saves the workers from each
+        reading Neo4j at startup and after a rewrite; it never stops the
+        reloads that pick up other processes' writes.
+        """
+        poll = SKILL_GRAPH_FILE_POLL_SECONDS if self.file_path else interval
+        loaded_at = time.monotonic()
+        while True:
+            await asyncio.sleep(poll)
+            if (
+                self.file_path
+                and os.path.exists(self.file_path)
+                and self.file_changed()
+            ):
+                loaded_at = time.monotonic()
+                await run_in_threadpool(self.try_load, driver)
+            elif time.monotonic() - loaded_at >= interval:
+                loaded_at = time.monotonic()
+                await run_in_threadpool(self.try_load, driver, False)
+
+    # --- Incremental updates (called after a successful Neo4j write) ---
+
+    def _writable(self):
+        """The graph to apply a write to, copying a mapped one first. Caller
+        holds the lock."""
+        if isinstance(self.graph, MappedSkillGraph):
+            self.graph = self.graph.to_skill_graph()
+        return self.graph
+
+    def skill_created(
+        self, skill_name: str, description: str = "", duration_minutes: int = None
+    ):
+        with self._lock:
+            if self.graph is not None and skill_name not in self.graph:
+                self._writable().add_skill(
+                    Skill(
+                        skill_name,
+                        skill_name,
+                        description,
+                        duration_minutes=duration_minutes,
+                    )
+                )
+
+    def skill_duration_set(self, skill_name: str, duration_minutes: int):
+        with self._lock:
+            if self.graph is not None and skill_name in self.graph:
+                self._writable().skills[skill_name].duration_minutes = duration_minutes
+
+    def skill_renamed(self, old_name: str, new_name: str):
+        with self._lock:
+            if self.graph is None or old_name not in self.graph:
+                return
+            graph = self._writable()
+            if new_name in graph:
+                # Neo4j now holds two nodes with this name; keep the existing one.
+                graph.remove_skill(old_name)
+            else:
+                graph.rename_skill(old_name, new_name)
+
+    def skill_deleted(self, skill_name: str):
+        with self._lock:
+            if self.graph is not None and skill_name in self.graph:
+                self._writable().remove_skill(skill_name)
+
+    def dependency_added(self, parent_skill_name: str, child_skill_name: str):
+        with self._lock:
+            graph = self.graph
+            if (
+                graph is not None
+                and parent_skill_name in graph
+                and child_skill_name in graph
+            ):
+                self._writable().add_dependency(child_skill_name, parent_skill_name)
+
+    # --- Reads ---
+
+    def consolidated_path(self, skill_name: str):
+        """
+        The skill and all of its prerequisites, most fundamental first, or
+        None if the snapshot is not loaded or does not know the skill.
+        """
+        with self._lock:
+            if self.graph is None or skill_name not in self.graph:
+                return None
+            return self.graph.get_consolidated_path(skill_name)
+
+    def is_prerequisite(self, prerequisite_name: str, skill_name: str):
+        """
+        Whether the first skill is a (transitive) prerequisite of the second,
+        or None if the snapshot is not loaded or does not know either skill.
+        """
+        with self._lock:
+            graph = self.graph
+            if graph is None or prerequisite_name not in graph or skill_name not in graph:
+                return None
+            return graph.is_prerequisite(prerequisite_name, skill_name)
+
+    def find_cycle(self, parent_skill_name: str, child_skill_name: str):
+        """
+        The cycle a new (parent)-[:DEPENDS_ON]->(child) edge would close, as
+        skill names from parent back to parent, each depending on the next.
+        Returns [] if the edge is safe, or None if the snapshot is not loaded
+        or does not know either skill.
+        """
+        with self._lock:
+            graph = self.graph
+            if (
+                graph is None
+                or parent_skill_name not in graph
+                or child_skill_name not in graph
+            ):
+                return None
+            return graph.find_cycle(child_skill_name, parent_skill_name) or []
+
+    def prerequisites_among(self, skill_names, candidates):
+        """
+        For each known skill in ``skill_names``, the ``candidates`` that are
+        among its (transitive) prerequisites. Skills with none are left out.
+        Returns None if the snapshot is not loaded.
+        """
+        candidates = set(candidates)
+        with self._lock:
+            graph = self.graph
+            if graph is None:
+                return None
+            found = {}
+            for name in skill_names:
+                if name in graph:
+                    prerequisites = graph.get_prerequisites(name) & candidates
+                    if prerequisites:
+                        found[name] = prerequisites
+            return found
+
+    def _covered_by(self, held_skills):
+        """
+        A predicate telling whether a skill is already held, or implied by a
+        held skill because that skill builds on it. Caller holds the lock.
+        """
+        graph = self.graph
+        held = {name for name in held_skills if name in graph}
+
+        def covered(name):
+            return name in held or any(graph.is_prerequisite(name, h) for h in held)
+
+        return covered
+
+    def personalized_path(self, skill_name: str, held_skills):
+        """
+        The consolidated path for ``skill_name`` without the skills a user
+        already holds or anything those skills build on, or None if the
+        snapshot cannot answer.
+        """
+        with self._lock:
+            graph = self.graph
+            if graph is None or skill_name not in graph:
+                return None
+            covered = self._covered_by(held_skills)
+            return [
+                name
+                for name in graph.get_consolidated_path(skill_name)
+                if not covered(name)
+            ]
+
+    def learning_plan(self, skill_names, held_skills=()):
+        """
+        One deduplicated plan for several target skills plus each target's
+        share of it, skipping skills covered by ``held_skills``. Returns
+        (plan, membership), or None if the snapshot does not know every target.
+        """
+        with self._lock:
+            graph = self.graph
+            if graph is None or any(name not in graph for name in skill_names):
+                return None
+            plan, membership = graph.get_consolidated_plan(skill_names)
+            covered = self._covered_by(held_skills)
+            keep = {name for name in plan if not covered(name)}
+            return (
+                [name for name in plan if name in keep],
+                {
+                    target: [name for name in names if name in keep]
+                    for target, names in membership.items()
+                },
+            )
+
+    def learning_schedule(self, skill_name: str, held_skills=()):
+        """
+        The skill and its prerequisites that ``held_skills`` do not cover,
+        scheduled by learning time (see SkillGraph.get_learning_schedule), or
+        None if the snapshot is not loaded or does not know the skill.
+        """
+        with self._lock:
+            graph = self.graph
+            if graph is None or skill_name not in graph:
+                return None
+            return graph.get_learning_schedule(
+                skill_name, skip=self._covered_by(held_skills)
+            )
+
+    def reachability_stats(self):
+        """Size and build time of the reachability index, if one is in use.
+        A mapped snapshot answers reachability without an index."""
+        with self._lock:
+            if not isinstance(self.graph, SkillGraph):
+                return None
+            return self.graph.reachability.stats()
+
+
+# A single snapshot shared by the whole application
+skill_snapshot = SkillGraphSnapshot(SKILL_GRAPH_FILE)
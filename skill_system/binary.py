@@ -0,0 +1,381 @@
+"""Compact binary snapshots of a SkillGraph that can be memory-mapped.
+
+The file is written once from a SkillGraph and then mapped read-only by any
+number of processes, which share a single page-cache copy of it. Opening a
+snapshot only parses the fixed-size header, so it takes milliseconds
+regardless of the graph's size.
+
+Layout (little-endian, every section 4-byte aligned)::
+
+    header          magic, format version, node count, edge count,
+                    string table size, generation time
+    name_offsets    uint32[nodes + 1]  byte ranges in the string table
+    requires        int32[nodes + 1] offsets + int32[edges] targets (CSR)
+    unlocks         int32[nodes + 1] offsets + int32[edges] targets (CSR)
+    depth           int32[nodes]       longest REQUIRES chain of each skill
+    duration        int32[nodes]       minutes to learn each skill, -1 if unknown
+    strings         UTF-8 skill ids, concatenated
+
+Nodes are numbered in skill-id order, so ids are looked up with a binary
+search over the string table and sorting by index is sorting by id.
+
+Writers produce a temporary file next to the target and ``os.replace`` it,
+so readers always see either the old or the new snapshot, never a partial
+one. A process that mapped the old file keeps a valid mapping until it lets
+go of it.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+from .models import Skill, SkillGraph
+from .planner import DEFAULT_DURATION_MINUTES, schedule
+
+MAGIC = b"SKGF"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<4sIIIQd")
+
+
+class _Names:
+    """Sequence view decoding skill ids from the mapped string table."""
+
+    __slots__ = ("_offsets", "_strings")
+
+    def __init__(self, offsets, strings):
+        self._offsets = offsets
+        self._strings = strings
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, node):
+        offsets = self._offsets
+        return str(self._strings[offsets[node] : offsets[node + 1]], "utf-8")
+
+
+def write_skill_graph(graph: SkillGraph, path):
+    """Writes ``graph``'s skills and REQUIRES edges to ``path`` atomically.
+
+    Returns ``(skills, dependencies, bytes)`` for the written file.
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("Skill graph snapshots can only be written on little-endian hosts")
+
+    skill_ids = sorted(graph.skills)
+    old = [graph._index[skill_id] for skill_id in skill_ids]
+    new = {index: node for node, index in enumerate(old)}
+    depth = graph._depths(old)
+
+    encoded = [skill_id.encode("utf-8") for skill_id in skill_ids]
+    name_offsets = array("I", [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+
+    def packed(adjacency):
+        offsets, targets = array("i", [0]), array("i")
+        for index in old:
+            targets.extend(sorted(new[n] for n in adjacency.neighbors(index)))
+            offsets.append(len(targets))
+        return offsets, targets
+
+    requires_offsets, requires_targets = packed(graph._requires)
+    unlocks_offsets, unlocks_targets = packed(graph._unlocks)
+    depths = array("i", [depth[index] for index in old])
+    durations = array(
+        "i",
+        [
+            -1 if minutes is None else minutes
+            for minutes in (graph.skills[skill_id].duration_minutes for skill_id in skill_ids)
+        ],
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(
+        prefix=".skill-graph-", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    MAGIC,
+                    FORMAT_VERSION,
+                    len(skill_ids),
+                    len(requires_targets),
+                    name_offsets[-1],
+                    time.time(),
+                )
+            )
+            for section in (
+                name_offsets,
+                requires_offsets,
+                requires_targets,
+                unlocks_offsets,
+                unlocks_targets,
+                depths,
+                durations,
+            ):
+                section.tofile(f)
+            for name in encoded:
+                f.write(name)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return len(skill_ids), len(requires_targets), os.path.getsize(path)
+
+
+class MappedSkillGraph:
+    """A read-only SkillGraph backed by a memory-mapped snapshot file.
+
+    Offers the same queries as SkillGraph. Reachability questions are
+    answered by traversal pruned with the stored depths (a prerequisite is
+    always shallower than the skill that needs it), so nothing beyond the
+    mapping itself is held per process. Use ``to_skill_graph`` for a
+    mutable copy.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Identifies this version of the file, so replacements can be noticed.
+        self.file_identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        if sys.byteorder != "little":
+            raise RuntimeError("Skill graph snapshots can only be read on little-endian hosts")
+        if stat.st_size < _HEADER.size:
+            raise ValueError(f"'{path}' is too small to be a skill graph snapshot")
+        magic, version, nodes, edges, strings_size, generated_at = _HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a skill graph snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"'{path}' has snapshot format {version}, expected {FORMAT_VERSION}"
+            )
+        expected = _HEADER.size + 4 * (5 * nodes + 3 + 2 * edges) + strings_size
+        if stat.st_size != expected:
+            raise ValueError(
+                f"'{path}' is {stat.st_size} bytes, expected {expected}; "
+                "the snapshot is truncated or corrupt"
+            )
+        self.generated_at = generated_at
+        self.dependency_count = edges
+
+        view = memoryview(self._mmap)
+        position = _HEADER.size
+
+        def section(fmt, count):
+            nonlocal position
+            end = position + 4 * count
+            values = view[position:end].cast(fmt)
+            position = end
+            return values
+
+        name_offsets = section("I", nodes + 1)
+        self._requires = (section("i", nodes + 1), section("i", edges))
+        self._unlocks = (section("i", nodes + 1), section("i", edges))
+        self._depth = section("i", nodes)
+        self._duration = section("i", nodes)
+        self._ids = _Names(name_offsets, view[position : position + strings_size])
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, skill_id):
+        return self._lookup(skill_id) is not None
+
+    def nbytes(self):
+        """Size of the mapping, shared between every process that maps it."""
+        return len(self._mmap)
+
+    # --- Internal helpers ---
+
+    def _lookup(self, skill_id):
+        ids = self._ids
+        node = bisect_left(ids, skill_id)
+        if node < len(ids) and ids[node] == skill_id:
+            return node
+        return None
+
+    def _node(self, skill_id):
+        node = self._lookup(skill_id)
+        if node is None:
+            raise KeyError(skill_id)
+        return node
+
+    @staticmethod
+    def _neighbors(adjacency, node):
+        offsets, targets = adjacency
+        return targets[offsets[node] : offsets[node + 1]]
+
+    def _reachable(self, adjacency, start):
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbor in self._neighbors(adjacency, stack.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        seen.discard(start)
+        return seen
+
+    # --- Queries ---
+
+    def depth(self, skill_id):
+        """Length of the skill's longest prerequisite chain."""
+        return self._depth[self._node(skill_id)]
+
+    def _requires_path(self, start, goal):
+        """A chain of REQUIRES edges from ``start`` down to ``goal``, or None.
+        Only skills deeper than ``goal`` are explored."""
+        depth = self._depth
+        floor = depth[goal]
+        parent = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbor in self._neighbors(self._requires, node):
+                if neighbor in parent:
+                    continue
+                if neighbor == goal:
+                    path = [goal]
+                    while node is not None:
+                        path.append(node)
+                        node = parent[node]
+                    return path[::-1]
+                if depth[neighbor] > floor:
+                    parent[neighbor] = node
+                    stack.append(neighbor)
+        return None
+
+    def duration_minutes(self, skill_id):
+        """The skill's estimated learning time, or None if unknown."""
+        minutes = self._duration[self._node(skill_id)]
+        return None if minutes < 0 else minutes
+
+    def is_prerequisite(self, prerequisite_skill_id, skill_id):
+        """True if the first skill is a direct or indirect prerequisite of the
+        second."""
+        return (
+            self._requires_path(self._node(skill_id), self._node(prerequisite_skill_id))
+            is not None
+        )
+
+    def find_cycle(self, source_skill_id, target_skill_id):
+        """Same as SkillGraph.find_cycle."""
+        source = self._node(source_skill_id)
+        target = self._node(target_skill_id)
+        if source == target:
+            return [target_skill_id, target_skill_id]
+        path = self._requires_path(source, target)
+        if path is None:
+            return None
+        return [target_skill_id] + [self._ids[n] for n in path]
+
+    def get_prerequisites(self, skill_id):
+        ids = self._ids
+        return {ids[n] for n in self._reachable(self._requires, self._node(skill_id))}
+
+    def get_skills_unlocked_by(self, skill_id):
+        ids = self._ids
+        return {ids[n] for n in self._reachable(self._unlocks, self._node(skill_id))}
+
+    def get_consolidated_path(self, skill_id):
+        """The skill and all of its prerequisites, most fundamental first."""
+        start = self._node(skill_id)
+        nodes = self._reachable(self._requires, start)
+        nodes.add(start)
+        depth, ids = self._depth, self._ids
+        return [ids[n] for n in sorted(nodes, key=lambda n: (depth[n], n))]
+
+    def get_consolidated_plan(self, skill_ids):
+        """Same as SkillGraph.get_consolidated_plan."""
+        members = {}
+        for skill_id in skill_ids:
+            start = self._node(skill_id)
+            nodes = self._reachable(self._requires, start)
+            nodes.add(start)
+            members[skill_id] = nodes
+        depth, ids = self._depth, self._ids
+        order = sorted(set().union(*members.values()), key=lambda n: (depth[n], n))
+        membership = {
+            skill_id: [ids[n] for n in order if n in nodes]
+            for skill_id, nodes in members.items()
+        }
+        return [ids[n] for n in order], membership
+
+    def get_learning_schedule(self, skill_id, skip=None):
+        """Same as SkillGraph.get_learning_schedule; the stored depths give
+        the topological order."""
+        start = self._node(skill_id)
+        nodes = self._reachable(self._requires, start)
+        nodes.add(start)
+        depth, ids = self._depth, self._ids
+        nodes = sorted(nodes, key=lambda n: (depth[n], n))
+        if skip is not None:
+            nodes = [n for n in nodes if not skip(ids[n])]
+        durations = self._duration
+
+        def duration(node):
+            minutes = durations[node]
+            return DEFAULT_DURATION_MINUTES if minutes < 0 else minutes
+
+        return schedule(
+            nodes,
+            lambda node: self._neighbors(self._requires, node),
+            duration,
+            ids.__getitem__,
+        )
+
+    def get_learning_path(self, start_skill_id, target_skill_id):
+        """Shortest prerequisite chain from start to target, inclusive."""
+        start = self._node(start_skill_id)
+        target = self._node(target_skill_id)
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                path = []
+                while current is not None:
+                    path.append(self._ids[current])
+                    current = parent[current]
+                return path[::-1]
+            for neighbor in self._neighbors(self._unlocks, current):
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+        return []
+
+    def to_skill_graph(self):
+        """A private, mutable SkillGraph holding the same skills and edges."""
+        graph = SkillGraph()
+        for skill_id, minutes in zip(self._ids, self._duration):
+            graph.add_skill(
+                Skill(skill_id, skill_id, duration_minutes=None if minutes < 0 else minutes)
+            )
+        # Interned indices match the file's node numbers, so the packed CSR
+        # arrays can be copied in directly.
+        for adjacency, (offsets, targets) in (
+            (graph._requires, self._requires),
+            (graph._unlocks, self._unlocks),
+        ):
+            adjacency.offsets = array("i")
+            adjacency.offsets.frombytes(offsets.tobytes())
+            adjacency.targets = array("i")
+            adjacency.targets.frombytes(targets.tobytes())
+        return graph
@@ -0,0 +1,321 @@
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Label distance left between consecutive entries by a full build, so later
+# insertions usually find room without relabelling anything.
+_GAP = 1 << 20
+# Room given to a skill inserted under an existing category.
+_INSERT_SPAN = 1 << 10
+
+
+def _merge(intervals):
+    """Sorts and merges overlapping (low, high) label intervals."""
+    merged = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1]:
+            if high > merged[-1][1]:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+
+class HierarchyIndex:
+    """Interval labelling of a SkillGraph's IS_A_TYPE_OF hierarchy.
+
+    A depth-first walk gives every skill a ``(pre, post)`` label pair, and
+    everything below a category in the walk's spanning tree gets a ``pre``
+    label inside the category's interval, so "is X a type of C?" is one
+    integer comparison. Skills with several parents are labelled under the
+    first one; every other ancestor also keeps the extra intervals it
+    reaches through such skills, so membership stays exact for a DAG.
+
+    Labels are spaced out so that new skills and relationships can usually
+    be labelled in place; when there is no room left (or an edge would move
+    a subtree that is shared), the labels are rebuilt on next use.
+
+    A hierarchy with a cycle has no such labelling: ``acyclic`` is then False
+    and queries fall back to walking the graph.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+        self.build()
+
+    # --- Construction ---
+
+    def build(self):
+        started = time.perf_counter()
+        graph = self._graph
+        parents, children = graph._is_a_type_of, graph._contains_types
+        num_nodes = len(graph._ids)
+
+        pre = array("q", [0]) * num_nodes
+        post = array("q", [0]) * num_nodes
+        tree_parent = array("i", [-1]) * num_nodes
+        extra = {}
+        visited = bytearray(num_nodes)
+        label = 0
+        acyclic = True
+
+        roots = [node for node in range(num_nodes) if not parents.neighbors(node)]
+        # Skills on an IS_A cycle have no root; they are walked last.
+        for start in roots + list(range(num_nodes)):
+            if visited[start]:
+                continue
+            visited[start] = 1
+            label += _GAP
+            pre[start] = label
+            stack = [(start, iter(children.neighbors(start)))]
+            while stack:
+                node, pending = stack[-1]
+                for child in pending:
+                    if visited[child] and not post[child]:
+                        acyclic = False  # Still being walked: a cycle.
+                    elif not visited[child]:
+                        visited[child] = 1
+                        tree_parent[child] = node
+                        label += _GAP
+                        pre[child] = label
+                        stack.append((child, iter(children.neighbors(child))))
+                        break
+                else:
+                    stack.pop()
+                    label += _GAP
+                    post[node] = label
+                    self._collect_extra(node, children, pre, post, tree_parent, extra)
+
+        self._pre, self._post = pre, post
+        self._tree_parent = tree_parent
+        self._extra = extra
+        self._max_label = label
+        self._sort_labels()
+        self.acyclic = acyclic
+        self.stale = False
+        self.build_seconds = time.perf_counter() - started
+
+    @staticmethod
+    def _collect_extra(node, children, pre, post, tree_parent, extra):
+        """Intervals below ``node`` outside its own, from its finished children."""
+        intervals = []
+        for child in children.neighbors(node):
+            if tree_parent[child] != node:
+                if post[child] == 0:
+                    continue  # Closes a cycle.
+                intervals.append((pre[child], post[child]))
+            intervals.extend(extra.get(child, ()))
+        low, high = pre[node], post[node]
+        intervals = [i for i in _merge(intervals) if not (low <= i[0] and i[1] <= high)]
+        if intervals:
+            extra[node] = intervals
+
+    def _sort_labels(self):
+        pre = self._pre
+        order = sorted(range(len(pre)), key=pre.__getitem__)
+        self._labels = array("q", [pre[node] for node in order])
+        self._nodes = array("i", order)
+        self._labels_dirty = False
+
+    def _sorted(self):
+        if self._labels_dirty:
+            self._sort_labels()
+        return self._labels, self._nodes
+
+    # --- Queries ---
+
+    def intervals(self, category):
+        """The disjoint label intervals covering ``category`` and everything
+        below it."""
+        own = (self._pre[category], self._post[category])
+        extra = self._extra.get(category)
+        return _merge([own] + extra) if extra else [own]
+
+    def _below(self, category):
+        return self._graph._reachable(self._graph._contains_types, category)
+
+    def contains(self, category, skill):
+        """True if ``skill`` is ``category`` or a (transitive) type of it."""
+        if not self.acyclic:
+            return skill == category or skill in self._below(category)
+        label = self._pre[skill]
+        if self._pre[category] <= label <= self._post[category]:
+            return True
+        extra = self._extra.get(category)
+        if not extra:
+            return False
+        position = bisect_right(extra, (label, float("inf"))) - 1
+        return position >= 0 and extra[position][1] >= label
+
+    def descendants(self, category):
+        """Every skill below ``category``, excluding the category itself."""
+        if not self.acyclic:
+            return list(self._below(category))
+        labels, nodes = self._sorted()
+        found = []
+        for low, high in self.intervals(category):
+            found.extend(nodes[bisect_left(labels, low) : bisect_right(labels, high)])
+        found.remove(category)
+        return found
+
+    def roll_up(self, levels):
+        """Aggregates per-skill mastery ``levels`` (node -> level) onto every
+        category, using only the leaf skills below it.
+
+        One pass builds prefix sums over the skills in label order; each
+        category then reads its totals from the ends of its intervals.
+        Returns node -> (leaf skills, leaf skills with a level > 0, mean level).
+        """
+        graph = self._graph
+        children = graph._contains_types
+        if not self.acyclic:
+            rolled = {}
+            for node in range(len(graph._ids)):
+                if children.neighbors(node):
+                    below = [n for n in self._below(node) if not children.neighbors(n)]
+                    values = [levels.get(n, 0) for n in below]
+                    mean = sum(values) / len(values) if values else 0.0
+                    rolled[node] = (len(values), sum(v > 0 for v in values), mean)
+            return rolled
+
+        labels, nodes = self._sorted()
+        leaves = [0]
+        mastered = [0]
+        total = [0.0]
+        for node in nodes:
+            is_leaf = graph._ids[node] is not None and not children.neighbors(node)
+            level = levels.get(node, 0) if is_leaf else 0
+            leaves.append(leaves[-1] + is_leaf)
+            mastered.append(mastered[-1] + (level > 0))
+            total.append(total[-1] + level)
+
+        rolled = {}
+        for node in nodes:
+            if not children.neighbors(node):
+                continue
+            count = held = 0
+            level_sum = 0.0
+            for low, high in self.intervals(node):
+                start, end = bisect_left(labels, low), bisect_right(labels, high)
+                count += leaves[end] - leaves[start]
+                held += mastered[end] - mastered[start]
+                level_sum += total[end] - total[start]
+            rolled[node] = (count, held, level_sum / count if count else 0.0)
+        return rolled
+
+    # --- Incremental maintenance (called by SkillGraph) ---
+
+    def skill_added(self, node):
+        """A new skill starts as a root after every existing label."""
+        if self.stale:
+            return
+        label = self._max_label + _GAP
+        self._max_label = label + _GAP
+        self._pre.append(label)
+        self._post.append(label + _GAP)
+        self._tree_parent.append(-1)
+        if not self._labels_dirty:
+            self._labels.append(label)
+            self._nodes.append(node)
+
+    def isa_added(self, child, parent):
+        """``child`` has just become a direct type of ``parent``."""
+        if self.stale:
+            return
+        if not self.acyclic or child == parent or self.contains(child, parent):
+            self.stale = True  # Rebuilt on next use, which detects the cycle.
+            return
+        if self.contains(parent, child):
+            return  # Already below it through another path.
+
+        if self._tree_parent[child] == -1 and self._attach(child, parent):
+            covered = self._extra.get(child, [])
+        else:
+            # Record the child's intervals as extra ones above ``parent``.
+            covered = self.intervals(child)
+        if covered:
+            for ancestor in self._ancestors(parent):
+                low, high = self._pre[ancestor], self._post[ancestor]
+                outside = [i for i in covered if not (low <= i[0] and i[1] <= high)]
+                if outside:
+                    self._extra[ancestor] = _merge(self._extra.get(ancestor, []) + outside)
+
+    def _ancestors(self, node):
+        """``node`` and every category above it."""
+        parents = self._graph._is_a_type_of
+        seen = {node}
+        stack = [node]
+        while stack:
+            for parent in parents.neighbors(stack.pop()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return seen
+
+    def _attach(self, child, parent):
+        """Relabels the root subtree of ``child`` into the free space at the
+        end of ``parent``'s interval. Returns False if that is not possible,
+        after which the index rebuilds on next use."""
+        graph = self._graph
+        children, parents = graph._contains_types, graph._is_a_type_of
+        pre, post, tree_parent = self._pre, self._post, self._tree_parent
+
+        subtree = [child]
+        for node in subtree:
+            for below in children.neighbors(node):
+                if tree_parent[below] == node:
+                    subtree.append(below)
+        # Another category holds intervals that point into this subtree.
+        if any(len(parents.neighbors(node)) > 1 for node in subtree):
+            self.stale = True
+            return False
+
+        # Free space: after the last labelled thing inside ``parent``.
+        low = pre[parent]
+        for sibling in children.neighbors(parent):
+            if sibling != child and tree_parent[sibling] == parent and post[sibling] > low:
+                low = post[sibling]
+        high = post[parent]
+        step = min(_INSERT_SPAN, (high - low) // (2 * len(subtree) + 1))
+        if step < 1:
+            self.stale = True
+            return False
+
+        # Relabel the subtree depth-first with ``step`` between labels.
+        old_label = pre[child]
+        label = low + step
+        pre[child] = label
+        stack = [(child, iter(children.neighbors(child)))]
+        while stack:
+            node, pending = stack[-1]
+            for below in pending:
+                if tree_parent[below] == node:
+                    label += step
+                    pre[below] = label
+                    stack.append((below, iter(children.neighbors(below))))
+                    break
+            else:
+                stack.pop()
+                label += step
+                post[node] = label
+        tree_parent[child] = parent
+
+        if len(subtree) > 1:
+            self._labels_dirty = True  # Re-sorted on next use.
+        elif not self._labels_dirty:
+            labels, nodes = self._labels, self._nodes
+            position = bisect_left(labels, old_label)
+            del labels[position], nodes[position]
+            position = bisect_left(labels, pre[child])
+            labels.insert(position, pre[child])
+            nodes.insert(position, child)
+        return True
+
+    # --- Reporting ---
+
+    def stats(self):
+        return {
+            "skills": len(self._pre),
+            "extra_intervals": sum(len(i) for i in self._extra.values()),
+            "build_seconds": round(self.build_seconds, 6),
+        }
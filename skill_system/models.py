@@ -1,63 +1,559 @@
+from array import array
+from collections import deque
+
+from .hierarchy import HierarchyIndex
+from .planner import DEFAULT_DURATION_MINUTES, schedule
+from .reachability import ReachabilityIndex
+from .topo_order import TopologicalOrder
+
+# Once this many edge updates have accumulated outside the CSR arrays (or an
+# eighth of the stored nodes plus edges, whichever is larger), they are folded
+# back in, which keeps the amortized cost of an update constant.
+_COMPACT_MIN_PENDING = 4096
+
+
+class _Adjacency:
+    """One direction of one relationship type, stored in CSR form.
+
+    ``targets[offsets[i]:offsets[i + 1]]`` holds the neighbors of node ``i``.
+    Edges added or removed since the last compaction live in a small overlay
+    so single-edge updates cost O(degree); the overlay is folded back into the
+    packed arrays once it grows large.
+    """
+
+    __slots__ = ("offsets", "targets", "_added", "_removed", "_pending")
+
+    def __init__(self):
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self._added = {}  # node -> neighbors added since the last compaction
+        self._removed = set()  # (node, neighbor) pairs hidden from the arrays
+        self._pending = 0
+
+    def __len__(self):
+        return len(self.targets) - len(self._removed) + sum(
+            len(extra) for extra in self._added.values()
+        )
+
+    def _packed(self, node):
+        offsets = self.offsets
+        if node + 1 < len(offsets):
+            return self.targets[offsets[node] : offsets[node + 1]]
+        return ()
+
+    def neighbors(self, node):
+        """Returns the neighbors of ``node`` as a sequence of integer indices."""
+        row = self._packed(node)
+        if self._removed:
+            row = [n for n in row if (node, n) not in self._removed]
+        extra = self._added.get(node)
+        if extra:
+            return list(row) + extra
+        return row
+
+    def add(self, node, neighbor):
+        """Adds an edge; returns False if it was already present."""
+        if self._removed and (node, neighbor) in self._removed:
+            self._removed.discard((node, neighbor))
+            return True
+        extra = self._added.get(node)
+        if (extra and neighbor in extra) or neighbor in self._packed(node):
+            return False
+        if extra is None:
+            self._added[node] = extra = []
+        extra.append(neighbor)
+        self._pending += 1
+        return True
+
+    def remove(self, node, neighbor):
+        """Removes an edge; returns False if it was not present."""
+        extra = self._added.get(node)
+        if extra and neighbor in extra:
+            extra.remove(neighbor)
+            if not extra:
+                del self._added[node]
+            return True
+        if (node, neighbor) in self._removed or neighbor not in self._packed(node):
+            return False
+        self._removed.add((node, neighbor))
+        self._pending += 1
+        return True
+
+    def needs_compaction(self, num_nodes):
+        size = num_nodes + len(self.targets)
+        return self._pending > max(_COMPACT_MIN_PENDING, size >> 3)
+
+    def compact(self, num_nodes):
+        """Rewrites the CSR arrays so they include every pending update.
+
+        Runs of untouched rows are copied slice-wise, so the cost is dominated
+        by the number of rows that actually changed.
+        """
+        old_offsets, old_targets = self.offsets, self.targets
+        packed_nodes = len(old_offsets) - 1
+        dirty = {node for node, _ in self._removed}
+        dirty.update(self._added)
+
+        offsets = array("i", [0])
+        targets = array("i")
+        start = 0  # First row not yet written
+        for node in sorted(dirty) + [num_nodes]:
+            end = min(node, packed_nodes)
+            if start < end:
+                shift = len(targets) - old_offsets[start]
+                targets.extend(old_targets[old_offsets[start] : old_offsets[end]])
+                offsets.extend([o + shift for o in old_offsets[start + 1 : end + 1]])
+            # Rows past the old arrays that have no pending edges are empty.
+            missing = node - (len(offsets) - 1)
+            if missing > 0:
+                offsets.extend([len(targets)] * missing)
+            if node < num_nodes:
+                targets.extend(self.neighbors(node))
+                offsets.append(len(targets))
+            start = node + 1
+
+        self.offsets = offsets
+        self.targets = targets
+        self._added = {}
+        self._removed = set()
+        self._pending = 0
+
+    def nbytes(self):
+        """Approximate memory used by the packed arrays."""
+        return (
+            self.offsets.itemsize * len(self.offsets)
+            + self.targets.itemsize * len(self.targets)
+        )
+
+
 class Skill:
     """Represents a single skill node in the graph."""
 
+    __slots__ = (
+        "skill_id",
+        "name",
+        "description",
+        "is_abstract",
+        "duration_minutes",
+        "_graph",
+    )
+
     def __init__(
-        self, skill_id: str, name: str, description: str = "", is_abstract: bool = False
+        self,
+        skill_id: str,
+        name: str,
+        description: str = "",
+        is_abstract: bool = False,
+        duration_minutes: int = None,
     ):
         self.skill_id = skill_id
         self.name = name
         self.description = description
         self.is_abstract = is_abstract
+        self.duration_minutes = duration_minutes  # Estimated time to learn, if known
+        self._graph = None  # Set by SkillGraph.add_skill
+
+    # --- Relationship Attributes ---
+    # These are read-only views over the owning SkillGraph's adjacency store.
+    # A skill that has not been added to a graph has no relationships.
 
-        # --- Relationship Attributes ---
-        # What skills are needed BEFORE this one?
-        self.requires = set()  # Set of skill_ids
+    def _related(self, relation):
+        if self._graph is None:
+            return frozenset()
+        return self._graph._related_ids(relation, self.skill_id)
 
-        # What skills does this one UNLOCK? (inverse of requires)
-        self.unlocks = set()  # Set of skill_ids
+    @property
+    def requires(self):
+        """What skills are needed BEFORE this one? (skill_ids)"""
+        return self._related("_requires")
 
-        # What broader category does this skill fall into?
-        self.is_a_type_of = set()  # Set of parent skill_ids
+    @property
+    def unlocks(self):
+        """What skills does this one UNLOCK? (inverse of requires)"""
+        return self._related("_unlocks")
 
-        # What specific skills are examples of this one?
-        self.contains_types = set()  # Set of child skill_ids
+    @property
+    def is_a_type_of(self):
+        """What broader category does this skill fall into? (parent skill_ids)"""
+        return self._related("_is_a_type_of")
+
+    @property
+    def contains_types(self):
+        """What specific skills are examples of this one? (child skill_ids)"""
+        return self._related("_contains_types")
 
     def __repr__(self):
         return f"Skill(id='{self.skill_id}', name='{self.name}'"
 
 
 class SkillGraph:
-    """Manages the collection of Skill objects and their relationships."""
+    """Manages the collection of Skill objects and their relationships.
+
+    Skill ids are interned to consecutive integers and every relationship is
+    kept as a pair of CSR adjacency stores (one per direction), so traversals
+    walk packed integer arrays instead of per-node Python sets.
+    """
 
     def __init__(self):
         self.skills = {}  # Maps skill_id -> Skill object
+        self._index = {}  # Maps skill_id -> interned integer index
+        self._ids = []  # Maps interned integer index -> skill_id
+
+        self._requires = _Adjacency()  # skill -> its direct prerequisites
+        self._unlocks = _Adjacency()  # skill -> skills it is a prerequisite for
+        self._is_a_type_of = _Adjacency()  # skill -> parent categories
+        self._contains_types = _Adjacency()  # category -> child skills
+
+        self._order = None  # Topological order, built on first use
+        self._reachability = None  # Built on first use, then kept up to date
+        self._hierarchy = None  # IS_A_TYPE_OF intervals, likewise
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill_id):
+        return skill_id in self._index
+
+    # --- Internal helpers ---
+
+    def _relations(self):
+        return (
+            self._requires,
+            self._unlocks,
+            self._is_a_type_of,
+            self._contains_types,
+        )
+
+    def _maybe_compact(self, adjacency):
+        if adjacency.needs_compaction(len(self._ids)):
+            adjacency.compact(len(self._ids))
+
+    def _related_ids(self, relation, skill_id):
+        index = self._index.get(skill_id)
+        if index is None:
+            return frozenset()
+        ids = self._ids
+        return frozenset(ids[n] for n in getattr(self, relation).neighbors(index))
+
+    def _link(self, forward, reverse, source, target):
+        """Adds an edge in both directions; returns False if it already existed."""
+        if not forward.add(source, target):
+            return False
+        reverse.add(target, source)
+        self._maybe_compact(forward)
+        self._maybe_compact(reverse)
+        return True
+
+    def _reachable(self, adjacency, start):
+        """Iterative DFS over ``adjacency``; returns the visited indices, excluding ``start``."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbor in adjacency.neighbors(stack.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        seen.discard(start)
+        return seen
+
+    # --- Mutations ---
 
     def add_skill(self, skill: Skill):
         """Adds a Skill object to the graph."""
         if skill.skill_id not in self.skills:
             self.skills[skill.skill_id] = skill
+            self._index[skill.skill_id] = len(self._ids)
+            self._ids.append(skill.skill_id)
+            skill._graph = self
+            if self._order is not None:
+                self._order.skill_added(len(self._ids) - 1)
+            if self._reachability is not None:
+                self._reachability.skill_added(len(self._ids) - 1)
+            if self._hierarchy is not None:
+                self._hierarchy.skill_added(len(self._ids) - 1)
 
     def add_dependency(self, source_skill_id, target_skill_id):
-        """This is for the REQUIRES relationship.
-        It finds the source_skill and target_skill objects and updates their .unlocks and .requires sets.
-        For example: self.skills[target_skill_id].requires.add(source_skill_id)"""
-        self.skills[target_skill_id].requires.add(source_skill_id)
-        self.skills[source_skill_id].unlocks.add(target_skill_id)
+        """This is for the REQUIRES relationship: ``source_skill_id`` must be
+        learned before ``target_skill_id``. Raises KeyError for unknown skills.
+
+        The edge is added even if it closes a cycle, so the graph can mirror
+        existing data; use ``find_cycle`` first to keep it acyclic."""
+        source = self._index[source_skill_id]
+        target = self._index[target_skill_id]
+        if self._link(self._requires, self._unlocks, target, source):
+            if self._order is not None:
+                self._order.dependency_added(source, target)
+            if self._reachability is not None:
+                self._reachability.dependency_added(source, target)
 
     def add_isa_relationship(self, child_skill_id, parent_skill_id):
-        """Similar to above, but for the IS_A_TYPE_OF relationship,
-        updating .is_a_type_of and .contains_types"""
-        self.skills[child_skill_id].is_a_type_of.add(parent_skill_id)
-        self.skills[parent_skill_id].contains_types.add(child_skill_id)
+        """Records that ``child_skill_id`` IS_A_TYPE_OF ``parent_skill_id``.
+        Raises KeyError for unknown skills."""
+        child = self._index[child_skill_id]
+        parent = self._index[parent_skill_id]
+        if self._link(self._is_a_type_of, self._contains_types, child, parent):
+            if self._hierarchy is not None:
+                self._hierarchy.isa_added(child, parent)
+
+    def remove_dependency(self, source_skill_id, target_skill_id):
+        """Removes a REQUIRES relationship; returns False if it did not exist."""
+        source = self._index[source_skill_id]
+        target = self._index[target_skill_id]
+        if not self._requires.remove(target, source):
+            return False
+        self._unlocks.remove(source, target)
+        self._maybe_compact(self._requires)
+        self._maybe_compact(self._unlocks)
+        if self._order is not None:
+            self._order.dependency_removed(source, target)
+        if self._reachability is not None:
+            self._reachability.dependency_removed(source, target)
+        return True
+
+    def remove_skill(self, skill_id):
+        """Removes a skill and every relationship that touches it.
+
+        The interned index is retired rather than reused, so indices held by
+        callers never silently point at a different skill.
+        """
+        index = self._index.pop(skill_id)
+        skill = self.skills.pop(skill_id)
+        skill._graph = None
+        for forward, reverse in (
+            (self._requires, self._unlocks),
+            (self._unlocks, self._requires),
+            (self._is_a_type_of, self._contains_types),
+            (self._contains_types, self._is_a_type_of),
+        ):
+            for neighbor in list(forward.neighbors(index)):
+                forward.remove(index, neighbor)
+                reverse.remove(neighbor, index)
+        self._ids[index] = None
+        for adjacency in self._relations():
+            self._maybe_compact(adjacency)
+        if self._order is not None and not self._order.acyclic:
+            self._order.stale = True  # The skill may have been on a cycle.
+        self._reachability = None  # Rebuilt on next use
+        self._hierarchy = None
+
+    def rename_skill(self, old_skill_id, new_skill_id):
+        """Re-keys a skill without touching its relationships."""
+        if new_skill_id in self._index:
+            raise KeyError(f"Skill '{new_skill_id}' already exists")
+        index = self._index.pop(old_skill_id)
+        skill = self.skills.pop(old_skill_id)
+        skill.skill_id = new_skill_id
+        self.skills[new_skill_id] = skill
+        self._index[new_skill_id] = index
+        self._ids[index] = new_skill_id
+
+    def compact(self):
+        """Folds all pending edge updates into the packed CSR arrays."""
+        for adjacency in self._relations():
+            adjacency.compact(len(self._ids))
+
+    def nbytes(self):
+        """Approximate memory used by the packed adjacency arrays."""
+        return sum(adjacency.nbytes() for adjacency in self._relations())
+
+    # --- Traversals ---
+
+    @property
+    def order(self):
+        """The topological order of the REQUIRES relationship, built on first
+        access and rebuilt after a change it cannot follow incrementally."""
+        if self._order is None or self._order.stale:
+            self._order = TopologicalOrder(self)
+        return self._order
+
+    def find_cycle(self, source_skill_id, target_skill_id):
+        """The dependency cycle that ``add_dependency(source_skill_id,
+        target_skill_id)`` would create, or None if the edge is safe.
+
+        The cycle is returned as skill ids starting and ending at the target,
+        each requiring the next. Only skills positioned between the two in
+        the topological order are searched.
+        """
+        cycle = self.order.find_cycle(
+            self._index[source_skill_id], self._index[target_skill_id]
+        )
+        if cycle is None:
+            return None
+        return [self._ids[n] for n in cycle]
+
+    @property
+    def reachability(self):
+        """The transitive-closure index, built on first access."""
+        if self._reachability is None:
+            self._reachability = ReachabilityIndex(self)
+        return self._reachability
+
+    def is_prerequisite(self, prerequisite_skill_id, skill_id):
+        """True if the first skill is a direct or indirect prerequisite of the
+        second, answered from the reachability index."""
+        return self.reachability.is_prerequisite(
+            self._index[prerequisite_skill_id], self._index[skill_id]
+        )
 
     def get_prerequisites(self, skill_id):
-        """Performs a graph traversal (DFS is natural here) backwards from a skill
-        along the REQUIRES edges to find all direct and indirect prerequisite skills."""
+        """Returns the ids of all direct and indirect prerequisites of a skill,
+        found by a DFS backwards along the REQUIRES edges."""
+        ids = self._ids
+        return {ids[n] for n in self._reachable(self._requires, self._index[skill_id])}
 
     def get_skills_unlocked_by(self, skill_id):
-        """Performs a forward traversal (BFS or DFS) along the unlocks edges
-        to find all skills that a given skill is a prerequisite for."""
+        """Returns the ids of all skills that a given skill is a (direct or
+        indirect) prerequisite for, found by a DFS along the unlocks edges."""
+        ids = self._ids
+        return {ids[n] for n in self._reachable(self._unlocks, self._index[skill_id])}
+
+    @property
+    def hierarchy(self):
+        """The IS_A_TYPE_OF interval index, built on first access and rebuilt
+        after a change it cannot follow incrementally."""
+        if self._hierarchy is None or self._hierarchy.stale:
+            self._hierarchy = HierarchyIndex(self)
+        return self._hierarchy
+
+    def is_type_of(self, skill_id, category_id):
+        """True if ``skill_id`` falls (directly or indirectly) under the
+        category ``category_id``; one interval comparison in the common case."""
+        if skill_id == category_id:
+            return False
+        return self.hierarchy.contains(self._index[category_id], self._index[skill_id])
+
+    def get_types_under(self, category_id):
+        """Returns the ids of every skill below a category in the hierarchy."""
+        ids = self._ids
+        return {ids[n] for n in self.hierarchy.descendants(self._index[category_id])}
+
+    def roll_up_mastery(self, levels):
+        """Rolls per-skill mastery up the IS_A_TYPE_OF hierarchy.
+
+        ``levels`` maps skill ids to a mastery level (missing skills count as
+        0). Every category gets the number of leaf skills below it, how many
+        of them have a level above 0, and their mean level.
+        """
+        index = self._index
+        rolled = self.hierarchy.roll_up(
+            {index[skill_id]: level for skill_id, level in levels.items() if skill_id in index}
+        )
+        ids = self._ids
+        return {
+            ids[node]: {"skills": count, "mastered": held, "mastery": mean}
+            for node, (count, held, mean) in rolled.items()
+        }
+
+    def _depths(self, starts):
+        """Longest REQUIRES chain from each node reachable from ``starts`` down
+        to a skill with no prerequisites (which has depth 0).
+
+        Edges that close a cycle are ignored so malformed data cannot loop.
+        """
+        depth = {}
+        for start in starts:
+            if start not in depth:
+                self._depths_from(start, depth)
+        return depth
+
+    def _depths_from(self, start, depth):
+        requires = self._requires
+        on_path = {start}
+        stack = [(start, iter(requires.neighbors(start)))]
+        while stack:
+            node, pending = stack[-1]
+            for prereq in pending:
+                if prereq not in depth and prereq not in on_path:
+                    on_path.add(prereq)
+                    stack.append((prereq, iter(requires.neighbors(prereq))))
+                    break
+            else:
+                stack.pop()
+                on_path.discard(node)
+                depth[node] = max(
+                    (depth[p] + 1 for p in requires.neighbors(node) if p in depth),
+                    default=0,
+                )
+
+    def get_consolidated_path(self, skill_id):
+        """Returns the skill and all of its prerequisites as one ordered list,
+        most fundamental first.
+
+        Skills are ordered by depth (their longest prerequisite chain), so every
+        skill appears after everything it requires; ties are broken by id.
+        """
+        depth = self._depths([self._index[skill_id]])
+        ids = self._ids
+        return [ids[n] for n in sorted(depth, key=lambda n: (depth[n], ids[n]))]
+
+    def get_consolidated_plan(self, skill_ids):
+        """Merges the consolidated paths of several skills into one plan.
+
+        Shared prerequisites are visited once. Returns ``(plan, membership)``:
+        the deduplicated skill ids, most fundamental first, and for each
+        requested skill the plan entries (in plan order) on its own path.
+        """
+        starts = [self._index[skill_id] for skill_id in skill_ids]
+        depth = self._depths(starts)
+        ids = self._ids
+        order = sorted(depth, key=lambda n: (depth[n], ids[n]))
+        reachability = self.reachability
+        membership = {}
+        for skill_id, start in zip(skill_ids, starts):
+            members = set(reachability.prerequisites(start))
+            members.add(start)
+            membership[skill_id] = [ids[n] for n in order if n in members]
+        return [ids[n] for n in order], membership
+
+    def get_learning_schedule(self, skill_id, skip=None):
+        """Schedules the skill and its prerequisites by learning time.
+
+        Skills for which ``skip(skill_id)`` is true are treated as already
+        learned. Skills without a ``duration_minutes`` estimate count as
+        DEFAULT_DURATION_MINUTES. Returns a LearningSchedule.
+        """
+        start = self._index[skill_id]
+        order = self.order
+        position = order.position
+        nodes = list(self.reachability.prerequisites(start))
+        nodes.append(start)
+        if not order.acyclic:
+            # Positions past the ranked ones are not topological; use depths.
+            depth = self._depths([start])
+            nodes.sort(key=lambda n: (depth[n], n))
+        else:
+            nodes.sort(key=position.__getitem__)
+        ids, skills = self._ids, self.skills
+        if skip is not None:
+            nodes = [n for n in nodes if not skip(ids[n])]
+
+        def duration(node):
+            minutes = skills[ids[node]].duration_minutes
+            return DEFAULT_DURATION_MINUTES if minutes is None else minutes
+
+        return schedule(nodes, self._requires.neighbors, duration, ids.__getitem__)
 
     def get_learning_path(self, start_skill_id, target_skill_id):
-        """The crown jewel. Implements an algorithm like BFS to find
-        the shortest prerequisite path between two skills."""
+        """Finds the shortest prerequisite chain from ``start_skill_id`` to
+        ``target_skill_id`` with a BFS along the unlocks edges.
+
+        Returns the skill ids from start to target inclusive, or an empty list
+        if the target cannot be reached from the start.
+        """
+        start = self._index[start_skill_id]
+        target = self._index[target_skill_id]
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                path = []
+                while current is not None:
+                    path.append(self._ids[current])
+                    current = parent[current]
+                return path[::-1]
+            for neighbor in self._unlocks.neighbors(current):
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+        return []
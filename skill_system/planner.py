@@ -0,0 +1,105 @@
+"""Time-weighted learning schedules over a skill graph.
+
+Every skill takes some number of minutes to learn (``duration_minutes``,
+the same estimate a goal's sub-tasks carry). Learning the missing skills
+one after another always takes their total time; what the ordering decides
+is how soon each skill can be started. The schedule places every skill as
+early as its prerequisites allow, which also yields the critical path: the
+longest chain of prerequisites, and so the shortest possible time to the
+goal even when independent skills are learned in parallel.
+"""
+
+# Used for skills that have no duration estimate
+DEFAULT_DURATION_MINUTES = 60
+
+
+class ScheduledSkill:
+    """One skill in a LearningSchedule, with times in minutes from the start."""
+
+    __slots__ = ("skill_id", "duration_minutes", "earliest_start", "slack", "critical")
+
+    def __init__(self, skill_id, duration_minutes, earliest_start, slack):
+        self.skill_id = skill_id
+        self.duration_minutes = duration_minutes
+        self.earliest_start = earliest_start
+        # How long the skill can be postponed without delaying the goal
+        self.slack = slack
+        self.critical = slack == 0
+
+    def __repr__(self):
+        return (
+            f"ScheduledSkill(id='{self.skill_id}', start={self.earliest_start}, "
+            f"duration={self.duration_minutes}, slack={self.slack})"
+        )
+
+
+class LearningSchedule:
+    """The missing skills in learning order, plus the schedule's totals."""
+
+    def __init__(self, steps, critical_path):
+        self.steps = steps
+        self.critical_path = critical_path  # Skill ids, most fundamental first
+        self.total_minutes = sum(step.duration_minutes for step in steps)
+        self.critical_path_minutes = max(
+            (step.earliest_start + step.duration_minutes for step in steps), default=0
+        )
+
+
+def schedule(nodes, requires, duration, skill_id):
+    """Critical-path scheduling of ``nodes`` with one pass each way.
+
+    ``nodes`` must be in topological order (prerequisites first);
+    ``requires(node)`` gives a node's direct prerequisites (those outside
+    ``nodes`` are treated as already learned, and those placed after the
+    node, which only happens on a cycle, are ignored), ``duration(node)``
+    its minutes and ``skill_id(node)`` its id.
+
+    Steps are ordered by earliest start, then by slack, so the skills on the
+    critical path come first among those that could start together; the
+    remaining ties keep the order of ``nodes``.
+    """
+    # Work on positions within ``nodes`` so every table is a flat list.
+    position = {node: i for i, node in enumerate(nodes)}
+    minutes = [duration(node) for node in nodes]
+    start = [0] * len(nodes)
+    prerequisites = []
+    for i, node in enumerate(nodes):
+        inside = []
+        earliest = 0
+        for p in requires(node):
+            j = position.get(p, i)
+            if j < i:
+                inside.append(j)
+                finish = start[j] + minutes[j]
+                if finish > earliest:
+                    earliest = finish
+        prerequisites.append(inside)
+        start[i] = earliest
+
+    finish = [s + m for s, m in zip(start, minutes)]
+    finish_all = max(finish, default=0)
+    latest_finish = [finish_all] * len(nodes)
+    for i in range(len(nodes) - 1, -1, -1):
+        latest_start = latest_finish[i] - minutes[i]
+        for j in prerequisites[i]:
+            if latest_start < latest_finish[j]:
+                latest_finish[j] = latest_start
+    slack = [lf - f for lf, f in zip(latest_finish, finish)]
+
+    # Walk back from the skill that finishes last along prerequisites that
+    # finish exactly when their dependent can start.
+    critical_path = []
+    i = max(range(len(nodes)), key=finish.__getitem__, default=None)
+    while i is not None:
+        critical_path.append(skill_id(nodes[i]))
+        i = next(
+            (j for j in prerequisites[i] if finish[j] == start[i] and not slack[j]),
+            None,
+        )
+    critical_path.reverse()
+
+    steps = [
+        ScheduledSkill(skill_id(nodes[i]), minutes[i], start[i], slack[i])
+        for i in sorted(range(len(nodes)), key=lambda i: (start[i], slack[i], i))
+    ]
+    return LearningSchedule(steps, critical_path)
@@ -0,0 +1,139 @@
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+_EMPTY = array("i")  # Shared closure for skills without prerequisites; never mutated
+
+
+class ReachabilityIndex:
+    """Precomputed transitive closure of a SkillGraph's REQUIRES relationship.
+
+    Every skill keeps the sorted interned indices of all its direct and
+    indirect prerequisites. Together with the graph's topological order
+    (prerequisites sit at lower positions), "Is X a prerequisite of Y?" is
+    an O(1) position comparison that rejects most pairs, followed by an
+    O(log n) binary search.
+
+    The index works on interned integer indices; SkillGraph translates skill
+    ids and keeps the index up to date as dependencies change.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+        self.build()
+
+    # --- Construction ---
+
+    def build(self):
+        """(Re)computes every closure with one pass in topological order."""
+        started = time.perf_counter()
+        graph = self._graph
+        order = graph.order
+        closure = [_EMPTY] * len(graph._ids)
+        for node in order.nodes[: order.ranked]:
+            closure[node] = self._union_of_prerequisites(node, closure)
+
+        # Skills on or behind a cycle have no topological rank; their
+        # closures are found by plain traversal instead.
+        self.acyclic = order.acyclic
+        for node in order.nodes[order.ranked :]:
+            closure[node] = array("i", sorted(graph._reachable(graph._requires, node)))
+
+        self._closure = closure
+        self._stale = False
+        self.build_seconds = time.perf_counter() - started
+
+    def _union_of_prerequisites(self, node, closure):
+        prerequisites = self._graph._requires.neighbors(node)
+        if not prerequisites:
+            return _EMPTY
+        merged = set(prerequisites)
+        for prerequisite in prerequisites:
+            merged.update(closure[prerequisite])
+        return array("i", sorted(merged))
+
+    # --- Queries ---
+
+    def is_prerequisite(self, prerequisite, skill):
+        """True if ``prerequisite`` is a direct or indirect prerequisite of ``skill``."""
+        if self._stale:
+            self.build()
+        order = self._graph.order
+        position = order.position
+        if order.is_ranked(skill) and position[prerequisite] >= position[skill]:
+            return False
+        closure = self._closure[skill]
+        position = bisect_left(closure, prerequisite)
+        return position < len(closure) and closure[position] == prerequisite
+
+    def prerequisites(self, skill):
+        """The sorted indices of every prerequisite of ``skill``."""
+        if self._stale:
+            self.build()
+        return self._closure[skill]
+
+    # --- Incremental maintenance (called by SkillGraph) ---
+
+    def skill_added(self, node):
+        if not self._stale:
+            self._closure.append(_EMPTY)
+
+    def dependency_added(self, source, target):
+        """``source`` has just become a direct prerequisite of ``target``.
+        Called after the graph's topological order has been updated."""
+        if self._stale:
+            return
+        if not self.acyclic or not self._graph.order.acyclic:
+            # The edge closed a cycle; fall back to a full rebuild on next use.
+            self._stale = True
+            return
+        if self.is_prerequisite(source, target):
+            return  # Already implied; no closure changes.
+
+        addition = set(self._closure[source])
+        addition.add(source)
+        graph = self._graph
+        affected = graph._reachable(graph._unlocks, target)
+        affected.add(target)
+        closure = self._closure
+        for node in affected:
+            current = closure[node]
+            position = bisect_left(current, source)
+            if position < len(current) and current[position] == source:
+                continue  # Reached through another path already.
+            closure[node] = array("i", sorted(addition.union(current)))
+
+    def dependency_removed(self, source, target):
+        """``source`` is no longer a direct prerequisite of ``target``."""
+        if self._stale:
+            return
+        if not self.acyclic:
+            self._stale = True  # The removal may have broken the cycle.
+            return
+        graph = self._graph
+        affected = graph._reachable(graph._unlocks, target)
+        affected.add(target)
+        position = graph.order.position
+        # Removing an edge never invalidates a topological order, so affected
+        # closures can be recomputed from their prerequisites in that order.
+        for node in sorted(affected, key=position.__getitem__):
+            self._closure[node] = self._union_of_prerequisites(node, self._closure)
+
+    # --- Reporting ---
+
+    def nbytes(self):
+        """Approximate memory held by the index, including array headers."""
+        closures = sum(
+            sys.getsizeof(closure) for closure in self._closure if closure is not _EMPTY
+        )
+        return closures + sys.getsizeof(self._closure)
+
+    def stats(self):
+        return {
+            "skills": len(self._closure),
+            "closure_entries": sum(len(closure) for closure in self._closure),
+            "acyclic": self.acyclic,
+            "memory_bytes": self.nbytes(),
+            "build_seconds": round(self.build_seconds, 6),
+        }
@@ -0,0 +1,156 @@
+from array import array
+from collections import deque
+
+
+class TopologicalOrder:
+    """A topological order of a SkillGraph's REQUIRES relationship that is
+    kept up to date as dependencies are added (Pearce–Kelly).
+
+    Every skill has a distinct position, and prerequisites sit at lower
+    positions than the skills that need them. When a new edge contradicts the
+    order, only the skills positioned between its two ends are searched and
+    reshuffled, so the cost of an insertion is proportional to the affected
+    region rather than to the graph.
+
+    Graphs that already contain a cycle cannot be ordered: the skills that
+    are not on or behind a cycle are placed first (``ranked`` of them), the
+    rest after them, and ``acyclic`` is False.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+        self.build()
+
+    def build(self):
+        """(Re)computes the order from scratch with Kahn's algorithm."""
+        graph = self._graph
+        requires, unlocks = graph._requires, graph._unlocks
+        num_nodes = len(graph._ids)
+        remaining = [len(requires.neighbors(node)) for node in range(num_nodes)]
+        queue = deque(node for node in range(num_nodes) if not remaining[node])
+        nodes = []
+        while queue:
+            node = queue.popleft()
+            nodes.append(node)
+            for dependent in unlocks.neighbors(node):
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    queue.append(dependent)
+
+        self.ranked = len(nodes)
+        self.acyclic = self.ranked == num_nodes
+        if not self.acyclic:
+            nodes.extend(node for node in range(num_nodes) if remaining[node])
+        position = array("i", [0]) * num_nodes
+        for slot, node in enumerate(nodes):
+            position[node] = slot
+        self.position = position  # node -> position
+        self.nodes = nodes  # position -> node
+        self.stale = False
+
+    def is_ranked(self, node):
+        """True if ``node``'s position is a valid topological rank."""
+        return self.position[node] < self.ranked
+
+    # --- Cycle detection ---
+
+    def find_cycle(self, source, target):
+        """The cycle that a new edge "``source`` is a prerequisite of
+        ``target``" would close, or None if the edge is safe.
+
+        The cycle is returned as node indices starting and ending at
+        ``target``, each requiring the next.
+        """
+        if source == target:
+            return [target, target]
+        position = self.position
+        if self.acyclic and position[source] < position[target]:
+            return None  # Already in order; nothing to search.
+        bound = position[source] if self.acyclic else None
+        path = self._forward_path(target, source, bound)
+        if path is None:
+            return None
+        return [target] + path[::-1]
+
+    def _forward_path(self, start, goal, bound):
+        """Searches along the unlocks edges from ``start`` for ``goal``,
+        skipping nodes positioned at or after ``bound`` (unless ``bound`` is
+        None). Returns the path from start to goal inclusive, or None."""
+        unlocks = self._graph._unlocks
+        position = self.position
+        parent = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbor in unlocks.neighbors(node):
+                if neighbor in parent:
+                    continue
+                parent[neighbor] = node
+                if neighbor == goal:
+                    path = []
+                    while neighbor is not None:
+                        path.append(neighbor)
+                        neighbor = parent[neighbor]
+                    return path[::-1]
+                if bound is None or position[neighbor] < bound:
+                    stack.append(neighbor)
+        return None
+
+    # --- Incremental maintenance (called by SkillGraph) ---
+
+    def skill_added(self, node):
+        if self.stale:
+            return
+        self.position.append(len(self.nodes))
+        self.nodes.append(node)
+        if self.acyclic:
+            self.ranked += 1
+
+    def dependency_added(self, source, target):
+        """``source`` has just become a direct prerequisite of ``target``."""
+        if self.stale:
+            return
+        if not self.acyclic:
+            self.stale = True  # The unranked region may have changed.
+            return
+        position = self.position
+        lower, upper = position[target], position[source]
+        if lower > upper:
+            return  # Already in order.
+        if lower == upper:
+            self.stale = True  # A skill required by itself.
+            return
+
+        # Skills that need ``target`` and sit no later than ``source``...
+        forward = self._region(target, self._graph._unlocks, lambda p: p <= upper)
+        if source in forward:
+            self.stale = True  # The edge closed a cycle.
+            return
+        # ...and skills that ``source`` needs and sit after ``target``.
+        backward = self._region(source, self._graph._requires, lambda p: p > lower)
+
+        # Reuse the freed positions: the backward region first, then the
+        # forward region, each keeping its internal order.
+        moved = sorted(backward, key=position.__getitem__)
+        moved.extend(sorted(forward, key=position.__getitem__))
+        slots = sorted(position[node] for node in moved)
+        nodes = self.nodes
+        for node, slot in zip(moved, slots):
+            position[node] = slot
+            nodes[slot] = node
+
+    def _region(self, start, adjacency, within):
+        position = self.position
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbor in adjacency.neighbors(stack.pop()):
+                if neighbor not in seen and within(position[neighbor]):
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return seen
+
+    def dependency_removed(self, source, target):
+        # Removing an edge never invalidates an order, but it may break a cycle.
+        if not self.acyclic:
+            self.stale = True
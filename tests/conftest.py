@@ -45,6 +45,22 @@ def test_keys(tmp_path_factory):
         "issuer_id": "https://skillforge.io",
     }
 
+@pytest.fixture
+def async_driver(mocker):
+    """
+    Builds an AsyncDriver stand-in from a sync mock session: the async
+    session's execute_read/execute_write await the mock's, so a test sets up
+    and asserts on one session for both the sync and the async driver.
+    """
+    def build(session):
+        async_session = mocker.MagicMock()
+        async_session.execute_read = mocker.AsyncMock(side_effect=session.execute_read)
+        async_session.execute_write = mocker.AsyncMock(side_effect=session.execute_write)
+        driver = mocker.MagicMock()
+        driver.session.return_value.__aenter__.return_value = async_session
+        return driver
+    return build
+
 @pytest.fixture
 def clean_db_client():
     """
@@ -48,14 +48,14 @@ def test_issue_vc_for_accomplishment(monkeypatch, test_keys, clean_db_client):
     # So we patch it in api.routers.accomplishments
     monkeypatch.setattr("api.routers.accomplishments.skill_extractor_chain", mock_chain_instance)
 
-    # Mock the find_skill_match function where it's used in the router
+    # Mock the find_skill_matches function where it's used in the router
     from api.ai.schemas import SkillMatch # Corrected to SkillMatch
 
-    async def mock_find_skill_match(candidate_skill_name, existing_skill_names):
+    async def mock_find_skill_matches(candidate_skill_names, existing_skill_names):
         # For simplicity, assume no skills are duplicates for the test
-        return SkillMatch(is_duplicate=False, existing_skill_name=None)
+        return [SkillMatch(is_duplicate=False, existing_skill_name=None) for _ in candidate_skill_names]
 
-    monkeypatch.setattr("api.routers.accomplishments.find_skill_match", mock_find_skill_match)
+    monkeypatch.setattr("api.routers.accomplishments.find_skill_matches", mock_find_skill_matches)
 
     # STEP 1: Create the necessary data (user and accomplishment)
     unique_id = uuid.uuid4().hex[:8]  # Use a portion of a UUID for uniqueness
@@ -134,9 +134,9 @@ def test_process_accomplishment_with_quest_id(monkeypatch, clean_db_client, test
     mock_chain_instance.ainvoke = AsyncMock(return_value=mock_extracted_skills_response)
     monkeypatch.setattr("api.routers.accomplishments.skill_extractor_chain", mock_chain_instance)
 
-    async def mock_find_skill_match(candidate_skill_name, existing_skill_names):
-        return SkillMatch(is_duplicate=False, existing_skill_name=None)
-    monkeypatch.setattr("api.routers.accomplishments.find_skill_match", mock_find_skill_match)
+    async def mock_find_skill_matches(candidate_skill_names, existing_skill_names):
+        return [SkillMatch(is_duplicate=False, existing_skill_name=None) for _ in candidate_skill_names]
+    monkeypatch.setattr("api.routers.accomplishments.find_skill_matches", mock_find_skill_matches)
 
     # 1. Create User
     unique_id = uuid.uuid4().hex[:8]
@@ -167,7 +167,7 @@ def test_process_accomplishment_with_quest_id(monkeypatch, clean_db_client, test
         "quest_id": quest_id
     }
 
-    with patch("api.graph_crud.create_accomplishment") as mock_create_accomplishment_crud:
+    with patch("api.async_graph_crud.create_accomplishment_with_fulfilment", new_callable=AsyncMock) as mock_create_accomplishment_crud:
         mock_returned_node_data = {
             "id": uuid.uuid4(),
             "name": accomplishment_payload["name"],
@@ -183,13 +183,13 @@ def test_process_accomplishment_with_quest_id(monkeypatch, clean_db_client, test
         response_data = acc_response.json()
         assert response_data["accomplishment"]["name"] == accomplishment_payload["name"]
 
-        # Verify that graph_crud.create_accomplishment was called correctly.
+        # Verify that async_graph_crud.create_accomplishment_with_fulfilment was called correctly.
         mock_create_accomplishment_crud.assert_called_once()
         args, kwargs = mock_create_accomplishment_crud.call_args
 
         # Verify the user is identified from the token, not the payload.
-        # args[0] is the transaction (tx), args[1] is the user object.
-        assert args[1].email == user_email
+        # args[0] is the transaction (tx), args[1] is the user's email.
+        assert args[1] == user_email
 
         # Verify quest_id is passed as a kwarg.
         assert isinstance(kwargs.get("quest_id"), uuid.UUID)
@@ -224,9 +224,9 @@ def test_process_accomplishment_advances_goal(monkeypatch, clean_db_client, test
     mock_chain_instance.ainvoke = AsyncMock(return_value=mock_extracted_skills_response)
     monkeypatch.setattr("api.routers.accomplishments.skill_extractor_chain", mock_chain_instance)
 
-    async def mock_find_skill_match(candidate_skill_name, existing_skill_names):
-        return SkillMatch(is_duplicate=False, existing_skill_name=None)
-    monkeypatch.setattr("api.routers.accomplishments.find_skill_match", mock_find_skill_match)
+    async def mock_find_skill_matches(candidate_skill_names, existing_skill_names):
+        return [SkillMatch(is_duplicate=False, existing_skill_name=None) for _ in candidate_skill_names]
+    monkeypatch.setattr("api.routers.accomplishments.find_skill_matches", mock_find_skill_matches)
 
 
     # 1. Create User
@@ -262,7 +262,7 @@ def test_process_accomplishment_advances_goal(monkeypatch, clean_db_client, test
     }
 
     # 4. Patch `advance_goal` to verify it's called
-    with patch("api.graph_crud.advance_goal") as mock_advance_goal:
+    with patch("api.async_graph_crud.advance_goal", new_callable=AsyncMock) as mock_advance_goal:
         response = client.post("/accomplishments/process", json=accomplishment_payload, headers=auth_headers)
         assert response.status_code == 200
 
@@ -292,8 +292,8 @@ def test_process_accomplishment_for_non_existent_user(clean_db_client):
 
     # 1. Patch the entire `skill_extractor_chain` object, not a method on it.
     with patch("api.routers.accomplishments.skill_extractor_chain", new_callable=MagicMock) as mock_skill_extractor_chain, \
-         patch("api.routers.accomplishments.find_skill_match", new_callable=AsyncMock, return_value=SkillMatch(is_duplicate=False, existing_skill_name=None)), \
-         patch("api.graph_crud.user_exists") as mock_user_exists_crud:
+         patch("api.routers.accomplishments.find_skill_matches", new_callable=AsyncMock, return_value=[]), \
+         patch("api.async_graph_crud.user_exists", new_callable=AsyncMock) as mock_user_exists_crud:
 
         # 2. Configure the `.ainvoke()` method on the new mock object.
         mock_skill_extractor_chain.ainvoke = AsyncMock(return_value=ExtractedSkills(skills=[]))
@@ -0,0 +1,78 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi.testclient import TestClient
+
+from api import async_graph_crud
+from api.ai import skill_matcher
+from api.ai.schemas import CandidateSkillMatch, ExtractedSkills, SkillLevel, SkillMatches
+from api.database import get_async_graph_db_driver
+from api.main import create_app
+from api.routers.auth import get_current_user
+from api.schemas import User
+
+
+def test_duplicate_new_skills_in_one_accomplishment_are_created_once(mocker):
+    extractor = MagicMock()
+    extractor.ainvoke = AsyncMock(return_value=ExtractedSkills(skills=[
+        SkillLevel(skill="Docker", level="Intermediate"),
+        SkillLevel(skill="Docker Containerization", level="Advanced"),
+    ]))
+    mocker.patch("api.routers.accomplishments.skill_extractor_chain", extractor)
+    batch = MagicMock()
+    batch.ainvoke = AsyncMock(return_value=SkillMatches(matches=[
+        CandidateSkillMatch(candidate_skill="Docker", is_duplicate=False, existing_skill_name=None),
+        CandidateSkillMatch(
+            candidate_skill="Docker Containerization", is_duplicate=True, existing_skill_name="Docker"
+        ),
+    ]))
+    mocker.patch.object(skill_matcher, "skill_batch_matcher_chain", batch)
+    for name in ("graph_cache", "skill_snapshot", "skill_autocomplete"):
+        mocker.patch(f"api.routers.accomplishments.{name}")
+
+    accomplishment_id = str(uuid.uuid4())
+    mocker.patch.object(
+        async_graph_crud, "create_accomplishment_with_fulfilment", AsyncMock(return_value={
+            "id": accomplishment_id,
+            "name": "Shipped a service",
+            "description": "Containerized and shipped a service.",
+            "proof_url": None,
+            "timestamp": datetime.now(timezone.utc),
+        }),
+    )
+    create_skills = mocker.patch.object(
+        async_graph_crud, "create_skills_if_missing",
+        AsyncMock(side_effect=lambda tx, names: list(names)),
+    )
+    link_skills = mocker.patch.object(async_graph_crud, "link_accomplishment_to_skills", AsyncMock())
+
+    session = MagicMock()
+    reads = {async_graph_crud.user_exists: True, async_graph_crud.get_all_skills: ["Python"]}
+    session.execute_read = AsyncMock(side_effect=lambda func, *args: reads[func])
+
+    async def execute_write(func, *args):
+        return await func(MagicMock(), *args)
+
+    session.execute_write = AsyncMock(side_effect=execute_write)
+    driver = MagicMock()
+    driver.session.return_value.__aenter__.return_value = session
+
+    app = create_app()
+    app.dependency_overrides[get_async_graph_db_driver] = lambda: driver
+    app.dependency_overrides[get_current_user] = lambda: User(
+        email="ada@example.com", id=1, is_active=True
+    )
+
+    response = TestClient(app).post("/accomplishments/process", json={
+        "name": "Shipped a service",
+        "description": "Containerized and shipped a service.",
+    })
+
+    assert response.status_code == 200, response.text
+    assert batch.ainvoke.await_count == 1
+    assert create_skills.await_args.args[1] == ["Docker"]
+    assert link_skills.await_args.args[2] == [
+        ("Docker", "Intermediate"),
+        ("Docker", "Advanced"),
+    ]
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from api import async_graph_crud, graph_crud
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    async def single(self):
+        return self.records[0] if self.records else None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self.records:
+            yield record
+
+
+@pytest.fixture
+def mock_tx(mocker):
+    tx = mocker.MagicMock()
+    tx.run = mocker.AsyncMock(return_value=FakeResult([]))
+    return tx
+
+
+def test_runs_the_same_query_as_graph_crud(mock_tx):
+    mock_tx.run.return_value = FakeResult([{"name": "Pandas"}, {"name": "Python"}])
+
+    names = asyncio.run(async_graph_crud.get_all_skills(mock_tx))
+
+    assert names == ["Pandas", "Python"]
+    mock_tx.run.assert_awaited_once_with(graph_crud.GET_ALL_SKILLS_QUERY)
+
+
+def test_create_skills_if_missing_returns_created_names(mock_tx):
+    mock_tx.run.return_value = FakeResult(
+        [{"name": "Python", "created": False}, {"name": "Rust", "created": True}]
+    )
+
+    created = asyncio.run(
+        async_graph_crud.create_skills_if_missing(mock_tx, ["Python", "Rust", "Rust"])
+    )
+
+    assert created == ["Rust"]
+    assert mock_tx.run.call_args.kwargs["skill_names"] == ["Python", "Rust"]
+
+
+def test_recompute_skill_depths_follows_changed_dependents(mock_tx):
+    mock_tx.run.side_effect = [
+        FakeResult([{"name": "Pandas"}]),
+        FakeResult([]),
+    ]
+
+    asyncio.run(async_graph_crud.recompute_skill_depths(mock_tx, ["Python"]))
+
+    assert [call.kwargs["names"] for call in mock_tx.run.call_args_list] == [
+        ["Python"],
+        ["Pandas"],
+    ]
+
+
+def test_missing_goal_has_no_progress(mock_tx):
+    assert asyncio.run(
+        async_graph_crud.get_goal_progress(mock_tx, "goal-1", "user@example.com")
+    ) is None
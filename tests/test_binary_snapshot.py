@@ -0,0 +1,125 @@
+# tests/test_binary_snapshot.py
+
+import pytest
+
+from skill_system.binary import MappedSkillGraph, write_skill_graph
+from skill_system.models import Skill, SkillGraph
+
+
+def _build_graph(edges):
+    """Builds a graph from (prerequisite, skill) pairs."""
+    graph = SkillGraph()
+    for source, target in edges:
+        for skill_id in (source, target):
+            graph.add_skill(Skill(skill_id, skill_id))
+        graph.add_dependency(source, target)
+    return graph
+
+
+DIAMOND = [("basics", "js"), ("basics", "html"), ("js", "react"), ("html", "react")]
+
+
+def test_mapped_graph_answers_like_the_original(tmp_path):
+    graph = _build_graph(DIAMOND + [("react", "next.js"), ("ünïcode", "html")])
+    graph.add_skill(Skill("loner", "loner"))
+    path = tmp_path / "skills.bin"
+
+    skills, dependencies, size = write_skill_graph(graph, path)
+    mapped = MappedSkillGraph(path)
+
+    assert (skills, dependencies) == (7, 6)
+    assert size == mapped.nbytes()
+    assert len(mapped) == 7
+    assert "ünïcode" in mapped and "missing" not in mapped
+    for skill_id in graph.skills:
+        assert mapped.get_consolidated_path(skill_id) == graph.get_consolidated_path(skill_id)
+        assert mapped.get_prerequisites(skill_id) == graph.get_prerequisites(skill_id)
+        assert mapped.get_skills_unlocked_by(skill_id) == graph.get_skills_unlocked_by(skill_id)
+        for other in graph.skills:
+            assert mapped.is_prerequisite(other, skill_id) == graph.is_prerequisite(other, skill_id)
+    assert mapped.depth("next.js") == 3
+    assert mapped.get_learning_path("basics", "next.js") == ["basics", "html", "react", "next.js"]
+    assert mapped.get_consolidated_plan(["js", "html"]) == graph.get_consolidated_plan(["js", "html"])
+    with pytest.raises(KeyError):
+        mapped.get_consolidated_path("missing")
+
+
+def test_removed_skills_are_not_written(tmp_path):
+    graph = _build_graph([("a", "b"), ("b", "c")])
+    graph.remove_skill("b")
+    path = tmp_path / "skills.bin"
+
+    write_skill_graph(graph, path)
+    mapped = MappedSkillGraph(path)
+
+    assert len(mapped) == 2
+    assert mapped.get_consolidated_path("c") == ["c"]
+
+
+def test_rewrite_replaces_the_file_atomically(tmp_path):
+    path = tmp_path / "skills.bin"
+    write_skill_graph(_build_graph([("a", "b")]), path)
+    old = MappedSkillGraph(path)
+
+    write_skill_graph(_build_graph([("a", "b"), ("b", "c")]), path)
+    new = MappedSkillGraph(path)
+
+    # The old mapping stays valid and unchanged after the swap.
+    assert old.get_consolidated_path("b") == ["a", "b"]
+    assert "c" not in old
+    assert new.get_consolidated_path("c") == ["a", "b", "c"]
+    assert old.file_identity != new.file_identity
+    assert [p.name for p in tmp_path.iterdir()] == ["skills.bin"]
+
+
+def test_to_skill_graph_gives_a_mutable_copy(tmp_path):
+    path = tmp_path / "skills.bin"
+    write_skill_graph(_build_graph(DIAMOND), path)
+
+    graph = MappedSkillGraph(path).to_skill_graph()
+    graph.add_skill(Skill("redux", "redux"))
+    graph.add_dependency("react", "redux")
+
+    assert graph.get_consolidated_path("redux") == ["basics", "html", "js", "react", "redux"]
+    assert graph.skills["basics"].unlocks == {"js", "html"}
+
+
+def test_rejects_files_that_are_not_snapshots(tmp_path):
+    path = tmp_path / "skills.bin"
+    path.write_bytes(b"not a snapshot, just some bytes here")
+    with pytest.raises(ValueError):
+        MappedSkillGraph(path)
+
+    write_skill_graph(_build_graph(DIAMOND), path)
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ValueError, match="truncated"):
+        MappedSkillGraph(path)
+
+
+def test_mapped_graph_finds_cycles(tmp_path):
+    graph = _build_graph([("a", "b"), ("b", "c"), ("x", "c")])
+    path = tmp_path / "skills.bin"
+    write_skill_graph(graph, path)
+    mapped = MappedSkillGraph(path)
+
+    for source in graph.skills:
+        for target in graph.skills:
+            assert mapped.find_cycle(source, target) == graph.find_cycle(source, target)
+
+
+def test_mapped_graph_keeps_durations_for_the_learning_schedule(tmp_path):
+    graph = _build_graph(DIAMOND)
+    graph.skills["js"].duration_minutes = 120
+    graph.skills["basics"].duration_minutes = 0
+    path = tmp_path / "skills.bin"
+    write_skill_graph(graph, path)
+    mapped = MappedSkillGraph(path)
+
+    expected = graph.get_learning_schedule("react")
+    schedule = mapped.get_learning_schedule("react")
+
+    assert mapped.duration_minutes("js") == 120
+    assert mapped.duration_minutes("html") is None
+    assert schedule.critical_path == expected.critical_path == ["basics", "js", "react"]
+    assert schedule.critical_path_minutes == expected.critical_path_minutes == 180
+    assert mapped.to_skill_graph().skills["js"].duration_minutes == 120
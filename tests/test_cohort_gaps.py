@@ -0,0 +1,133 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import graph_crud
+from api.cohort_gaps import CohortGaps, compute_cohort_gaps
+from api.database import get_graph_db_driver
+from api.main import create_app
+from api.routers.auth import get_current_user
+from api.skill_snapshot import SkillGraphSnapshot
+
+PLAN = ["Python", "Web Basics", "Django"]
+
+
+def test_cohort_gaps_counts_missing_skills_per_user_and_skill():
+    gaps = CohortGaps(
+        PLAN,
+        {
+            "a@example.com": ["Python", "Web Basics", "Django"],
+            "b@example.com": ["Python", "Cooking"],
+            "c@example.com": [],
+        },
+        targets=["Django"],
+    )
+
+    report = gaps.report(top=2)
+
+    assert report["users"] == 3
+    assert report["users_fully_covered"] == 1
+    assert report["average_coverage_percent"] == pytest.approx(44.44)
+    assert report["most_common_missing"] == [
+        {"skill": "Web Basics", "users_missing": 2, "percent_of_users": 66.67},
+        {"skill": "Django", "users_missing": 2, "percent_of_users": 66.67},
+    ]
+    assert report["user_gaps"][1] == {
+        "email": "b@example.com",
+        "coverage_percent": 33.33,
+        "missing": ["Web Basics", "Django"],
+    }
+    # Unrelated skills such as "Cooking" get no column.
+    assert gaps.skills == PLAN
+    assert gaps.required.tolist() == [True, True, True]
+
+
+def test_cohort_gaps_credits_implied_prerequisites():
+    gaps = CohortGaps(
+        PLAN,
+        {"a@example.com": ["Flask"]},
+        implies={"Flask": ["Python", "Web Basics"], "Cooking": []},
+    )
+
+    report = gaps.report()
+
+    assert report["user_gaps"][0]["missing"] == ["Django"]
+    assert gaps.skills == PLAN + ["Flask"]
+    assert gaps.required.tolist() == [True, True, True, False]
+
+
+@pytest.fixture
+def mock_driver(mocker):
+    session = mocker.MagicMock()
+    session.execute_read.side_effect = lambda func, *args: {
+        graph_crud.get_skill_graph_nodes: [
+            ("Python", None, None),
+            ("Web Basics", None, None),
+            ("Django", None, None),
+            ("Flask", None, None),
+        ],
+        graph_crud.get_skill_graph_dependencies: [
+            ("Django", "Python"),
+            ("Django", "Web Basics"),
+            ("Flask", "Python"),
+        ],
+        # The Cypher fallback, used when the snapshot does not know a target
+        graph_crud.get_consolidated_learning_plan: (
+            ["Python", "Web Basics", "Django"],
+            {"Django": ["Python", "Web Basics", "Django"]},
+        ),
+        graph_crud.get_cohort_skills: [
+            ("a@example.com", ["Flask"]),
+            ("b@example.com", []),
+        ],
+        graph_crud.get_prerequisites_among: {"Flask": ["Python"]},
+    }[func]
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    return driver
+
+
+def test_compute_cohort_gaps_uses_the_snapshot_closure(mock_driver):
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(mock_driver)
+
+    gaps = compute_cohort_gaps(mock_driver, snapshot, ["Django"])
+    report = gaps.report()
+
+    assert report["required_skills"] == ["Python", "Web Basics", "Django"]
+    assert [user["missing"] for user in report["user_gaps"]] == [
+        ["Web Basics", "Django"],
+        ["Python", "Web Basics", "Django"],
+    ]
+
+
+def test_cohort_gaps_endpoint(mocker, mock_driver):
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(mock_driver)
+    mocker.patch("api.routers.reports.skill_snapshot", snapshot)
+    app = create_app()
+    app.dependency_overrides[get_graph_db_driver] = lambda: mock_driver
+    app.dependency_overrides[get_current_user] = lambda: None
+    client = TestClient(app)
+
+    response = client.post(
+        "/reports/cohort-gaps",
+        json={"targets": ["Django", "Nope"], "include_users": False},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["not_found"] == ["Nope"]
+    assert body["users_fully_covered"] == 0
+    assert body["most_common_missing"][0]["skill"] == "Web Basics"
+    assert body["user_gaps"] is None
+
+
+def test_compute_cohort_gaps_is_the_same_without_the_snapshot(mock_driver):
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(mock_driver)
+    expected = compute_cohort_gaps(mock_driver, snapshot, ["Django"]).report()
+
+    report = compute_cohort_gaps(mock_driver, SkillGraphSnapshot(), ["Django"]).report()
+
+    # Flask builds on Python, so a@example.com is not missing it either way.
+    assert report == expected
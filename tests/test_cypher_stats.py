@@ -0,0 +1,151 @@
+import asyncio
+from types import SimpleNamespace
+
+from api import graph_crud
+from api.cypher_stats import CypherStats
+
+PLAN = {
+    "operatorType": "ProduceResults",
+    "dbHits": 0,
+    "children": [{"operatorType": "NodeIndexSeek", "dbHits": 2, "children": []}],
+}
+
+
+class FakeResult:
+    def __init__(self, records, query):
+        self.records = records
+        self.query = query
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def consume(self):
+        return SimpleNamespace(
+            result_available_after=3,
+            result_consumed_after=1,
+            profile=PLAN if self.query.startswith("PROFILE") else None,
+        )
+
+
+class FakeTx:
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+
+    def run(self, query, parameters=None, **kwargs):
+        self.queries.append(query)
+        return FakeResult(self.records, query)
+
+
+class FakeSession:
+    def __init__(self, tx):
+        self.tx = tx
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute_read(self, func, *args):
+        return func(self.tx, *args)
+
+
+def _driver(stats, records):
+    tx = FakeTx(records)
+    driver = stats.instrument(SimpleNamespace(session=lambda: FakeSession(tx)))
+    return driver, tx
+
+
+def test_queries_are_named_and_counted():
+    stats = CypherStats()
+    driver, _ = _driver(stats, [{"name": "Pandas"}, {"name": "Python"}])
+
+    with driver.session() as session:
+        assert session.execute_read(graph_crud.get_all_skills) == ["Pandas", "Python"]
+        session.execute_read(graph_crud.get_all_skills)
+
+    report = stats.report()["GET_ALL_SKILLS_QUERY"]
+    assert report["count"] == 2 and report["rows"] == 4
+    assert report["available_after_ms_mean"] == 3
+    assert sum(report["histogram_ms"].values()) == 2
+    assert report["profile"] is None
+
+
+def test_unnamed_queries_are_named_after_their_function():
+    stats = CypherStats()
+    driver, _ = _driver(stats, [{"ok": 1}])
+
+    def check_health(tx):
+        return tx.run("RETURN 1 AS ok").single()["ok"]
+
+    with driver.session() as session:
+        session.execute_read(check_health)
+
+    assert list(stats.report()) == ["check_health"]
+
+
+def test_sampled_runs_are_profiled(capsys):
+    stats = CypherStats(slow_query_ms=-1, profile_sample_rate=1.0)
+    driver, tx = _driver(stats, [{"name": "Pandas"}])
+
+    with driver.session() as session:
+        session.execute_read(graph_crud.get_skill_by_name, "Pandas")
+
+    assert tx.queries == ["PROFILE " + graph_crud.GET_SKILL_BY_NAME_QUERY]
+    profile = stats.report()["GET_SKILL_BY_NAME_QUERY"]["profile"]
+    assert profile["db_hits"] == 2
+    assert profile["operators"] == ["ProduceResults", "NodeIndexSeek"]
+    assert "Slow Cypher query GET_SKILL_BY_NAME_QUERY" in capsys.readouterr().out
+
+
+def test_async_transactions_are_instrumented():
+    class AsyncResult:
+        def __aiter__(self):
+            return self._records()
+
+        async def _records(self):
+            yield {"name": "Rust"}
+
+        async def consume(self):
+            return SimpleNamespace(result_available_after=1, result_consumed_after=0, profile=None)
+
+    class AsyncTx:
+        async def run(self, query, parameters=None, **kwargs):
+            return AsyncResult()
+
+    async def get_all_skills(tx):
+        return [record["name"] async for record in await tx.run("MATCH (s:Skill) RETURN s.name")]
+
+    stats = CypherStats()
+    wrapped = stats.async_wrap(get_all_skills)
+
+    assert asyncio.run(wrapped(AsyncTx())) == ["Rust"]
+    assert stats.report()["get_all_skills"]["rows"] == 1
+
+
+def test_only_the_public_driver_api_is_wrapped():
+    import neo4j
+
+    stats = CypherStats()
+    for driver_class, session_class, tx_class, result_class in (
+        (neo4j.GraphDatabase, neo4j.Session, neo4j.ManagedTransaction, neo4j.Result),
+        (neo4j.AsyncGraphDatabase, neo4j.AsyncSession, neo4j.AsyncManagedTransaction, neo4j.AsyncResult),
+    ):
+        # Drivers connect lazily, so no server is needed.
+        raw = driver_class.driver("neo4j://localhost:7687", auth=("neo4j", "password"))
+        driver = stats.instrument(raw)
+        assert driver.session()._target.__class__ is session_class
+        assert driver.close == raw.close  # Anything else is the driver's own
+        for name in ("execute_read", "execute_write"):
+            assert callable(getattr(session_class, name))
+        assert callable(tx_class.run)
+        for name in ("single", "data", "consume"):
+            assert callable(getattr(result_class, name))
+        if driver_class is neo4j.GraphDatabase:
+            raw.close()
+    for name in ("result_available_after", "result_consumed_after", "profile"):
+        assert name in neo4j.ResultSummary.__annotations__
@@ -23,15 +23,15 @@ def mock_dependencies(mocker):
         "name": "Step 1",
         "description": "Do something",
     }
-    mock_session.write_transaction = mocker.MagicMock(return_value=(goal_node, quest_node))
+    mock_session.execute_write = mocker.AsyncMock(return_value=(goal_node, quest_node))
 
-    def override_get_graph_db_session():
+    async def override_get_async_graph_db_session():
         yield mock_session
 
     from api.main import app as main_app
-    from api.database import get_graph_db_session as original_get_graph_db_session
+    from api.database import get_async_graph_db_session as original_get_async_graph_db_session
     original_overrides = main_app.dependency_overrides.copy()
-    main_app.dependency_overrides[original_get_graph_db_session] = override_get_graph_db_session
+    main_app.dependency_overrides[original_get_async_graph_db_session] = override_get_async_graph_db_session
 
     # Mock current user
     def override_get_current_user():
@@ -0,0 +1,55 @@
+import asyncio
+
+from api.graph_cache import GraphReadCache
+
+
+def test_entries_read_before_a_write_are_not_served():
+    cache = GraphReadCache()
+    cache.put(("get_all_skills",), cache.version, ["Python"])
+    assert cache.get(("get_all_skills",), cache.version)[2] == ["Python"]
+
+    version = cache.version
+    cache.bump()
+    # A read that started before the write is not stored either
+    cache.put(("get_all_skills",), version, ["Python"])
+
+    assert cache.get(("get_all_skills",), cache.version) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = GraphReadCache(max_entries=2)
+    for name in ("a", "b"):
+        cache.put((name,), 0, [name])
+    cache.get(("a",), 0)
+    cache.put(("c",), 0, ["c"])
+
+    assert cache.get(("b",), 0) is None
+    assert cache.get(("a",), 0) is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] > 0
+    assert stats["hit_rate"] == round(2 / 3, 4)
+
+
+def test_entries_expire_after_the_ttl():
+    cache = GraphReadCache(ttl_seconds=-1)
+    cache.put(("a",), 0, ["a"])
+
+    assert cache.get(("a",), 0) is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_read_caches_none_results(mocker):
+    session = mocker.MagicMock()
+    session.execute_read = mocker.AsyncMock(return_value=None)
+    driver = mocker.MagicMock()
+    driver.session.return_value.__aenter__.return_value = session
+
+    async def get_skill_by_name(tx, name):
+        pass
+
+    cache = GraphReadCache()
+    for _ in range(2):
+        assert asyncio.run(cache.read(driver, get_skill_by_name, "Nope")) is None
+
+    session.execute_read.assert_awaited_once_with(get_skill_by_name, "Nope")
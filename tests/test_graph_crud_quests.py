@@ -132,64 +132,136 @@ def test_create_accomplishment_without_quest(mock_tx, mocker): # Added mocker
 def test_advance_goal(mock_tx, mocker):
     user_email = "goal.user@example.com"
     completed_quest_id = str(uuid.uuid4())
-    goal_id = str(uuid.uuid4())
-    next_quest_id = str(uuid.uuid4())
+    mock_next_quest_node = {
+        "id": str(uuid.uuid4()),
+        "name": "Second Step",
+        "description": "Do this second.",
+        "plan_index": 1,
+    }
+    mock_tx.run.return_value.single.return_value = {"q": mock_next_quest_node, "legacy": False}
 
-    # 1. Mock the plan
-    plan = [
-        {"title": "First Step", "description": "Do this first."},
-        {"title": "Second Step", "description": "Do this second."},
+    from api.graph_crud import advance_goal
+    result_quest = advance_goal(mock_tx, completed_quest_id, user_email)
+
+    assert result_quest["name"] == "Second Step"
+    # A single statement, whatever the plan looks like
+    mock_tx.run.assert_called_once()
+    query, params = mock_tx.run.call_args.args[0], mock_tx.run.call_args.kwargs
+    assert "OPTIONAL MATCH (old)-[:FOR_STEP]->(step:PlanStep)" in query
+    assert "position: step.position + 1" in query
+    assert "DELETE r" in query and "CREATE (old)-[:PRECEDES]->(q)" in query
+    assert "CREATE (q)-[:FOR_STEP]->(next)" in query
+    assert params["quest_id"] == completed_quest_id
+    assert params["user_email"] == user_email
+
+
+def test_advance_goal_completes_the_goal_after_the_last_step(mock_tx):
+    mock_tx.run.return_value.single.return_value = {"q": None, "legacy": False}
+
+    from api.graph_crud import advance_goal
+    assert advance_goal(mock_tx, "quest-2", "goal.user@example.com") is None
+
+    # The quest is not a legacy one, so nothing else runs.
+    (advance_call,) = mock_tx.run.call_args_list
+    assert "SET g.status = 'completed'" in advance_call.args[0]
+    assert "MERGE (u)-[:ACHIEVED_GOAL]->(g)" in advance_call.args[0]
+
+
+def test_advance_goal_ignores_a_quest_that_is_not_active(mock_tx):
+    mock_tx.run.return_value.single.return_value = None
+
+    from api.graph_crud import advance_goal
+    assert advance_goal(mock_tx, "quest-2", "goal.user@example.com") is None
+    mock_tx.run.assert_called_once()
+
+
+def test_advance_goal_links_a_legacy_quest_to_its_step_first(mock_tx, mocker):
+    from api import graph_crud
+
+    plan = '[{"title": "First Step", "description": "Do this first.", "duration_minutes": 30}]'
+    next_quest = {"id": "quest-2", "name": "Second Step"}
+    mock_tx.run.return_value.single.side_effect = [
+        # No FOR_STEP yet
+        {"q": None, "legacy": True, "goal_id": "goal-1", "plan": plan, "has_steps": False},
+        {"position": 0},
+        {"q": next_quest, "legacy": False},
+    ]
+
+    assert graph_crud.advance_goal(mock_tx, "quest-1", "goal.user@example.com") == next_quest
+
+    queries = [call.args[0] for call in mock_tx.run.call_args_list]
+    assert queries == [
+        graph_crud.ADVANCE_GOAL_QUERY,
+        graph_crud.LINK_LEGACY_QUEST_TO_STEP_QUERY,
+        graph_crud.ADVANCE_GOAL_QUERY,
     ]
+    assert mock_tx.run.call_args_list[1].kwargs["steps"][0]["title"] == "First Step"
+
+
+def test_advance_goal_warns_about_a_legacy_quest_without_a_step(mock_tx, capsys):
+    from api import graph_crud
+
+    mock_tx.run.return_value.single.side_effect = [
+        {"q": None, "legacy": True, "goal_id": "goal-1", "plan": None, "has_steps": True},
+        None,  # No step has the quest's position or title
+    ]
+
+    assert graph_crud.advance_goal(mock_tx, "quest-1", "goal.user@example.com") is None
+    assert "WARNING: Quest quest-1 matches no step of goal goal-1's plan" in capsys.readouterr().out
+
+
+def test_create_goal_stores_the_plan_as_steps(mock_tx):
     import json
-    plan_json = json.dumps(plan)
+    from api import schemas
+    from api.graph_crud import create_goal_and_link_to_user
 
-    # 2. Mock the goal node found by the first query in advance_goal
-    mock_goal_node = {
-        "id": goal_id,
-        "full_plan_json": plan_json,
-    }
-    # We need to mock the quest name lookup as well
-    mock_completed_quest_name = "First Step"
+    plan = [
+        {"title": "First Step", "description": "Do this first.", "duration_minutes": 30},
+        {"title": "Second Step", "description": "Do this second.", "duration_minutes": 45},
+    ]
+    mock_tx.run.return_value.single.return_value = {"g": {"id": "goal-1"}}
+    goal_data = schemas.GoalCreate(goal_text="Learn things", full_plan_json=json.dumps(plan))
 
-    # 3. Mock the creation of the next quest
-    mock_next_quest_node = {
-        "id": next_quest_id,
-        "name": "Second Step",
-        "description": "Do this second.",
+    create_goal_and_link_to_user(mock_tx, goal_data, "goal.user@example.com")
+
+    query, params = mock_tx.run.call_args.args[0], mock_tx.run.call_args.kwargs
+    assert "CREATE (g)-[:HAS_STEP]->(:PlanStep {" in query
+    assert params["steps"] == plan
+
+
+def test_get_goal_progress(mock_tx):
+    from api.graph_crud import get_goal_progress
+
+    mock_tx.run.return_value.single.return_value = {
+        "status": "in-progress",
+        "total_steps": 4,
+        "position": 1,
+        "current_step": "Second Step",
+        "remaining_minutes": 90,
     }
+    progress = get_goal_progress(mock_tx, "goal-1", "goal.user@example.com")
 
-    # Configure the side_effect for multiple tx.run calls
-    mock_tx.run.side_effect = [
-        # First call: find_goal_query
-        mocker.Mock(single=mocker.Mock(return_value={'g': mock_goal_node})),
-        # Second call: get_quest_name_query
-        mocker.Mock(single=mocker.Mock(return_value={'name': mock_completed_quest_name})),
-        # Third call (inside create_quest_and_link_to_user): CREATE (q:Quest)
-        mocker.Mock(single=mocker.Mock(return_value={'q': mock_next_quest_node})),
-        # Fourth call (inside create_quest_and_link_to_user): MERGE (u)-[:HAS_QUEST]->(q)
-        mocker.Mock(),
-        # Fifth call: link_quest_to_goal_query
-        mocker.Mock(),
-    ]
+    assert progress["completed_steps"] == 1
+    assert progress["progress_percent"] == 25.0
+    assert progress["current_step"] == "Second Step"
+    assert progress["remaining_minutes"] == 90
 
-    # Mock the create_quest_and_link_to_user function to control the new quest's ID
-    mocker.patch('api.graph_crud.create_quest_and_link_to_user',
-                 return_value=mock_next_quest_node)
 
+def test_get_goal_progress_of_a_completed_goal(mock_tx):
+    from api.graph_crud import get_goal_progress
 
-    from api.graph_crud import advance_goal
-    result_quest = advance_goal(mock_tx, completed_quest_id, user_email)
+    mock_tx.run.return_value.single.return_value = {
+        "status": "completed",
+        "total_steps": 4,
+        "position": None,
+        "current_step": None,
+        "remaining_minutes": 0,
+    }
+    progress = get_goal_progress(mock_tx, "goal-1", "goal.user@example.com")
 
-    assert result_quest is not None
-    assert result_quest['name'] == "Second Step"
+    assert progress["completed_steps"] == 4
+    assert progress["progress_percent"] == 100.0
 
-    # Verify that create_quest_and_link_to_user was called with the correct data
-    from api.graph_crud import create_quest_and_link_to_user
-    create_quest_and_link_to_user.assert_called_once_with(
-        mock_tx,
-        {"name": "Second Step", "description": "Do this second."},
-        user_email
-    )
 
 def test_create_accomplishment_with_quest(mock_tx, mocker): # Added mocker
     user_email = "test@example.com"
@@ -298,3 +370,53 @@ def test_create_accomplishment_with_quest(mock_tx, mocker): # Added mocker
 
     assert result["id"] == expected_accomplishment_id
     assert result["name"] == accomplishment_data["name"]
+
+
+def test_create_accomplishment_with_fulfilment(mock_tx):
+    from api.graph_crud import create_accomplishment_with_fulfilment
+
+    quest_id = uuid.uuid4()
+    mock_tx.run.return_value.single.return_value = {"a": {"id": "acc-1", "name": "Did it"}}
+
+    result = create_accomplishment_with_fulfilment(
+        mock_tx, "test@example.com", {"name": "Did it", "description": "All of it."}, quest_id=quest_id
+    )
+
+    # The accomplishment and its FULFILLS link are one statement
+    mock_tx.run.assert_called_once()
+    query, params = mock_tx.run.call_args.args[0], mock_tx.run.call_args.kwargs
+    assert "CREATE (u)-[:COMPLETED]->(a)" in query
+    assert "CREATE (a)-[:FULFILLS]->(quest)" in query
+    assert params["quest_id"] == str(quest_id)
+    assert params["props"]["name"] == "Did it"
+    assert result["id"] == "acc-1"
+
+
+def test_link_accomplishment_to_skills(mock_tx):
+    from api.graph_crud import link_accomplishment_to_skills
+
+    link_accomplishment_to_skills(
+        mock_tx, "acc-1", [("Python", "beginner"), "FastAPI", ("Python", "Advanced")]
+    )
+
+    mock_tx.run.assert_called_once()
+    query, params = mock_tx.run.call_args.args[0], mock_tx.run.call_args.kwargs
+    assert "UNWIND $skills AS skill" in query
+    assert "MERGE (u)-[h:HAS_SKILL]->(s)" in query
+    assert "h.evidence_count = h.evidence_count + 1" in query
+    assert params["skills"] == [
+        {"name": "Python", "level": "Advanced"},
+        {"name": "FastAPI", "level": None},
+    ]
+    assert params["levels"] == ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+
+def test_skill_evidence_keeps_the_highest_known_level():
+    from api.graph_crud import skill_evidence
+
+    assert skill_evidence(
+        [("SQL", "Expert"), ("SQL", "Beginner"), ("Go", "Seasoned"), ("Go", "Intermediate")]
+    ) == [
+        {"name": "SQL", "level": "Expert"},
+        {"name": "Go", "level": "Intermediate"},
+    ]
@@ -0,0 +1,226 @@
+import pytest
+
+from api.graph_crud import (
+    add_skill_dependency,
+    backfill_skill_depths,
+    create_skill,
+    create_skills_if_missing,
+    delete_skill,
+    find_dependency_cycle,
+    get_cohort_skills,
+    get_user_skills_by_accomplishments,
+    recompute_skill_depths,
+    GET_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY,
+    SCHEMA_VERSION_QUERY,
+    WALK_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY,
+)
+
+
+@pytest.fixture
+def mock_tx(mocker):
+    return mocker.MagicMock()
+
+
+def test_create_skill_starts_at_depth_zero(mock_tx):
+    mock_tx.run.return_value.single.return_value = {"name": "Python"}
+
+    result = create_skill(mock_tx, "Python")
+
+    args, kwargs = mock_tx.run.call_args
+    assert "MERGE (s:Skill {name: $skill_name})" in args[0]
+    assert "ON CREATE SET s.depth = 0" in args[0]
+    assert kwargs["skill_name"] == "Python"
+    assert result["name"] == "Python"
+
+
+def test_create_skills_if_missing_returns_only_created_skills(mock_tx):
+    mock_tx.run.return_value = [
+        {"name": "Python", "created": False},
+        {"name": "FastAPI", "created": True},
+    ]
+
+    created = create_skills_if_missing(mock_tx, ["Python", "FastAPI", "Python"])
+
+    mock_tx.run.assert_called_once()
+    args, kwargs = mock_tx.run.call_args
+    assert "UNWIND $skill_names AS skill_name" in args[0]
+    assert "ON CREATE SET s.depth = 0" in args[0]
+    assert kwargs["skill_names"] == ["Python", "FastAPI"]
+    assert created == ["FastAPI"]
+
+
+def test_recompute_skill_depths_walks_only_changed_dependents(mock_tx, mocker):
+    # Round 1 changes "Pandas", whose dependent is "Data Analysis";
+    # round 2 changes "Data Analysis", which has no dependents.
+    mock_tx.run.side_effect = [
+        [{"name": "Data Analysis"}],
+        [],
+    ]
+
+    recompute_skill_depths(mock_tx, ["Pandas"])
+
+    assert mock_tx.run.call_count == 2
+    first, second = mock_tx.run.call_args_list
+    assert first.kwargs["names"] == ["Pandas"]
+    assert second.kwargs["names"] == ["Data Analysis"]
+    assert "SET s.depth = depth" in first.args[0]
+
+
+def test_add_skill_dependency_recomputes_parent_depth(mock_tx, mocker):
+    recompute = mocker.patch("api.graph_crud.recompute_skill_depths")
+    mock_tx.run.return_value.single.return_value = {"added": True}
+
+    assert add_skill_dependency(mock_tx, "Pandas", "Python") == []
+
+    args, kwargs = mock_tx.run.call_args
+    assert "MERGE (parent)-[:DEPENDS_ON]->(child)" in args[0]
+    assert "EXISTS { (child)-[:DEPENDS_ON*0..]->(parent) }" in args[0]
+    recompute.assert_called_once_with(mock_tx, ["Pandas"])
+
+
+def test_add_skill_dependency_returns_the_cycle_it_refused(mock_tx, mocker):
+    recompute = mocker.patch("api.graph_crud.recompute_skill_depths")
+    find_cycle = mocker.patch(
+        "api.graph_crud.find_dependency_cycle", return_value=["Python", "Pandas", "Python"]
+    )
+    mock_tx.run.return_value.single.return_value = {"added": False}
+
+    assert add_skill_dependency(mock_tx, "Python", "Pandas") == ["Python", "Pandas", "Python"]
+
+    find_cycle.assert_called_once_with(mock_tx, "Python", "Pandas")
+    recompute.assert_not_called()
+
+
+def test_delete_skill_recomputes_former_dependents(mock_tx, mocker):
+    recompute = mocker.patch("api.graph_crud.recompute_skill_depths")
+    mock_tx.run.return_value.single.return_value = {"dependents": ["Pandas"]}
+
+    delete_skill(mock_tx, "Python")
+
+    assert "DETACH DELETE s" in mock_tx.run.call_args.args[0]
+    recompute.assert_called_once_with(mock_tx, ["Pandas"])
+
+
+def test_delete_skill_without_dependents_skips_recompute(mock_tx, mocker):
+    recompute = mocker.patch("api.graph_crud.recompute_skill_depths")
+    mock_tx.run.return_value.single.return_value = {"dependents": []}
+
+    delete_skill(mock_tx, "Python")
+
+    recompute.assert_not_called()
+
+
+def test_backfill_skill_depths_repeats_until_stable(mock_tx, mocker):
+    mock_tx.run.side_effect = [
+        mocker.Mock(),  # Reset every depth to 0
+        mocker.Mock(single=mocker.Mock(return_value={"updated": 5})),
+        mocker.Mock(single=mocker.Mock(return_value={"updated": 2})),
+        mocker.Mock(single=mocker.Mock(return_value={"updated": 0})),
+    ]
+
+    rounds = backfill_skill_depths(mock_tx)
+
+    assert rounds == 3
+    assert mock_tx.run.call_count == 4
+
+
+def test_get_consolidated_learning_plan_groups_by_target(mock_tx):
+    from api.graph_crud import get_consolidated_learning_plan
+
+    mock_tx.run.return_value = [
+        {"name": "Python", "targets": ["Pandas", "Django"]},
+        {"name": "Pandas", "targets": ["Pandas"]},
+        {"name": "Django", "targets": ["Django"]},
+    ]
+
+    plan, membership = get_consolidated_learning_plan(mock_tx, ["Pandas", "Django"])
+
+    assert "UNWIND $skill_names AS skill_name" in mock_tx.run.call_args.args[0]
+    assert plan == ["Python", "Pandas", "Django"]
+    assert membership == {"Pandas": ["Python", "Pandas"], "Django": ["Python", "Django"]}
+
+
+def test_find_dependency_cycle_returns_the_existing_chain(mock_tx):
+    mock_tx.run.return_value.single.return_value = {"cycle": ["Pandas", "Python"]}
+
+    cycle = find_dependency_cycle(mock_tx, "Python", "Pandas")
+
+    args, kwargs = mock_tx.run.call_args
+    assert "shortestPath((child)-[:DEPENDS_ON*]->(parent))" in args[0]
+    assert kwargs == {"parent_skill_name": "Python", "child_skill_name": "Pandas"}
+    assert cycle == ["Python", "Pandas", "Python"]
+
+
+def test_find_dependency_cycle_is_empty_for_a_safe_edge(mock_tx):
+    mock_tx.run.return_value.single.return_value = None
+
+    assert find_dependency_cycle(mock_tx, "Pandas", "Python") == []
+    assert find_dependency_cycle(mock_tx, "Pandas", "Pandas") == ["Pandas", "Pandas"]
+
+
+def test_get_cohort_skills_reads_every_user_in_one_query(mock_tx, mocker):
+    mocker.patch("api.graph_crud._skill_profiles_ready", True)
+    mock_tx.run.return_value = [
+        {"email": "a@example.com", "skills": ["Python"]},
+        {"email": "b@example.com", "skills": []},
+    ]
+
+    result = get_cohort_skills(mock_tx, ["a@example.com", "b@example.com"])
+
+    args, kwargs = mock_tx.run.call_args
+    assert mock_tx.run.call_count == 1
+    assert "OPTIONAL MATCH (u)-[:HAS_SKILL]->(s:Skill)" in args[0]
+    assert kwargs == {"emails": ["a@example.com", "b@example.com"]}
+    assert result == [("a@example.com", ["Python"]), ("b@example.com", [])]
+
+
+def test_skill_reads_walk_accomplishments_until_profiles_are_backfilled(mock_tx, mocker):
+    mocker.patch("api.graph_crud._skill_profiles_ready", False)
+    mock_tx.run.return_value.single.side_effect = [
+        {"version": 3},
+        {"skills": ["Python"]},
+        {"version": 4},
+        {"skills": ["Python"]},
+        {"skills": ["Python", "SQL"]},
+    ]
+
+    assert get_user_skills_by_accomplishments(mock_tx, "a@example.com") == ["Python"]
+    assert get_user_skills_by_accomplishments(mock_tx, "a@example.com") == ["Python"]
+    assert get_user_skills_by_accomplishments(mock_tx, "a@example.com") == ["Python", "SQL"]
+
+    queries = [call.args[0] for call in mock_tx.run.call_args_list]
+    assert queries == [
+        SCHEMA_VERSION_QUERY,
+        WALK_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY,
+        SCHEMA_VERSION_QUERY,
+        GET_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY,
+        GET_USER_SKILLS_BY_ACCOMPLISHMENTS_QUERY,  # The version is not read again
+    ]
+
+def test_get_prerequisites_among_maps_each_skill_to_its_candidates(mock_tx):
+    from api.graph_crud import get_prerequisites_among
+
+    mock_tx.run.return_value = [{"name": "Flask", "prerequisites": ["Python"]}]
+
+    assert get_prerequisites_among(mock_tx, ["Flask", "Go"], ["Python", "Django"]) == {
+        "Flask": ["Python"]
+    }
+    args, kwargs = mock_tx.run.call_args
+    assert "(:Skill {name: name})-[:DEPENDS_ON*]->(prereq:Skill)" in args[0]
+    assert kwargs == {"skill_names": ["Flask", "Go"], "candidates": ["Python", "Django"]}
+
+
+def test_get_covered_skills_adds_what_held_skills_build_on(mock_tx):
+    from api.graph_crud import get_covered_skills
+
+    mock_tx.run.return_value.single.return_value = {"covered": ["Python"]}
+
+    covered = get_covered_skills(mock_tx, ["Pandas"], ["Python", "SQL", "Data Analysis"])
+
+    assert covered == {"Pandas", "Python"}
+    args, kwargs = mock_tx.run.call_args
+    assert "(:Skill {name: held_skill})-[:DEPENDS_ON*]->(prereq:Skill)" in args[0]
+    assert kwargs == {"held_skills": ["Pandas"], "candidates": ["Python", "SQL", "Data Analysis"]}
+    mock_tx.run.reset_mock()
+    assert get_covered_skills(mock_tx, [], ["Python"]) == set()
+    mock_tx.run.assert_not_called()
@@ -0,0 +1,50 @@
+import json
+
+from api import graph_crud
+from api.graph_export import export_ndjson
+
+
+def _paged_session(mocker, names, page_sizes):
+    """A session whose get_skills_page reads from ``names`` like Neo4j would,
+    recording the page sizes it was asked for."""
+
+    def execute_read(func, after, limit):
+        assert func is graph_crud.get_skills_page
+        page_sizes.append(limit)
+        return [{"name": n, "duration_minutes": None} for n in sorted(names) if n > after][:limit]
+
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value.execute_read.side_effect = execute_read
+    return driver
+
+
+def test_export_pages_through_every_skill(mocker):
+    names = [f"Skill {i:03}" for i in range(25)]
+    page_sizes = []
+    driver = _paged_session(mocker, names, page_sizes)
+
+    lines = list(export_ndjson(driver, "skills", page_size=10))
+
+    assert [json.loads(line)["name"] for line in lines] == names
+    assert all(line.endswith("\n") for line in lines)
+    assert page_sizes == [10, 10, 10]
+
+
+def test_export_continues_after_a_cursor(mocker):
+    names = [f"Skill {i:03}" for i in range(25)]
+    driver = _paged_session(mocker, names, [])
+
+    lines = list(export_ndjson(driver, "skills", after="Skill 019", page_size=10))
+
+    assert [json.loads(line)["name"] for line in lines] == names[20:]
+
+
+def test_dependencies_export_one_line_per_skill(mocker):
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value.execute_read.return_value = [
+        ("Django", ["Python", "Web Basics"]),
+    ]
+
+    lines = list(export_ndjson(driver, "dependencies", page_size=10))
+
+    assert json.loads(lines[0]) == {"name": "Django", "prerequisites": ["Python", "Web Basics"]}
@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+from api.graph_pool import PoolMetrics, warm_up
+
+
+class FakePool:
+    def __init__(self):
+        self.connections = {"localhost:7687": []}
+
+    def acquire(self, **kwargs):
+        connection = SimpleNamespace(in_use=True)
+        self.connections["localhost:7687"].append(connection)
+        return connection
+
+
+class FakeAsyncSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        self.driver.open += 1
+        self.driver.peak = max(self.driver.peak, self.driver.open)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.driver.open -= 1
+
+    async def run(self, query):
+        assert query == "RETURN 1"
+
+
+class FakeAsyncDriver:
+    def __init__(self):
+        self.open = self.peak = 0
+        self.verified = False
+
+    async def verify_connectivity(self):
+        self.verified = True
+
+    def session(self):
+        return FakeAsyncSession(self)
+
+
+def test_metrics_time_acquisitions_and_count_connections():
+    driver = SimpleNamespace(_pool=FakePool())
+    metrics = PoolMetrics()
+    metrics.attach(driver)
+
+    first = driver._pool.acquire(timeout=60)
+    driver._pool.acquire(timeout=60)
+    first.in_use = False
+
+    stats = metrics.snapshot()
+    assert stats["in_use"] == 1 and stats["idle"] == 1
+    assert stats["acquisitions"] == 2
+    assert stats["acquisition_wait_ms_max"] >= stats["acquisition_wait_ms_mean"] >= 0
+
+
+def test_metrics_without_a_readable_pool():
+    metrics = PoolMetrics()
+    metrics.attach(SimpleNamespace())
+
+    stats = metrics.snapshot()
+    assert stats["in_use"] is None and stats["acquisitions"] == 0
+
+
+def test_warm_up_holds_all_sessions_open_at_once():
+    driver = FakeAsyncDriver()
+
+    warmed = asyncio.run(warm_up(driver, connections=3))
+
+    assert warmed == 3
+    assert driver.verified
+    # Every session held its connection until all of them had run.
+    assert driver.peak == 3 and driver.open == 0
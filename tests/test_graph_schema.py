@@ -0,0 +1,151 @@
+import pytest
+
+from api import graph_schema
+
+
+@pytest.fixture
+def session(mocker):
+    session = mocker.MagicMock()
+    session.reads = {
+        graph_schema.get_schema_version: 0,
+        graph_schema.find_duplicate_values: [],
+        graph_schema.get_online_indexes: set(),
+    }
+    session.execute_read.side_effect = lambda func, *args: session.reads[func]
+    return session
+
+
+@pytest.fixture
+def driver(mocker, session):
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    return driver
+
+
+def _statements(session):
+    return [
+        call.args[1]
+        for call in session.execute_write.call_args_list
+        if call.args[0] is graph_schema.run_schema_statement
+    ]
+
+
+def _applied(session):
+    return [
+        call.args[1].version
+        for call in session.execute_write.call_args_list
+        if call.args[0] is graph_schema.apply_migration_data
+    ]
+
+
+def test_migrate_applies_pending_versions_in_order(driver, session):
+    session.execute_write.side_effect = (
+        lambda func, *args: func is graph_schema.apply_migration_data or None
+    )
+
+    assert graph_schema.migrate(driver) == [1, 2, 3, 4, 5, 6]
+
+    statements = _statements(session)
+    assert statements[0] == graph_schema.SCHEMA_LOCK_STATEMENT
+    assert statements[1] == (
+        "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS "
+        "FOR (n:Skill) REQUIRE n.name IS UNIQUE"
+    )
+    assert "CREATE INDEX skill_depth IF NOT EXISTS FOR (n:Skill) ON (n.depth)" in statements
+    assert (
+        "CREATE INDEX planstep_goal_id_position IF NOT EXISTS "
+        "FOR (n:PlanStep) ON (n.goal_id, n.position)"
+    ) in statements
+    assert (
+        "CREATE CONSTRAINT skillgraphlock_name_unique IF NOT EXISTS "
+        "FOR (n:SkillGraphLock) REQUIRE n.name IS UNIQUE"
+    ) in statements
+    # The composite index is replaced by a constraint on the same key.
+    assert statements[-2:] == [
+        "DROP INDEX planstep_goal_id_position IF EXISTS",
+        "CREATE CONSTRAINT planstep_goal_id_position_unique IF NOT EXISTS "
+        "FOR (n:PlanStep) REQUIRE (n.goal_id, n.position) IS UNIQUE",
+    ]
+    assert len(statements) == 11
+    assert _applied(session) == [1, 2, 3, 4, 5, 6]
+
+
+def test_migrate_skips_versions_another_worker_applied(driver, session):
+    # The version is re-read under the lock; another worker got there first.
+    session.execute_write.side_effect = (
+        lambda func, *args: func is graph_schema.apply_migration_data
+        and args[0].version != 3 or None
+    )
+
+    assert graph_schema.migrate(driver) == [1, 2, 4, 5, 6]
+
+
+def test_apply_migration_data_locks_and_rechecks_the_version(mocker):
+    tx = mocker.MagicMock()
+    tx.run.return_value.single.return_value = {"applied": 1}
+    migration = graph_schema.Migration(7, "Test", data=mocker.Mock())
+
+    assert graph_schema.apply_migration_data(tx, migration) is False
+
+    assert "MERGE (lock:SchemaLock" in tx.run.call_args_list[0].args[0]
+    migration.data.assert_not_called()
+
+    tx.run.return_value.single.return_value = {"applied": 0}
+    assert graph_schema.apply_migration_data(tx, migration) is True
+    migration.data.assert_called_once_with(tx)
+    assert "MERGE (m:SchemaMigration" in tx.run.call_args_list[-1].args[0]
+
+
+def test_migrate_skips_applied_versions(driver, session):
+    session.reads[graph_schema.get_schema_version] = graph_schema.LATEST_VERSION
+
+    assert graph_schema.migrate(driver) == []
+    session.execute_write.assert_not_called()
+
+
+def test_migrate_refuses_constraints_over_duplicates(driver, session):
+    session.reads[graph_schema.find_duplicate_values] = ["Python"]
+
+    with pytest.raises(graph_schema.SchemaMigrationError, match="Skill.name"):
+        graph_schema.migrate(driver)
+    assert _statements(session) == [graph_schema.SCHEMA_LOCK_STATEMENT]
+
+
+def test_missing_indexes(driver, session):
+    session.reads[graph_schema.get_online_indexes] = {
+        ("Skill", "name"),
+        ("User", "email"),
+        ("Skill", "depth"),
+    }
+
+    assert graph_schema.missing_indexes(driver) == [
+        ("Quest", "id"),
+        ("Goal", "id"),
+        ("Accomplishment", "id"),
+        ("PlanStep", ("goal_id", "position")),
+        ("SkillGraphLock", "name"),
+    ]
+
+
+def test_plan_steps_from_json(mocker):
+    tx = mocker.MagicMock()
+    plan = '[{"title": "First Step", "description": "Do this first.", "duration_minutes": 30}]'
+    tx.run.side_effect = [
+        [{"id": "goal-1", "plan": plan}, {"id": "goal-2", "plan": "not json"}],
+        mocker.Mock(),
+        mocker.Mock(),
+    ]
+
+    graph_schema.plan_steps_from_json(tx)
+
+    create_call, link_call = tx.run.call_args_list[1:]
+    assert create_call.kwargs["goals"] == [
+        {
+            "goal_id": "goal-1",
+            "steps": [
+                {"title": "First Step", "description": "Do this first.", "duration_minutes": 30}
+            ],
+        }
+    ]
+    assert "MERGE (s:PlanStep {goal_id: g.id, position: i})" in create_call.args[0]
+    assert "MERGE (q)-[:FOR_STEP]->(s)" in link_call.args[0]
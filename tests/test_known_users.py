@@ -0,0 +1,85 @@
+import asyncio
+
+from api import graph_crud
+from api.known_users import KnownGraphUsers
+
+
+def _driver(mocker, emails=()):
+    session = mocker.MagicMock()
+    session.execute_read.side_effect = lambda func, after, limit: [
+        email for email in sorted(emails) if email > after
+    ][:limit]
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    return driver, session
+
+
+def test_loaded_users_need_no_write(mocker):
+    driver, session = _driver(mocker, ["ada@example.com", "alan@example.com"])
+    users = KnownGraphUsers()
+    users.load(driver)
+
+    users.ensure(driver, "ada@example.com")
+
+    assert "alan@example.com" in users
+    assert "grace@example.com" not in users
+    session.execute_write.assert_not_called()
+
+
+def test_unknown_users_are_written_at_login_without_the_reconciler(mocker):
+    driver, session = _driver(mocker)
+    users = KnownGraphUsers()
+
+    users.ensure(driver, "grace@example.com")
+    users.ensure(driver, "grace@example.com")
+
+    session.execute_write.assert_called_once_with(
+        graph_crud.create_user_node, "grace@example.com"
+    )
+
+
+def test_unknown_users_are_reconciled_in_batches(mocker):
+    driver, session = _driver(mocker)
+    users = KnownGraphUsers()
+    users.reconciling = True
+    for i in range(5):
+        users.ensure(driver, f"user{i}@example.com")
+    users.ensure(driver, "user0@example.com")  # Queued once
+    session.execute_write.assert_not_called()
+
+    assert users.reconcile(driver, batch_size=2) == 5
+
+    batches = [call.args[1] for call in session.execute_write.call_args_list]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert {email for batch in batches for email in batch} == {
+        f"user{i}@example.com" for i in range(5)
+    }
+    assert "user3@example.com" in users
+
+
+def test_failed_reconciliation_keeps_the_queue(mocker):
+    driver, session = _driver(mocker)
+    session.execute_write.side_effect = RuntimeError("connection lost")
+    users = KnownGraphUsers()
+    users.reconciling = True
+    users.ensure(driver, "ada@example.com")
+
+    assert users.reconcile(driver) == 0
+    session.execute_write.side_effect = None
+    assert users.reconcile(driver) == 1
+    assert "ada@example.com" in users
+
+
+def test_reconcile_periodically_flags_the_queue_as_served(mocker):
+    driver, _ = _driver(mocker)
+    users = KnownGraphUsers()
+
+    async def run_briefly():
+        task = asyncio.create_task(users.reconcile_periodically(driver, interval=60))
+        await asyncio.sleep(0)
+        assert users.reconciling
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run_briefly())
+    assert not users.reconciling
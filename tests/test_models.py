@@ -52,3 +52,227 @@ def test_isa_relationship():
 
     assert "id_spoon" in graph.skills["id_objects"].contains_types
     assert "id_objects" in graph.skills["id_spoon"].is_a_type_of
+
+
+def _build_graph(edges):
+    """Builds a graph from (prerequisite, skill) pairs."""
+    graph = SkillGraph()
+    for source, target in edges:
+        for skill_id in (source, target):
+            graph.add_skill(Skill(skill_id, skill_id))
+        graph.add_dependency(source, target)
+    return graph
+
+
+def test_get_prerequisites_is_transitive():
+    graph = _build_graph(
+        [("crawl", "walk"), ("walk", "run"), ("balance", "run"), ("see", "balance")]
+    )
+
+    assert graph.get_prerequisites("run") == {"crawl", "walk", "balance", "see"}
+    assert graph.get_prerequisites("crawl") == set()
+
+
+def test_get_skills_unlocked_by():
+    graph = _build_graph([("crawl", "walk"), ("walk", "run"), ("walk", "dance")])
+
+    assert graph.get_skills_unlocked_by("crawl") == {"walk", "run", "dance"}
+    assert graph.get_skills_unlocked_by("run") == set()
+
+
+def test_get_learning_path_is_shortest_chain():
+    graph = _build_graph(
+        [("a", "b"), ("b", "c"), ("c", "d"), ("a", "d"), ("x", "d")]
+    )
+
+    assert graph.get_learning_path("a", "d") == ["a", "d"]
+    assert graph.get_learning_path("b", "d") == ["b", "c", "d"]
+    assert graph.get_learning_path("d", "a") == []
+    assert graph.get_learning_path("a", "a") == ["a"]
+
+
+def test_duplicate_dependency_is_ignored():
+    graph = _build_graph([("a", "b"), ("a", "b")])
+
+    assert graph.skills["b"].requires == {"a"}
+    assert graph.skills["a"].unlocks == {"b"}
+
+
+def test_compaction_preserves_relationships():
+    edges = [(f"s{i}", f"s{i + 1}") for i in range(50)]
+    graph = _build_graph(edges)
+    before = graph.get_prerequisites("s50")
+
+    graph.compact()
+
+    assert graph.get_prerequisites("s50") == before == {f"s{i}" for i in range(50)}
+    assert graph.skills["s10"].requires == {"s9"}
+    assert graph.skills["s10"].unlocks == {"s11"}
+    assert graph.nbytes() > 0
+
+
+def test_get_consolidated_path_orders_most_fundamental_first():
+    # A diamond: "react" needs "js" and "html", which both need "basics".
+    graph = _build_graph(
+        [("basics", "js"), ("basics", "html"), ("js", "react"), ("html", "react")]
+    )
+
+    assert graph.get_consolidated_path("react") == ["basics", "html", "js", "react"]
+    assert graph.get_consolidated_path("basics") == ["basics"]
+
+
+def test_get_consolidated_path_uses_longest_chain():
+    graph = _build_graph([("a", "b"), ("b", "c"), ("a", "c"), ("c", "d"), ("x", "d")])
+
+    assert graph.get_consolidated_path("d") == ["a", "x", "b", "c", "d"]
+
+
+def test_remove_and_rename_skill():
+    graph = _build_graph([("a", "b"), ("b", "c")])
+
+    graph.rename_skill("b", "b2")
+    assert graph.get_prerequisites("c") == {"a", "b2"}
+
+    graph.remove_skill("b2")
+    assert "b2" not in graph
+    assert graph.get_prerequisites("c") == set()
+    assert graph.skills["a"].unlocks == frozenset()
+
+    assert graph.remove_dependency("a", "c") is False
+
+
+def test_is_prerequisite_tracks_added_and_removed_dependencies():
+    graph = _build_graph([("a", "b"), ("b", "c")])
+
+    assert graph.is_prerequisite("a", "c")
+    assert not graph.is_prerequisite("c", "a")
+
+    graph.add_skill(Skill("d", "d"))
+    graph.add_dependency("c", "d")
+    assert graph.is_prerequisite("a", "d")
+
+    graph.remove_dependency("b", "c")
+    assert not graph.is_prerequisite("a", "d")
+    assert graph.is_prerequisite("c", "d")
+
+    stats = graph.reachability.stats()
+    assert stats["acyclic"] is True
+    assert stats["memory_bytes"] > 0
+
+
+def test_is_prerequisite_survives_cycles():
+    graph = _build_graph([("a", "b"), ("b", "c")])
+    graph.reachability  # Build the index before the cycle appears
+
+    graph.add_dependency("c", "a")
+
+    assert graph.is_prerequisite("a", "c")
+    assert graph.is_prerequisite("c", "a")
+    assert graph.reachability.acyclic is False
+
+
+def test_find_cycle_reports_the_cycle_an_edge_would_close():
+    graph = _build_graph([("a", "b"), ("b", "c"), ("x", "c")])
+
+    # "c" needs "b", which needs "a"; making "c" a prerequisite of "a" loops.
+    assert graph.find_cycle("c", "a") == ["a", "c", "b", "a"]
+    assert graph.find_cycle("a", "a") == ["a", "a"]
+    assert graph.find_cycle("a", "c") is None
+    assert graph.find_cycle("x", "a") is None
+
+
+def test_topological_order_follows_new_dependencies():
+    graph = _build_graph([("a", "b"), ("c", "d")])
+    order = graph.order
+
+    # Contradicts any order that placed "b" before "c".
+    graph.add_dependency("b", "c")
+    graph.add_skill(Skill("e", "e"))
+    graph.add_dependency("e", "a")
+
+    position = {skill_id: order.position[graph._index[skill_id]] for skill_id in graph.skills}
+    assert graph.order is order  # Updated in place, not rebuilt
+    assert position["e"] < position["a"] < position["b"] < position["c"] < position["d"]
+    assert graph.find_cycle("d", "e") == ["e", "d", "c", "b", "a", "e"]
+
+
+def test_learning_schedule_finds_the_critical_path():
+    graph = SkillGraph()
+    for skill_id, minutes in [("basics", 30), ("js", 120), ("html", 60), ("react", 90)]:
+        graph.add_skill(Skill(skill_id, skill_id, duration_minutes=minutes))
+    for source, target in [("basics", "js"), ("basics", "html"), ("js", "react"), ("html", "react")]:
+        graph.add_dependency(source, target)
+
+    schedule = graph.get_learning_schedule("react")
+
+    assert schedule.total_minutes == 300
+    assert schedule.critical_path_minutes == 240
+    assert schedule.critical_path == ["basics", "js", "react"]
+    assert [(s.skill_id, s.earliest_start, s.slack) for s in schedule.steps] == [
+        ("basics", 0, 0),
+        ("js", 30, 0),
+        ("html", 30, 60),
+        ("react", 150, 0),
+    ]
+
+
+def test_learning_schedule_skips_learned_skills_and_defaults_durations():
+    graph = _build_graph([("a", "b"), ("b", "c")])
+
+    schedule = graph.get_learning_schedule("c", skip=lambda skill_id: skill_id == "a")
+
+    assert [step.skill_id for step in schedule.steps] == ["b", "c"]
+    assert schedule.total_minutes == schedule.critical_path_minutes == 120
+
+
+def _build_hierarchy(edges):
+    graph = SkillGraph()
+    for child, parent in edges:
+        for skill_id in (child, parent):
+            graph.add_skill(Skill(skill_id, skill_id))
+        graph.add_isa_relationship(child, parent)
+    return graph
+
+
+def test_hierarchy_answers_subtree_membership():
+    graph = _build_hierarchy(
+        [("python", "programming"), ("pandas", "python"), ("pandas", "data"), ("sql", "data")]
+    )
+
+    assert graph.is_type_of("pandas", "programming")
+    assert graph.is_type_of("pandas", "data")  # Through its second parent
+    assert not graph.is_type_of("sql", "programming")
+    assert not graph.is_type_of("programming", "programming")
+    assert graph.get_types_under("programming") == {"python", "pandas"}
+    assert graph.get_types_under("data") == {"pandas", "sql"}
+
+
+def test_hierarchy_labels_new_relationships_in_place():
+    graph = _build_hierarchy([("python", "programming")])
+    hierarchy = graph.hierarchy
+
+    graph.add_skill(Skill("pandas", "pandas"))
+    graph.add_isa_relationship("pandas", "python")
+    graph.add_skill(Skill("data", "data"))
+    graph.add_isa_relationship("pandas", "data")
+
+    assert graph.hierarchy is hierarchy  # Updated in place, not rebuilt
+    assert graph.is_type_of("pandas", "programming")
+    assert graph.get_types_under("data") == {"pandas"}
+
+    # A cycle cannot be labelled; queries still answer by walking the graph.
+    graph.add_isa_relationship("programming", "pandas")
+    assert not graph.hierarchy.acyclic
+    assert graph.is_type_of("python", "pandas")
+
+
+def test_roll_up_mastery_aggregates_leaf_skills():
+    graph = _build_hierarchy(
+        [("python", "programming"), ("pandas", "python"), ("numpy", "python"), ("go", "programming")]
+    )
+
+    rolled = graph.roll_up_mastery({"pandas": 1.0, "numpy": 0.5, "programming": 1.0})
+
+    assert rolled["python"] == {"skills": 2, "mastered": 2, "mastery": 0.75}
+    assert rolled["programming"] == {"skills": 3, "mastered": 2, "mastery": 0.5}
+    assert "pandas" not in rolled
@@ -15,22 +15,22 @@ def mock_graph_db_session_for_quests(mocker):
         "name": data_dict["name"],
         "description": data_dict["description"]
     }
-    the_mock_session.write_transaction = mocker.MagicMock(
-        name="MOCK_WRITE_TRANSACTION",
+    the_mock_session.execute_write = mocker.AsyncMock(
+        name="MOCK_EXECUTE_WRITE",
         side_effect=default_side_effect
     )
 
-    # This function will be the override for get_graph_db_session
-    def override_get_graph_db_session():
+    # This function will be the override for get_async_graph_db_session
+    async def override_get_async_graph_db_session():
         yield the_mock_session
 
     # Import app and the original dependency for overriding
     from api.main import app as main_app # renamed to avoid conflict if client uses 'app'
-    from api.database import get_graph_db_session as original_get_graph_db_session
+    from api.database import get_async_graph_db_session as original_get_async_graph_db_session
 
     # Store original overrides if any, to restore them
     original_overrides = main_app.dependency_overrides.copy()
-    main_app.dependency_overrides[original_get_graph_db_session] = override_get_graph_db_session
+    main_app.dependency_overrides[original_get_async_graph_db_session] = override_get_async_graph_db_session
 
     yield the_mock_session # Yield the mock session for the test to use
 
@@ -57,9 +57,9 @@ def test_create_quest_endpoint(mock_graph_db_session_for_quests, mocker):
     except ValueError:
         pytest.fail("ID is not a valid UUID")
 
-    # Assert that the mock session's write_transaction was called correctly
-    mock_graph_db_session_for_quests.write_transaction.assert_called_once()
-    args, kwargs = mock_graph_db_session_for_quests.write_transaction.call_args
+    # Assert that the mock session's execute_write was called correctly
+    mock_graph_db_session_for_quests.execute_write.assert_called_once()
+    args, kwargs = mock_graph_db_session_for_quests.execute_write.call_args
     # args[0] is the function (db_create_quest), args[1] is quest_data
     assert args[1]["name"] == quest_create_data["name"]
     assert args[1]["description"] == quest_create_data["description"]
@@ -68,9 +68,9 @@ def test_create_quest_endpoint(mock_graph_db_session_for_quests, mocker):
 def test_create_quest_endpoint_creation_fails(mock_graph_db_session_for_quests, mocker):
     # Simulate the DB operation returning None (e.g., creation failed)
     # Now mock_graph_db_session_for_quests refers to the session mock itself.
-    # Its write_transaction attribute is already a MagicMock.
-    mock_graph_db_session_for_quests.write_transaction.side_effect = None # Clear any default side_effect
-    mock_graph_db_session_for_quests.write_transaction.return_value = None # Set specific return for this test
+    # Its execute_write attribute is already a MagicMock.
+    mock_graph_db_session_for_quests.execute_write.side_effect = None # Clear any default side_effect
+    mock_graph_db_session_for_quests.execute_write.return_value = None # Set specific return for this test
 
     quest_create_data = {"name": "Fail Quest", "description": "This should fail."}
 
@@ -79,11 +79,11 @@ def test_create_quest_endpoint_creation_fails(mock_graph_db_session_for_quests,
     assert response.status_code == 400
     assert response.json() == {"detail": "Quest could not be created"}
 
-    # write_transaction is called with (function_to_execute, data_for_function)
-    # The first argument to write_transaction is the actual graph_crud.create_quest function
+    # execute_write is called with (function_to_execute, data_for_function)
+    # The first argument to execute_write is the actual graph_crud.create_quest function
     # The second argument is the quest_data dictionary
-    mock_graph_db_session_for_quests.write_transaction.assert_called_once()
-    args, _kwargs = mock_graph_db_session_for_quests.write_transaction.call_args
+    mock_graph_db_session_for_quests.execute_write.assert_called_once()
+    args, _kwargs = mock_graph_db_session_for_quests.execute_write.call_args
     assert args[1] == quest_create_data # args[0] is the function, args[1] is the data
     # It is also possible to check the function itself if needed:
     # from api.graph_crud import create_quest as db_create_quest
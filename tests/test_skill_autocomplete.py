@@ -0,0 +1,95 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import async_graph_crud, graph_crud
+from api.database import get_async_graph_db_driver
+from api.main import create_app
+from api.skill_autocomplete import AutocompleteIndex, SkillAutocomplete
+
+
+@pytest.fixture
+def index():
+    return AutocompleteIndex(
+        [
+            ("Python Basics", 40),
+            ("Python Testing", 5),
+            ("PyTorch", 12),
+            ("Pandas", 30),
+            ("Machine Learning", 25),
+        ]
+    )
+
+
+def test_prefix_matches_rank_by_popularity(index):
+    assert index.complete("py", 3) == ["Python Basics", "PyTorch", "Python Testing"]
+    assert index.complete("  PYTHON   t", 1) == ["Python Testing"]
+
+
+def test_typos_fall_back_to_trigram_matches(index):
+    assert index.complete("pyhton", 2) == ["Python Basics", "PyTorch"]
+    assert index.complete("machin lerning", 1) == ["Machine Learning"]
+    assert index.complete("xyz") == []
+
+
+def test_updates_are_applied_incrementally(mocker, index):
+    # A small scan limit makes "p" use the cached top list.
+    mocker.patch("api.skill_autocomplete._SCAN_LIMIT", 1)
+    assert index.complete("p", 2) == ["Python Basics", "Pandas"]
+
+    index.add("Product Management", 35)
+    index.rename("Python Basics", "Python Fundamentals")
+    assert index.complete("p", 2) == ["Python Fundamentals", "Product Management"]
+
+    index.remove("Python Fundamentals")
+    index.set_popularity("PyTorch", 50)
+    assert index.complete("p", 3) == ["PyTorch", "Product Management", "Pandas"]
+    assert "Python Fundamentals" not in index
+    assert index.complete("fundamentals") == []
+
+
+
+def test_adding_a_known_name_keeps_its_popularity(index):
+    popularity = index.popularity("Pandas")
+
+    index.add("Pandas")
+    assert index.popularity("Pandas") == popularity
+
+    index.add("Pandas", popularity + 1)
+    assert index.popularity("Pandas") == popularity + 1
+
+
+@pytest.fixture
+def autocomplete_client(mocker, async_driver):
+    session = mocker.MagicMock()
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    autocomplete = SkillAutocomplete()
+    mocker.patch("api.routers.skills.skill_autocomplete", autocomplete)
+
+    app = create_app()
+    app.dependency_overrides[get_async_graph_db_driver] = lambda: async_driver(session)
+    return TestClient(app), session, autocomplete, driver
+
+
+def test_autocomplete_endpoint_uses_the_index(autocomplete_client):
+    client, session, autocomplete, driver = autocomplete_client
+    session.execute_read.return_value = [("Python Basics", 3), ("Pandas", 9)]
+    autocomplete.load(driver)
+
+    response = client.get("/skills/autocomplete", params={"q": "p"})
+
+    assert response.status_code == 200
+    assert response.json() == ["Pandas", "Python Basics"]
+    session.execute_read.assert_called_once_with(graph_crud.get_skill_popularity)
+
+
+def test_autocomplete_endpoint_falls_back_to_cypher(autocomplete_client):
+    client, session, _, _ = autocomplete_client
+    session.execute_read.return_value = ["Python Basics"]
+
+    response = client.get("/skills/autocomplete", params={"q": "py", "limit": 5})
+
+    assert response.json() == ["Python Basics"]
+    session.execute_read.assert_called_once_with(
+        async_graph_crud.search_skill_names, "py", 5
+    )
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from api import graph_crud
+from api.ai import qa_service
+from api.ai.skill_context import ContextIndex, SkillContext
+
+
+@pytest.fixture
+def index():
+    return ContextIndex(
+        [
+            ("Python", "A general purpose programming language"),
+            ("Pandas", "Data analysis with Python"),
+            ("Data Analysis", "Finding insights in data"),
+            ("Django", "A Python web framework"),
+            ("Web Basics", None),
+        ],
+        [
+            ("Pandas", "Python"),
+            ("Data Analysis", "Pandas"),
+            ("Django", "Python"),
+            ("Django", "Web Basics"),
+        ],
+    )
+
+
+def test_search_ranks_name_matches_first(index):
+    results = index.search(["python"])
+
+    assert [r["skill"] for r in results] == ["Python", "Django", "Pandas"]
+    assert results[0]["description"] == "A general purpose programming language"
+
+
+def test_search_expands_partial_keywords(index):
+    assert [r["skill"] for r in index.search(["analy"])] == ["Data Analysis", "Pandas"]
+    assert index.search(["cobol"]) == []
+
+
+def test_related_skills_cover_two_hops(index):
+    (python,) = index.search(["python"], limit=1)
+    (analysis,) = index.search(["insights"])
+
+    assert set(python["related_skills"]) == {"Pandas", "Django", "Data Analysis", "Web Basics"}
+    assert analysis["related_skills"] == ["Pandas", "Python"]
+
+
+def test_sample_returns_distinct_skills(index):
+    sample = index.sample(3)
+
+    assert len({record["skill"] for record in sample}) == 3
+
+
+def test_retrieve_context_uses_the_index(mocker, index):
+    context = SkillContext()
+    context.index = index
+    mocker.patch("api.ai.qa_service.skill_context", context)
+    query = mocker.patch("api.ai.qa_service.langchain_graph.query")
+
+    result = asyncio.run(qa_service.retrieve_context({"question": "What is Django?"}))
+
+    assert [r["skill"] for r in result] == ["Django"]
+    assert len(asyncio.run(qa_service.retrieve_context({"question": "what is the"}))) == 3
+    query.assert_not_called()
+
+
+def test_retrieve_context_falls_back_to_cypher(mocker):
+    mocker.patch("api.ai.qa_service.skill_context", SkillContext())
+    query = mocker.patch(
+        "api.ai.qa_service.langchain_graph.query", return_value=[{"skill": "Django"}]
+    )
+
+    result = asyncio.run(qa_service.retrieve_context({"question": "What is Django?"}))
+
+    assert result == [{"skill": "Django"}]
+    assert query.call_args.args[1] == {"keywords": ["django"]}
+
+
+def test_load_reads_nodes_and_dependencies(mocker):
+    session = mocker.MagicMock()
+    session.execute_read.side_effect = lambda func: {
+        graph_crud.get_skill_graph_nodes: [("Python", "A language", None)],
+        graph_crud.get_skill_graph_dependencies: [],
+    }[func]
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+
+    context = SkillContext()
+    context.load(driver)
+
+    assert context.retrieve(["language"])[0]["skill"] == "Python"
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+from api import graph_crud
+from api.skill_import import (
+    SkillImportError,
+    dependency_records,
+    import_taxonomy,
+    read_rows,
+    skill_records,
+)
+from skill_system.skill_graph import skill_graph
+
+
+class FakeDriver:
+    """Records the batches written through its sessions, and can fail the
+    ``fail_at``-th write. ``existing`` are the (parent, child) DEPENDS_ON
+    edges already in the graph."""
+
+    def __init__(self, mocker, fail_at=None, existing=()):
+        self.writes = []  # (function, batch)
+        self.fail_at = fail_at
+        self.existing = list(existing)
+        session = mocker.MagicMock()
+        session.execute_write.side_effect = self._write
+        session.execute_read.side_effect = self._read
+        self.session = mocker.MagicMock()
+        self.session.return_value.__enter__.return_value = session
+
+    def _write(self, func, *args):
+        if func is graph_crud.backfill_skill_depths:
+            return 1
+        if self.fail_at is not None and len(self.writes) == self.fail_at:
+            raise RuntimeError("connection lost")
+        self.writes.append((func, args[0]))
+
+    def _read(self, func):
+        assert func is graph_crud.get_skill_graph_dependencies
+        return self.existing
+
+    def written(self, func):
+        return [record for f, batch in self.writes if f is func for record in batch]
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "taxonomy.csv"
+    rows = ["name,duration_minutes,prerequisites"]
+    rows += [f"Skill {i},{i},Skill {i - 1}" for i in range(1, 50)]
+    rows += ["Skill 0,,"]
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+def test_read_rows_from_jsonl(tmp_path):
+    path = tmp_path / "taxonomy.jsonl"
+    path.write_text(
+        json.dumps({"name": "Django", "prerequisites": ["Python"]})
+        + "\n\n"
+        + json.dumps({"parent": "Flask", "child": "Python"})
+        + "\n"
+    )
+
+    rows = list(read_rows(str(path), "jsonl"))
+
+    assert [skill["name"] for skill in skill_records(rows)] == [
+        "Django", "Python", "Flask", "Python",
+    ]
+    assert list(dependency_records(rows)) == [
+        {"parent": "Django", "child": "Python"},
+        {"parent": "Flask", "child": "Python"},
+    ]
+
+
+def test_read_rows_reports_the_bad_line(tmp_path):
+    path = tmp_path / "taxonomy.jsonl"
+    path.write_text('{"name": "Python"}\nnot json\n')
+
+    with pytest.raises(SkillImportError, match="Line 2"):
+        list(read_rows(str(path), "jsonl"))
+
+
+def test_import_adjacency_dict(mocker):
+    driver = FakeDriver(mocker)
+
+    report = import_taxonomy(driver, skill_graph, batch_size=7, workers=3, log=lambda _: None)
+
+    imported = {skill["name"] for skill in driver.written(graph_crud.import_skill_batch)}
+    assert imported == set(skill_graph) | {p for ps in skill_graph.values() for p in ps}
+    edges = driver.written(graph_crud.import_dependency_batch)
+    assert len(edges) == sum(len(ps) for ps in skill_graph.values())
+    assert {"parent": "Walk", "child": "Crawl"} in edges
+    assert report["dependencies"]["records"] == len(edges)
+    # Every batch is one UNWIND statement of at most batch_size records
+    assert all(len(batch) <= 7 for _, batch in driver.writes)
+
+
+def test_import_resumes_from_the_checkpoint(mocker, csv_file):
+    failing = FakeDriver(mocker, fail_at=3)
+    with pytest.raises(RuntimeError):
+        import_taxonomy(failing, str(csv_file), batch_size=10, workers=1, log=lambda _: None)
+    checkpoint = json.loads((csv_file.parent / "taxonomy.csv.checkpoint").read_text())
+    assert checkpoint["phase"] == "skills" and checkpoint["records"] == 30
+
+    driver = FakeDriver(mocker)
+    report = import_taxonomy(driver, str(csv_file), batch_size=10, workers=2, log=lambda _: None)
+
+    assert report["skills"]["skipped"] == 30
+    resumed = driver.written(graph_crud.import_skill_batch)
+    assert len(resumed) == report["skills"]["records"] == 99 - 30
+    assert {"name": "Skill 49", "duration_minutes": 49} in resumed
+    assert len(driver.written(graph_crud.import_dependency_batch)) == 49
+    assert not (csv_file.parent / "taxonomy.csv.checkpoint").exists()
+
+
+def test_import_is_refused_before_writing_a_dependency_cycle(mocker, tmp_path):
+    path = tmp_path / "taxonomy.jsonl"
+    rows = [
+        {"name": "Django", "prerequisites": ["Python"]},
+        {"name": "Python", "prerequisites": ["Programming"]},
+        {"parent": "Programming", "child": "Django"},
+        {"name": "Flask", "prerequisites": ["Python"]},
+    ]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    driver = FakeDriver(mocker)
+
+    with pytest.raises(SkillImportError, match="Programming -> Django -> Python -> Programming"):
+        import_taxonomy(driver, str(path), log=lambda _: None)
+
+    assert driver.writes == []
+
+
+def test_import_is_refused_when_it_closes_a_cycle_with_existing_edges(mocker):
+    # "Flask" already depends on "Python"; the import makes "Python" need "Web".
+    driver = FakeDriver(mocker, existing=[("Flask", "Python"), ("Web", "Flask")])
+
+    with pytest.raises(SkillImportError, match="Python -> Web -> Flask -> Python"):
+        import_taxonomy(driver, {"Python": ["Web"], "Go": []}, log=lambda _: None)
+
+    assert driver.writes == []
+
+
+def test_cycles_already_in_the_graph_do_not_stop_an_import(mocker):
+    driver = FakeDriver(mocker, existing=[("A", "B"), ("B", "A")])
+
+    import_taxonomy(driver, {"A": ["C"], "Go": ["C"]}, log=lambda _: None)
+
+    assert len(driver.written(graph_crud.import_dependency_batch)) == 2
+
+
+def test_import_endpoint_is_for_admins_only(mocker):
+    from fastapi.testclient import TestClient
+    from api.main import app
+    from api.routers import auth
+    from api.schemas import User
+
+    mocker.patch.object(auth, "ADMIN_EMAILS", {"admin@example.com"})
+    client = TestClient(app)
+    for email, status in (("user@example.com", 403), ("admin@example.com", 400)):
+        app.dependency_overrides[auth.get_current_user] = lambda: User(
+            id=1, email=email, is_active=True
+        )
+        try:
+            response = client.post("/admin/skills/import", json={"path": "../secrets.csv"})
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == status
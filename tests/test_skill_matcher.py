@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from langchain_core.exceptions import OutputParserException
+
+from api.ai import skill_matcher
+from api.ai.schemas import CandidateSkillMatch, SkillMatch, SkillMatches
+
+EXISTING = ["Python", "Docker", "React.js"]
+
+
+def _single_matches(monkeypatch):
+    single = AsyncMock(side_effect=lambda candidate, existing: SkillMatch(
+        is_duplicate=False, existing_skill_name=None
+    ))
+    monkeypatch.setattr(skill_matcher, "find_skill_match", single)
+    return single
+
+
+def test_find_skill_matches_resolves_every_candidate_in_one_call(monkeypatch):
+    chain = AsyncMock()
+    chain.ainvoke.return_value = SkillMatches(matches=[
+        CandidateSkillMatch(
+            candidate_skill="Docker Containerization", is_duplicate=True, existing_skill_name="Docker"
+        ),
+        CandidateSkillMatch(candidate_skill="Rust", is_duplicate=False, existing_skill_name=None),
+    ])
+    monkeypatch.setattr(skill_matcher, "skill_batch_matcher_chain", chain)
+    single = _single_matches(monkeypatch)
+
+    matches = asyncio.run(skill_matcher.find_skill_matches(
+        ["Docker Containerization", "python", "Rust"], EXISTING
+    ))
+
+    assert [(m.is_duplicate, m.existing_skill_name) for m in matches] == [
+        (True, "Docker"),
+        (True, "Python"),  # Matched without the model
+        (False, None),
+    ]
+    chain.ainvoke.assert_awaited_once_with({
+        "candidate_skills": "Docker Containerization\nRust",
+        "existing_skills": "Python, Docker, React.js",
+    })
+    single.assert_not_called()
+
+
+def test_find_skill_matches_falls_back_per_candidate(monkeypatch):
+    chain = AsyncMock()
+    chain.ainvoke.return_value = SkillMatches(matches=[
+        # Not an existing skill, and "Go" is left out
+        CandidateSkillMatch(candidate_skill="Rust", is_duplicate=True, existing_skill_name="Rustlang"),
+        CandidateSkillMatch(candidate_skill="Kubernetes", is_duplicate=False, existing_skill_name=None),
+    ])
+    monkeypatch.setattr(skill_matcher, "skill_batch_matcher_chain", chain)
+    single = _single_matches(monkeypatch)
+
+    matches = asyncio.run(skill_matcher.find_skill_matches(["Rust", "Kubernetes", "Go"], EXISTING))
+
+    assert [m.is_duplicate for m in matches] == [False, False, False]
+    assert sorted(call.args[0] for call in single.await_args_list) == ["Go", "Rust"]
+
+
+def test_find_skill_matches_falls_back_when_the_answer_cannot_be_parsed(monkeypatch):
+    chain = AsyncMock()
+    chain.ainvoke.side_effect = OutputParserException("not JSON")
+    monkeypatch.setattr(skill_matcher, "skill_batch_matcher_chain", chain)
+    single = _single_matches(monkeypatch)
+
+    matches = asyncio.run(skill_matcher.find_skill_matches(["Rust", "Go"], EXISTING))
+
+    assert len(matches) == 2
+    # Each candidate is also matched against the new skills found before it.
+    assert [call.args for call in single.await_args_list] == [
+        ("Rust", EXISTING),
+        ("Go", EXISTING + ["Rust"]),
+    ]
+
+
+def test_find_skill_matches_groups_new_candidates_with_each_other(monkeypatch):
+    chain = AsyncMock()
+    chain.ainvoke.return_value = SkillMatches(matches=[
+        CandidateSkillMatch(candidate_skill="Kubernetes", is_duplicate=False, existing_skill_name=None),
+        CandidateSkillMatch(
+            candidate_skill="Kubernetes Orchestration", is_duplicate=True, existing_skill_name="Kubernetes"
+        ),
+        CandidateSkillMatch(candidate_skill="Docker Compose", is_duplicate=True, existing_skill_name="Docker"),
+        CandidateSkillMatch(
+            candidate_skill="Compose Files", is_duplicate=True, existing_skill_name="Docker Compose"
+        ),
+    ])
+    monkeypatch.setattr(skill_matcher, "skill_batch_matcher_chain", chain)
+    single = _single_matches(monkeypatch)
+
+    matches = asyncio.run(skill_matcher.find_skill_matches(
+        ["Kubernetes", "Kubernetes Orchestration", "Docker Compose", "Compose Files"], EXISTING
+    ))
+
+    assert [(m.is_duplicate, m.existing_skill_name) for m in matches] == [
+        (False, None),
+        (True, "Kubernetes"),  # The new skill extracted before it
+        (True, "Docker"),
+        (True, "Docker"),  # Through the earlier candidate it duplicates
+    ]
+    single.assert_not_called()
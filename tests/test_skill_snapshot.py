@@ -0,0 +1,201 @@
+import asyncio
+
+import pytest
+
+from api import graph_crud
+from api.skill_snapshot import SkillGraphSnapshot, read_skill_graph
+from skill_system.binary import MappedSkillGraph, write_skill_graph
+from skill_system.models import SkillGraph
+
+
+@pytest.fixture
+def mock_driver(mocker):
+    """A driver whose read transactions return a small, fixed skill graph."""
+    session = mocker.MagicMock()
+
+    def execute_read(func, *args, **kwargs):
+        if func is graph_crud.get_skill_graph_nodes:
+            return [
+                ("Python", "A language", 600),
+                ("Pandas", None, 240),
+                ("Data Analysis", None, None),
+            ]
+        if func is graph_crud.get_skill_graph_dependencies:
+            return [("Pandas", "Python"), ("Data Analysis", "Pandas")]
+        raise AssertionError(f"Unexpected read: {func.__name__}")
+
+    session.execute_read.side_effect = execute_read
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    return driver
+
+
+def test_snapshot_answers_path_most_fundamental_first(mock_driver):
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(mock_driver)
+
+    assert snapshot.ready
+    assert snapshot.consolidated_path("Data Analysis") == [
+        "Python",
+        "Pandas",
+        "Data Analysis",
+    ]
+
+
+def test_snapshot_defers_to_cypher_when_it_cannot_answer(mock_driver):
+    snapshot = SkillGraphSnapshot()
+    assert snapshot.consolidated_path("Python") is None
+
+    snapshot.load(mock_driver)
+    assert snapshot.consolidated_path("Unknown Skill") is None
+
+
+def test_snapshot_applies_writes_incrementally(mock_driver):
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(mock_driver)
+
+    snapshot.skill_created("Statistics")
+    snapshot.dependency_added("Data Analysis", "Statistics")
+    assert snapshot.consolidated_path("Data Analysis") == [
+        "Python",
+        "Statistics",
+        "Pandas",
+        "Data Analysis",
+    ]
+
+    snapshot.skill_renamed("Pandas", "pandas")
+    snapshot.skill_deleted("Statistics")
+    assert snapshot.consolidated_path("Data Analysis") == [
+        "Python",
+        "pandas",
+        "Data Analysis",
+    ]
+
+
+def test_try_load_survives_database_errors(mocker):
+    driver = mocker.MagicMock()
+    driver.session.side_effect = RuntimeError("Neo4j is down")
+    snapshot = SkillGraphSnapshot()
+
+    assert snapshot.try_load(driver) is False
+    assert not snapshot.ready
+
+
+def test_snapshot_personalized_path_skips_implied_prerequisites(mock_driver):
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(mock_driver)
+
+    # Demonstrating Pandas implies Python, which it builds on.
+    assert snapshot.personalized_path("Data Analysis", ["Pandas"]) == ["Data Analysis"]
+    assert snapshot.personalized_path("Data Analysis", []) == [
+        "Python",
+        "Pandas",
+        "Data Analysis",
+    ]
+    assert snapshot.is_prerequisite("Python", "Data Analysis") is True
+    assert snapshot.is_prerequisite("Data Analysis", "Python") is False
+    assert snapshot.is_prerequisite("Python", "Unknown Skill") is None
+
+
+def test_snapshot_maps_a_shared_file_and_copies_on_write(mock_driver, tmp_path):
+    path = tmp_path / "skills.bin"
+    write_skill_graph(read_skill_graph(mock_driver), path)
+    snapshot = SkillGraphSnapshot(str(path))
+
+    snapshot.load(mock_driver)
+    assert isinstance(snapshot.graph, MappedSkillGraph)
+    assert snapshot.consolidated_path("Data Analysis") == [
+        "Python",
+        "Pandas",
+        "Data Analysis",
+    ]
+    assert not snapshot.file_changed()
+
+    snapshot.skill_created("Statistics")
+    snapshot.dependency_added("Data Analysis", "Statistics")
+    assert isinstance(snapshot.graph, SkillGraph)
+    assert "Statistics" in snapshot.consolidated_path("Data Analysis")
+
+    # A newly written file replaces the private copy on the next reload.
+    write_skill_graph(read_skill_graph(mock_driver), path)
+    assert snapshot.file_changed()
+    snapshot.load(mock_driver)
+    assert isinstance(snapshot.graph, MappedSkillGraph)
+    assert snapshot.consolidated_path("Statistics") is None
+
+
+def test_snapshot_learning_schedule_uses_durations(mock_driver):
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(mock_driver)
+
+    schedule = snapshot.learning_schedule("Data Analysis", [])
+    assert schedule.critical_path == ["Python", "Pandas", "Data Analysis"]
+    assert schedule.total_minutes == 600 + 240 + 60
+
+    snapshot.skill_duration_set("Data Analysis", 30)
+    schedule = snapshot.learning_schedule("Data Analysis", ["Pandas"])
+    assert [step.skill_id for step in schedule.steps] == ["Data Analysis"]
+    assert schedule.total_minutes == 30
+    assert snapshot.learning_schedule("Unknown Skill", []) is None
+
+
+def _refresh(snapshot, mocker, polls, interval, driver=None, try_load=None):
+    """Runs refresh_periodically for ``polls`` polls; returns the try_load
+    mock, or ``try_load`` itself if given."""
+    sleeps = mocker.AsyncMock(side_effect=[None] * polls + [asyncio.CancelledError()])
+    mocker.patch("api.skill_snapshot.asyncio.sleep", sleeps)
+    if try_load is None:
+        try_load = mocker.patch.object(snapshot, "try_load")
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(snapshot.refresh_periodically(driver or mocker.MagicMock(), interval))
+    return try_load
+
+
+def test_refresh_falls_back_to_neo4j_while_the_file_is_missing(mock_driver, tmp_path, mocker):
+    path = tmp_path / "skills.bin"
+    snapshot = SkillGraphSnapshot(str(path))
+
+    assert _refresh(snapshot, mocker, 3, interval=0).call_count == 3
+    assert _refresh(snapshot, mocker, 3, interval=3600).call_count == 0
+
+
+def test_refresh_remaps_a_replaced_file_and_still_reads_neo4j(mock_driver, tmp_path, mocker):
+    path = tmp_path / "skills.bin"
+    snapshot = SkillGraphSnapshot(str(path))
+    write_skill_graph(read_skill_graph(mock_driver), path)
+    snapshot.load(mock_driver)
+
+    # An unchanged file does not stop the reloads from Neo4j...
+    try_load = _refresh(snapshot, mocker, 3, interval=0)
+    assert [call.args[1:] for call in try_load.call_args_list] == [(False,)] * 3
+    assert _refresh(snapshot, mocker, 3, interval=3600).call_count == 0
+
+    # ...and a replaced one is remapped straight away.
+    write_skill_graph(read_skill_graph(mock_driver), path)
+    try_load = _refresh(snapshot, mocker, 1, interval=3600)
+    assert [call.args[1:] for call in try_load.call_args_list] == [()]
+
+
+def test_writes_through_another_process_show_up_with_a_snapshot_file(mock_driver, tmp_path, mocker):
+    path = tmp_path / "skills.bin"
+    write_skill_graph(read_skill_graph(mock_driver), path)
+    snapshot = SkillGraphSnapshot(str(path))
+    snapshot.load(mock_driver)
+    assert isinstance(snapshot.graph, MappedSkillGraph)
+
+    # Another worker adds Statistics as a prerequisite of Data Analysis; the
+    # file is not rewritten.
+    session = mock_driver.session.return_value.__enter__.return_value
+    reads = session.execute_read.side_effect
+
+    def execute_read(func, *args):
+        if func is graph_crud.get_skill_graph_nodes:
+            return reads(func) + [("Statistics", None, None)]
+        if func is graph_crud.get_skill_graph_dependencies:
+            return reads(func) + [("Data Analysis", "Statistics")]
+        return reads(func, *args)
+
+    session.execute_read.side_effect = execute_read
+    _refresh(snapshot, mocker, 1, interval=0, driver=mock_driver, try_load=snapshot.try_load)
+
+    assert "Statistics" in snapshot.consolidated_path("Data Analysis")
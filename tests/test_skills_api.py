@@ -0,0 +1,194 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import async_graph_crud, graph_crud
+from api.database import get_async_graph_db_driver
+from api.graph_cache import GraphReadCache
+from api.main import create_app
+from api.skill_snapshot import SkillGraphSnapshot
+
+
+@pytest.fixture
+def mock_session(mocker):
+    session = mocker.MagicMock()
+    session.execute_read.side_effect = lambda func, *args: {
+        graph_crud.get_skill_graph_nodes: [
+            ("Python", None, None),
+            ("Pandas", None, None),
+            ("Django", None, None),
+            ("Web Basics", None, None),
+        ],
+        graph_crud.get_skill_graph_dependencies: [
+            ("Pandas", "Python"),
+            ("Django", "Python"),
+            ("Django", "Web Basics"),
+        ],
+        async_graph_crud.get_user_skills_by_accomplishments: ["Web Basics"],
+        # The Cypher fallback, used when the snapshot does not know a target
+        async_graph_crud.get_consolidated_learning_plan: (
+            ["Python", "Pandas"],
+            {"Pandas": ["Python", "Pandas"]},
+        ),
+    }[func]
+    return session
+
+
+@pytest.fixture
+def skills_client(mocker, mock_session, async_driver):
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = mock_session
+
+    snapshot = SkillGraphSnapshot()
+    snapshot.load(driver)
+    mocker.patch("api.routers.skills.skill_snapshot", snapshot)
+    mocker.patch("api.routers.skills.graph_cache", GraphReadCache())
+
+    app = create_app()
+    app.dependency_overrides[get_async_graph_db_driver] = lambda: async_driver(mock_session)
+    return TestClient(app)
+
+
+def test_learning_plan_merges_shared_prerequisites(skills_client, mock_session):
+    response = skills_client.post(
+        "/skills/learning-plan", json={"targets": ["Pandas", "Django"]}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "plan": ["Python", "Web Basics", "Django", "Pandas"],
+        "targets": {
+            "Pandas": ["Python", "Pandas"],
+            "Django": ["Python", "Web Basics", "Django"],
+        },
+        "not_found": [],
+    }
+    # Answered entirely from the in-memory snapshot
+    assert mock_session.execute_read.call_count == 2
+
+
+def test_learning_plan_falls_back_to_cypher_for_unknown_targets(skills_client):
+    response = skills_client.post(
+        "/skills/learning-plan", json={"targets": ["Pandas", "Nope"]}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "plan": ["Python", "Pandas"],
+        "targets": {"Pandas": ["Python", "Pandas"]},
+        "not_found": ["Nope"],
+    }
+
+
+def test_learning_plan_skips_user_skills(skills_client):
+    response = skills_client.post(
+        "/skills/learning-plan",
+        json={"targets": ["Django"], "user_email": "user@example.com"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["plan"] == ["Python", "Django"]
+
+
+def test_learning_plan_is_the_same_with_and_without_the_snapshot(mocker, skills_client, mock_session):
+    # Pandas builds on Python, so a user holding Pandas needs neither.
+    dependencies = {"Pandas": {"Python"}, "Django": {"Python", "Web Basics"}}
+    read = mock_session.execute_read.side_effect
+
+    def fallback_read(func, *args):
+        if func is async_graph_crud.get_user_skills_by_accomplishments:
+            return ["Pandas"]
+        if func is async_graph_crud.get_consolidated_learning_plan:
+            return (
+                ["Python", "Web Basics", "Django"],
+                {"Django": ["Python", "Web Basics", "Django"]},
+            )
+        if func is async_graph_crud.get_covered_skills:
+            held, candidates = args
+            implied = {p for h in held for p in dependencies.get(h, ())}
+            return set(held) | (implied & set(candidates))
+        return read(func, *args)
+
+    mock_session.execute_read.side_effect = fallback_read
+    request = {"targets": ["Django"], "user_email": "user@example.com"}
+
+    from_snapshot = skills_client.post("/skills/learning-plan", json=request).json()
+    mocker.patch("api.routers.skills.skill_snapshot", SkillGraphSnapshot())  # Not loaded
+    from_cypher = skills_client.post("/skills/learning-plan", json=request).json()
+
+    assert from_snapshot["plan"] == ["Web Basics", "Django"]
+    assert from_cypher == from_snapshot
+
+
+def test_learning_plan_requires_a_known_target(skills_client, mock_session):
+    mock_session.execute_read.side_effect = lambda func, *args: ([], {})
+
+    response = skills_client.post("/skills/learning-plan", json={"targets": ["Nope"]})
+
+    assert response.status_code == 404
+
+
+def test_dependency_that_closes_a_cycle_is_rejected(skills_client, mock_session):
+    # Pandas already depends on Python, so Python cannot depend on Pandas.
+    response = skills_client.post("/skills/Python/dependency/Pandas")
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["cycle"] == ["Python", "Pandas", "Python"]
+    mock_session.execute_write.assert_not_called()
+
+
+def test_dependency_is_created_when_it_keeps_the_graph_acyclic(skills_client, mock_session):
+    mock_session.execute_write.return_value = []
+
+    response = skills_client.post("/skills/Pandas/dependency/Web Basics")
+
+    assert response.status_code == 201
+    mock_session.execute_write.assert_called_once_with(
+        async_graph_crud.add_skill_dependency, "Pandas", "Web Basics"
+    )
+
+
+def test_dependency_cycle_is_checked_in_the_write(skills_client, mock_session):
+    # The snapshot does not know "Nope"; the write transaction finds the cycle.
+    mock_session.execute_write.side_effect = lambda func, *args: ["Nope", "Python", "Nope"]
+
+    response = skills_client.post("/skills/Nope/dependency/Python")
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["cycle"] == ["Nope", "Python", "Nope"]
+    assert mock_session.execute_write.call_args.args == (
+        async_graph_crud.add_skill_dependency,
+        "Nope",
+        "Python",
+    )
+
+
+def test_skill_list_pages_with_a_keyset_cursor(skills_client, mock_session):
+    mock_session.execute_read.side_effect = lambda func, after, limit: [
+        {"name": name} for name in ["Django", "Pandas", "Python"] if name > after
+    ][:limit]
+
+    first = skills_client.get("/skills/", params={"limit": 2})
+    assert first.json() == ["Django", "Pandas"]
+    assert first.headers["X-Next-After"] == "Pandas"
+
+    last = skills_client.get("/skills/", params={"limit": 2, "after": "Pandas"})
+    assert last.json() == ["Python"]
+    assert "X-Next-After" not in last.headers
+
+
+def test_skill_reads_are_cached_until_a_skill_is_written(skills_client, mock_session):
+    mock_session.execute_read.side_effect = lambda func, *args: {
+        async_graph_crud.get_skill_dependencies: ["Python"],
+        async_graph_crud.get_skill_by_name: None,
+    }[func]
+    mock_session.execute_write.return_value = {"name": "Rust"}
+
+    for _ in range(3):
+        assert skills_client.get("/skills/Pandas/dependencies").json() == ["Python"]
+    assert mock_session.execute_read.call_count == 2 + 1  # Snapshot load, then once
+
+    skills_client.post("/skills/", json={"name": "Rust"})
+    skills_client.get("/skills/Pandas/dependencies")
+
+    # The existence check, then the dependencies again
+    assert mock_session.execute_read.call_count == 3 + 2
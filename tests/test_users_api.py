@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+
+from api import async_graph_crud, graph_crud
+from api.database import get_async_graph_db_driver
+from api.main import create_app
+from api.skill_snapshot import SkillGraphSnapshot
+
+
+def _client(mocker, async_driver, snapshot):
+    session = mocker.MagicMock()
+    session.execute_read.side_effect = lambda func, *args: {
+        graph_crud.get_skill_graph_nodes: [
+            ("Python", None, 600),
+            ("Pandas", None, 240),
+            ("SQL", None, None),
+            ("Data Analysis", None, 120),
+        ],
+        graph_crud.get_skill_graph_dependencies: [
+            ("Pandas", "Python"),
+            ("Data Analysis", "Pandas"),
+            ("Data Analysis", "SQL"),
+        ],
+        async_graph_crud.get_user_skills_by_accomplishments: ["Python"],
+    }[func]
+    driver = mocker.MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    if snapshot is not None:
+        snapshot.load(driver)
+    mocker.patch("api.routers.users.skill_snapshot", snapshot or SkillGraphSnapshot())
+
+    app = create_app()
+    app.dependency_overrides[get_async_graph_db_driver] = lambda: async_driver(session)
+    return TestClient(app)
+
+
+def test_learning_schedule_for_user(mocker, async_driver):
+    client = _client(mocker, async_driver, SkillGraphSnapshot())
+
+    response = client.get("/users/graph/users/ada@example.com/learning-schedule/Data Analysis")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_minutes"] == 240 + 60 + 120
+    assert body["critical_path_minutes"] == 360
+    assert body["critical_path"] == ["Pandas", "Data Analysis"]
+    assert body["steps"][1] == {
+        "skill": "SQL",
+        "duration_minutes": 60,
+        "earliest_start_minutes": 0,
+        "slack_minutes": 180,
+        "critical": False,
+    }
+
+
+def test_learning_schedule_needs_the_snapshot(mocker, async_driver):
+    client = _client(mocker, async_driver, None)
+
+    response = client.get("/users/graph/users/ada@example.com/learning-schedule/SQL")
+
+    assert response.status_code == 503
+
+
+def test_user_skill_profile(mocker, async_driver):
+    session = mocker.MagicMock()
+    session.execute_read.return_value = [
+        {
+            "skill": "Python",
+            "level": "Advanced",
+            "evidence_count": 3,
+            "last_seen": "2024-05-01T12:00:00+00:00",
+        },
+        {"skill": "SQL", "level": None, "evidence_count": 1, "last_seen": None},
+    ]
+    app = create_app()
+    app.dependency_overrides[get_async_graph_db_driver] = lambda: async_driver(session)
+
+    response = TestClient(app).get("/users/graph/users/ada@example.com/skills")
+
+    assert response.status_code == 200
+    assert response.json()[0]["level"] == "Advanced"
+    assert response.json()[0]["evidence_count"] == 3
+    assert response.json()[1] == {
+        "skill": "SQL", "level": None, "evidence_count": 1, "last_seen": None
+    }
+    session.execute_read.assert_called_once_with(
+        async_graph_crud.get_user_skill_profile, "ada@example.com"
+    )